@@ -1,29 +1,24 @@
 import os
-import requests
 import datetime
 import base64
 import json
-import speech_recognition as sr
 from dotenv import load_dotenv
-from openai import AzureOpenAI
-import atproto
 import mimetypes
-import autogen
-from autogen import Agent, AssistantAgent, UserProxyAgent, GroupChat, GroupChatManager
-# Azure Inference SDK packages
-from azure.ai.inference import ChatCompletionsClient
-from azure.ai.inference.models import SystemMessage, UserMessage
-from azure.core.credentials import AzureKeyCredential
+from functools import lru_cache
 
 # Load environment variables
 load_dotenv('x.env')
 
 # Initialize Azure OpenAI client (for non-phi4 multimodal tasks)
-azure_client = AzureOpenAI(
-    azure_endpoint=os.getenv('ENDPOINT_URL'),
-    api_key=os.getenv('AZURE_OPENAI_API_KEY'),
-    api_version="2024-12-01-preview"
-)
+@lru_cache(maxsize=None)
+def get_azure_client():
+    """Build the Azure OpenAI client on first use."""
+    from openai import AzureOpenAI
+    return AzureOpenAI(
+        azure_endpoint=os.getenv('ENDPOINT_URL'),
+        api_key=os.getenv('AZURE_OPENAI_API_KEY'),
+        api_version="2024-12-01-preview"
+    )
 
 # Define model deployments from environment variables
 o3_deployment = os.getenv('DEPLOYMENT_NAME')             # o3-mini deployment
@@ -65,13 +60,14 @@ config_list_phi4 = [{
 
 def bluesky_login(username, password):
     """Login to Bluesky"""
+    import atproto
     client = atproto.Client()
     client.login(username, password)
     return client
 
 def azure_o3mini(prompt):
     """Call Azure OpenAI o3-mini model"""
-    completion = azure_client.chat.completions.create(
+    completion = get_azure_client().chat.completions.create(
         model=o3_deployment,
         messages=[{"role": "user", "content": prompt}],
         max_completion_tokens=1000,
@@ -81,7 +77,7 @@ def azure_o3mini(prompt):
 
 def azure_gpt4o_mini(prompt):
     """Call Azure OpenAI GPT4O-mini model"""
-    completion = azure_client.chat.completions.create(
+    completion = get_azure_client().chat.completions.create(
         model=gpt4o_deployment,
         messages=[{"role": "user", "content": prompt}],
         max_completion_tokens=500,
@@ -97,6 +93,9 @@ def azure_phi4_mm(prompt, image_base64=None):
     endpoint = os.getenv("AZURE_INFERENCE_SDK_ENDPOINT")
     model_name = os.getenv("PHI4_DEPLOYMENT_NAME")
     key = os.getenv("AZURE_INFERENCE_SDK_KEY")
+    from azure.ai.inference import ChatCompletionsClient
+    from azure.ai.inference.models import SystemMessage, UserMessage
+    from azure.core.credentials import AzureKeyCredential
     client = ChatCompletionsClient(endpoint=endpoint, credential=AzureKeyCredential(key))
     
     messages = [
@@ -117,6 +116,7 @@ def process_voice_input():
     """
     Record and process voice input using the SpeechRecognition library.
     """
+    import speech_recognition as sr
     recognizer = sr.Recognizer()
     with sr.Microphone() as source:
         print("Listening... Speak now.")
@@ -145,10 +145,40 @@ def process_image(image_path):
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
+# Handle -> DID cache: successful lookups are kept for a day, failed ones for an hour
+HANDLE_CACHE_TTL = 86400
+HANDLE_NEGATIVE_CACHE_TTL = 3600
+_handle_did_cache = {}
+
+def resolve_handle_cached(base_url, handle):
+    """
+    Resolve a handle to a DID via com.atproto.identity.resolveHandle, caching the result.
+    Returns (did, error_message); failures are cached too so repeated misses stay offline.
+    """
+    key = handle.lower()
+    cached = _handle_did_cache.get(key)
+    if cached:
+        ttl = HANDLE_CACHE_TTL if cached["did"] else HANDLE_NEGATIVE_CACHE_TTL
+        if datetime.datetime.now().timestamp() - cached["stored_at"] <= ttl:
+            return cached["did"], cached["error"]
+    import requests
+    resolve_endpoint = f"{base_url}/xrpc/com.atproto.identity.resolveHandle"
+    resolve_response = requests.get(resolve_endpoint, params={"handle": handle})
+    if resolve_response.status_code == 200:
+        did, error = resolve_response.json().get("did"), None
+    elif resolve_response.status_code == 400:
+        did, error = None, f"Error resolving handle: {resolve_response.text}"
+    else:
+        # Server-side or rate-limit failures are not cached
+        return None, f"Error resolving handle: {resolve_response.text}"
+    _handle_did_cache[key] = {"did": did, "error": error, "stored_at": datetime.datetime.now().timestamp()}
+    return did, error
+
 def search_user(target_username):
     """
     Search for a user on Bluesky.
     """
+    import requests
     if target_username.startswith('@'):
         target_username = target_username[1:]
     BASE_URL = "https://bsky.social"
@@ -164,13 +194,9 @@ def search_user(target_username):
     auth_data = auth_response.json()
     access_jwt = auth_data.get("accessJwt")
     
-    resolve_endpoint = f"{BASE_URL}/xrpc/com.atproto.identity.resolveHandle"
-    resolve_params = {"handle": target_username}
-    resolve_response = requests.get(resolve_endpoint, params=resolve_params)
-    if resolve_response.status_code != 200:
-        return {"status": "error", "message": f"Error resolving handle: {resolve_response.text}"}
-    resolve_data = resolve_response.json()
-    actor_did = resolve_data.get("did")
+    actor_did, resolve_error = resolve_handle_cached(BASE_URL, target_username)
+    if resolve_error:
+        return {"status": "error", "message": resolve_error}
     if not actor_did:
         return {"status": "error", "message": "Could not resolve user's DID"}
 
@@ -293,8 +319,28 @@ bheeman_tools = {
 
 # ====================== AGENT DEFINITIONS ======================
 
+# Agents are stand-ins that import autogen and build the real agent on first use,
+# so starting the script (or importing it) does not pay for autogen up front
+def _autogen():
+    import autogen
+    return autogen
+
+class _LazyAgent:
+    """Proxy for an autogen agent that is constructed the first time it is used."""
+    def __init__(self, factory):
+        self._factory = factory
+        self._agent = None
+
+    def resolve(self):
+        if self._agent is None:
+            self._agent = self._factory()
+        return self._agent
+
+    def __getattr__(self, name):
+        return getattr(self.resolve(), name)
+
 # Sanjay (phi4 multimodal)
-sanjay = AssistantAgent(
+sanjay = _LazyAgent(lambda: _autogen().AssistantAgent(
     name="Sanjay",
     system_message=(
         "You are Sanjay, the perception agent. Your role is to process user input in various forms "
@@ -304,10 +350,10 @@ sanjay = AssistantAgent(
         "format with 'input_type', 'content', and 'analysis' fields."
     ),
     llm_config={"config_list": config_list_phi4, "functions": [sanjay_tools["process_voice"], sanjay_tools["process_image"]]}
-)
+))
 
 # Krsna (o3-mini)
-krsna = AssistantAgent(
+krsna = _LazyAgent(lambda: _autogen().AssistantAgent(
     name="Krsna",
     system_message=(
         "You are Krsna, the intent and analysis agent. Your role is to determine the user's intent and analyze content. "
@@ -317,10 +363,10 @@ krsna = AssistantAgent(
         "'analysis', and 'recommendations' fields."
     ),
     llm_config={"config_list": config_list_o3}
-)
+))
 
 # Hanuman (o3-mini)
-hanuman = AssistantAgent(
+hanuman = _LazyAgent(lambda: _autogen().AssistantAgent(
     name="Hanuman",
     system_message=(
         "You are Hanuman, the search agent. Your role is to search for users on Bluesky and retrieve their information and posts. "
@@ -328,10 +374,10 @@ hanuman = AssistantAgent(
         "Always structure your response in JSON with 'status', 'user_info', and 'posts'."
     ),
     llm_config={"config_list": config_list_o3, "functions": [hanuman_tools["search_user"]]}
-)
+))
 
 # Bheeman (GPT4O-mini)
-bheeman = AssistantAgent(
+bheeman = _LazyAgent(lambda: _autogen().AssistantAgent(
     name="Bheeman",
     system_message=(
         "You are Bheeman, the posting agent. Your role is to format content and post it to Bluesky. "
@@ -340,30 +386,48 @@ bheeman = AssistantAgent(
         "Always structure your response in JSON format with 'status', 'formatted_message', and 'result' fields."
     ),
     llm_config={"config_list": config_list_gpt4o, "functions": [bheeman_tools["post_to_bluesky"]]}
-)
+))
 
 # Sahadevan (o3-mini)
-sahadevan = AssistantAgent(
+sahadevan = _LazyAgent(lambda: _autogen().AssistantAgent(
     name="Sahadevan",
     system_message=(
         "You are Sahadevan, the image processing agent, analyzing images to generate compelling captions. "
         "Always structure your response in JSON with 'analysis', 'caption', and 'recommendations'."
     ),
     llm_config={"config_list": config_list_o3}
-)
+))
 
 # User proxy agent
-user_proxy = UserProxyAgent(
+user_proxy = _LazyAgent(lambda: _autogen().UserProxyAgent(
     name="User",
     human_input_mode="ALWAYS",
     system_message="You are the human user interacting with the Bluesky multi-agent system."
-)
+))
 
 # ====================== GROUP CHAT INITIALIZATION ======================
 
 agents = [user_proxy, sanjay, krsna, hanuman, bheeman, sahadevan]
-group_chat = GroupChat(agents=agents, messages=[], max_round=12)
-manager = GroupChatManager(groupchat=group_chat, llm_config={"config_list": config_list_o3})
+
+@lru_cache(maxsize=None)
+def get_group_chat():
+    """Build the group chat and its manager (and with them every agent) on first use."""
+    autogen = _autogen()
+    group_chat = autogen.GroupChat(agents=[agent.resolve() for agent in agents], messages=[], max_round=12)
+    manager = autogen.GroupChatManager(groupchat=group_chat, llm_config={"config_list": config_list_o3})
+    return group_chat, manager
+
+_LAZY_ATTRIBUTES = {
+    "azure_client": get_azure_client,
+    "group_chat": lambda: get_group_chat()[0],
+    "manager": lambda: get_group_chat()[1]
+}
+
+def __getattr__(name):
+    """Keep module.azure_client / group_chat / manager available, built on first access."""
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ====================== WORKFLOW ORCHESTRATION ======================
 
@@ -381,7 +445,7 @@ def process_post_workflow(user_input, image_path=None):
 
     {"Image path: " + image_path if image_path else "This is a text-only post."}
     """
-    chat_result = user_proxy.initiate_chat(manager, message=workflow_msg)
+    chat_result = user_proxy.initiate_chat(get_group_chat()[1], message=workflow_msg)
     return chat_result
 
 # ====================== INTERACTIVE MAIN FUNCTION ======================
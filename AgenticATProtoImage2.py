@@ -1,25 +1,24 @@
 import os
-import requests
 import datetime
 import base64
 import json
-import speech_recognition as sr
 from dotenv import load_dotenv
-from openai import AzureOpenAI
-import atproto
 import mimetypes
-import autogen
-from autogen import AssistantAgent, UserProxyAgent, GroupChat, GroupChatManager
+from functools import lru_cache
 
 # Load environment variables
 load_dotenv('x.env')
 
 # Initialize Azure OpenAI client (using o3-mini)
-azure_client = AzureOpenAI(
-    azure_endpoint=os.getenv('ENDPOINT_URL'),
-    api_key=os.getenv('AZURE_OPENAI_API_KEY'),
-    api_version="2024-12-01-preview"
-)
+@lru_cache(maxsize=None)
+def get_azure_client():
+    """Build the Azure OpenAI client on first use."""
+    from openai import AzureOpenAI
+    return AzureOpenAI(
+        azure_endpoint=os.getenv('ENDPOINT_URL'),
+        api_key=os.getenv('AZURE_OPENAI_API_KEY'),
+        api_version="2024-12-01-preview"
+    )
 
 # Corrected GPT4O deployment loading
 gpt4o_deployment = os.getenv('GPT4O_DEPLOYMENT_NAME')
@@ -49,6 +48,7 @@ config_list_o3 = [{
 
 def bluesky_login(username, password):
     """Login to Bluesky"""
+    import atproto
     client = atproto.Client()
     client.login(username, password)
     return client
@@ -197,8 +197,28 @@ bheeman_tools = {
 
 # ----- Updated Agent Definitions -----
 
+# Agents are stand-ins that import autogen and build the real agent on first use,
+# so starting the script (or importing it) does not pay for autogen up front
+def _autogen():
+    import autogen
+    return autogen
+
+class _LazyAgent:
+    """Proxy for an autogen agent that is constructed the first time it is used."""
+    def __init__(self, factory):
+        self._factory = factory
+        self._agent = None
+
+    def resolve(self):
+        if self._agent is None:
+            self._agent = self._factory()
+        return self._agent
+
+    def __getattr__(self, name):
+        return getattr(self.resolve(), name)
+
 # Renamed InteractionAgent to Sanjay to handle human inputs.
-sanjay = UserProxyAgent(
+sanjay = _LazyAgent(lambda: _autogen().UserProxyAgent(
     name="Sanjay",
     human_input_mode="ALWAYS",
     system_message=(
@@ -207,9 +227,9 @@ sanjay = UserProxyAgent(
         "Always structure your responses in JSON format with 'input_type', 'content', 'analysis', and 'user_feedback'."
     ),
     code_execution_config=False
-)
+))
 
-krsna = AssistantAgent(
+krsna = _LazyAgent(lambda: _autogen().AssistantAgent(
     name="Krsna",
     system_message=(
         "You are Krsna, the strategist and thinker. Analyze a message's intent and tone, and rewrite it concisely. "
@@ -217,9 +237,9 @@ krsna = AssistantAgent(
         "Return your response in JSON format with the key 'formatted_message'."
     ),
     llm_config={"config_list": config_list_gpt4o}
-)
+))
 
-bheeman = AssistantAgent(
+bheeman = _LazyAgent(lambda: _autogen().AssistantAgent(
     name="Bheeman",
     system_message=(
         "You are Bheeman, the posting agent. Your role is to post messages to Bluesky. "
@@ -233,9 +253,9 @@ bheeman = AssistantAgent(
         "post_to_bluesky": post_to_bluesky_wrapper,
         "fetch_bluesky_following": fetch_bluesky_following_wrapper
     }
-)
+))
 
-arjunan = AssistantAgent(
+arjunan = _LazyAgent(lambda: _autogen().AssistantAgent(
     name="Arjunan",
     system_message=(
         "You are Arjunan, the reactive responder. Post reply messages with a left-leaning perspective. "
@@ -245,9 +265,9 @@ arjunan = AssistantAgent(
         {"name": "reply_to_bluesky", "parameters": {}}
     ]},
     function_map={"reply_to_bluesky": reply_to_bluesky_wrapper}
-)
+))
 
-yudhistran = AssistantAgent(
+yudhistran = _LazyAgent(lambda: _autogen().AssistantAgent(
     name="Yudhistran",
     system_message=(
         "You are Yudhistran, the mediator. Respond with a balanced and soothing tone to messages categorized as 'far-left'. "
@@ -257,22 +277,40 @@ yudhistran = AssistantAgent(
         {"name": "reply_to_bluesky", "parameters": {}}
     ]},
     function_map={"reply_to_bluesky": reply_to_bluesky_wrapper}
-)
+))
 
-nakulan = AssistantAgent(
+nakulan = _LazyAgent(lambda: _autogen().AssistantAgent(
     name="Nakulan",
     system_message=(
         "You are Nakulan, the search agent. Extract DID information from a list of messages. "
         "Return a JSON array where each element includes 'message' and 'did' fields."
     ),
     llm_config={"config_list": config_list_gpt4o}
-)
+))
 
 # ----- GROUP CHAT INITIALIZATION -----
 
 agents = [sanjay, krsna, bheeman, arjunan, yudhistran, nakulan]
-group_chat = GroupChat(agents=agents, messages=[], max_round=20)
-manager = GroupChatManager(groupchat=group_chat, llm_config={"config_list": config_list_gpt4o})
+
+@lru_cache(maxsize=None)
+def get_group_chat():
+    """Build the group chat and its manager (and with them every agent) on first use."""
+    autogen = _autogen()
+    group_chat = autogen.GroupChat(agents=[agent.resolve() for agent in agents], messages=[], max_round=20)
+    manager = autogen.GroupChatManager(groupchat=group_chat, llm_config={"config_list": config_list_gpt4o})
+    return group_chat, manager
+
+_LAZY_ATTRIBUTES = {
+    "azure_client": get_azure_client,
+    "group_chat": lambda: get_group_chat()[0],
+    "manager": lambda: get_group_chat()[1]
+}
+
+def __getattr__(name):
+    """Keep module.azure_client / group_chat / manager available, built on first access."""
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ----- PLAN DISPLAY FUNCTION -----
 
@@ -1,35 +1,32 @@
-# Change to local relative imports - note the period before each module name
-from .sanjay import create_sanjay_agent
-from .krsna import create_krsna_agent
-from .bheeman import create_bheeman_agent
-from .arjunan import create_arjunan_agent
-from .yudhistran import create_yudhistran_agent
-from .nakulan import create_nakulan_agent
-from autogen import GroupChat, GroupChatManager
-from config import config_list_gpt4o  # This is correct (absolute import)
+# Agent modules (and autogen with them) are imported only when an agent is first used
+from .registry import AgentRegistry, lazy_factory
+from config import get_config_list_gpt4o
 
-def initialize_agents():
-    """Initialize all agents and return them as a dictionary"""
-    sanjay = create_sanjay_agent()
-    krsna = create_krsna_agent()
-    bheeman = create_bheeman_agent()
-    arjunan = create_arjunan_agent()
-    yudhistran = create_yudhistran_agent()
-    nakulan = create_nakulan_agent()
-    
-    return {
-        "sanjay": sanjay,
-        "krsna": krsna,
-        "bheeman": bheeman,
-        "arjunan": arjunan,
-        "yudhistran": yudhistran,
-        "nakulan": nakulan
-    }
+AGENT_FACTORIES = {
+    "sanjay": lazy_factory("sanjay", "create_sanjay_agent"),
+    "krsna": lazy_factory("krsna", "create_krsna_agent"),
+    "bheeman": lazy_factory("bheeman", "create_bheeman_agent"),
+    "arjunan": lazy_factory("arjunan", "create_arjunan_agent"),
+    "yudhistran": lazy_factory("yudhistran", "create_yudhistran_agent"),
+    "nakulan": lazy_factory("nakulan", "create_nakulan_agent")
+}
+
+def initialize_agents(lazy=True):
+    """
+    Return the agents as a dict-like registry (agents["krsna"], ...).
+
+    Each agent is built on first access; pass lazy=False to build all of them now.
+    """
+    agents = AgentRegistry(AGENT_FACTORIES)
+    if not lazy:
+        agents.warm_up(background=False)
+    return agents
 
 def setup_group_chat(agents_dict):
     """Set up the group chat for agent collaboration"""
+    from autogen import GroupChat, GroupChatManager
     agents_list = list(agents_dict.values())
     group_chat = GroupChat(agents=agents_list, messages=[], max_round=20)
-    manager = GroupChatManager(groupchat=group_chat, llm_config={"config_list": config_list_gpt4o})
+    manager = GroupChatManager(groupchat=group_chat, llm_config={"config_list": get_config_list_gpt4o()})
     
-    return group_chat, manager
\ No newline at end of file
+    return group_chat, manager
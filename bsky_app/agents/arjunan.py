@@ -1,5 +1,5 @@
 from autogen import AssistantAgent
-from config import config_list_gpt4o  # Changed from ..config
+from config import get_config_list_gpt4o  # Changed from ..config
 from utils.bluesky import reply_to_bluesky_wrapper  # This is fine
 
 
@@ -11,7 +11,7 @@ def create_arjunan_agent():
             "You are Arjunan, the reactive responder. Post reply messages with a left-leaning perspective. "
             "Ensure your tone is assertive and progressive, and respond in JSON format."
         ),
-        llm_config={"config_list": config_list_gpt4o, "functions": [ 
+        llm_config={"config_list": get_config_list_gpt4o(), "functions": [ 
             {"name": "reply_to_bluesky", "parameters": {}}
         ]},
         function_map={"reply_to_bluesky": reply_to_bluesky_wrapper}
@@ -1,5 +1,5 @@
 from autogen import AssistantAgent
-from config import config_list_gpt4o  # Changed from ..config
+from config import get_config_list_gpt4o  # Changed from ..config
 from utils.bluesky import post_to_bluesky_wrapper, fetch_bluesky_following_wrapper  # This is fine
 
 
@@ -16,7 +16,7 @@ def create_bheeman_agent():
             "You are Bheeman, the posting agent. Your role is to post messages to Bluesky. "
             "Always return your output in JSON format with 'status', 'formatted_message', and 'result'."
         ),
-        llm_config={"config_list": config_list_gpt4o, "functions": [
+        llm_config={"config_list": get_config_list_gpt4o(), "functions": [
             bheeman_tools["post_to_bluesky"],
             bheeman_tools["fetch_bluesky_following"]
         ]},
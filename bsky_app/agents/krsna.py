@@ -1,5 +1,5 @@
 from autogen import AssistantAgent
-from config import config_list_gpt4o  # Changed from relative to absolute import
+from config import get_config_list_gpt4o  # Changed from relative to absolute import
 
 def create_krsna_agent():
     """Create and return the Krsna (Strategist) agent"""
@@ -10,5 +10,5 @@ def create_krsna_agent():
             "Rewrite the provided message in 180 characters with a left-leaning tone. "
             "Return your response in JSON format with the key 'formatted_message'."
         ),
-        llm_config={"config_list": config_list_gpt4o}
+        llm_config={"config_list": get_config_list_gpt4o()}
     )
\ No newline at end of file
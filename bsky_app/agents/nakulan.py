@@ -1,6 +1,6 @@
 # filepath: atproto_app/agents/nakulan.py
 from autogen import AssistantAgent
-from config import config_list_gpt4o
+from config import get_config_list_gpt4o
 
 def create_nakulan_agent():
     """Create and return the Nakulan (Search) agent"""
@@ -10,5 +10,5 @@ def create_nakulan_agent():
             "You are Nakulan, the search agent. Extract DID information from a list of messages. "
             "Return a JSON array where each element includes 'message' and 'did' fields."
         ),
-        llm_config={"config_list": config_list_gpt4o}
+        llm_config={"config_list": get_config_list_gpt4o()}
     )
\ No newline at end of file
@@ -0,0 +1,84 @@
+# filepath: atproto_app/agents/registry.py
+import time
+import threading
+import importlib
+from collections.abc import Mapping
+
+
+class AgentRegistry(Mapping):
+    """
+    Dict-like collection of agents that builds each one on first access.
+
+    `factories` maps an agent name to a zero-argument callable returning the
+    agent. agents["krsna"] builds Krsna the first time and returns the same
+    instance afterwards; agents that are never used are never built.
+    warm_up() builds agents on a background thread ahead of use, and
+    construction_times() reports how long each build took.
+    """
+
+    def __init__(self, factories):
+        self._factories = dict(factories)
+        self._agents = {}
+        self._locks = {name: threading.Lock() for name in self._factories}
+        self._build_times = {}
+
+    def __getitem__(self, name):
+        agent = self._agents.get(name)
+        if agent is not None:
+            return agent
+        if name not in self._factories:
+            raise KeyError(name)
+        # One lock per agent, so a background warm-up never blocks access to another agent
+        with self._locks[name]:
+            agent = self._agents.get(name)
+            if agent is None:
+                start = time.perf_counter()
+                agent = self._factories[name]()
+                self._build_times[name] = time.perf_counter() - start
+                self._agents[name] = agent
+        return agent
+
+    def __iter__(self):
+        return iter(self._factories)
+
+    def __len__(self):
+        return len(self._factories)
+
+    def is_built(self, name):
+        return name in self._agents
+
+    def warm_up(self, names=None, background=True):
+        """
+        Build the named agents (default: all) now, on a daemon thread unless background=False.
+
+        A failed build is only reported on the background thread (the agent is
+        built again on first access); with background=False it is raised.
+        """
+        names = list(names or self._factories)
+
+        if not background:
+            for name in names:
+                self[name]
+            return None
+
+        def build():
+            for name in names:
+                try:
+                    self[name]
+                except Exception as e:
+                    print(f"Warm-up of agent '{name}' failed: {e}")
+
+        thread = threading.Thread(target=build, name="agent-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def construction_times(self):
+        """Return {agent name: seconds taken to build it} for the agents built so far."""
+        return dict(self._build_times)
+
+
+def lazy_factory(module, function):
+    """Return a factory that imports agents.<module> only when the agent is first built."""
+    def factory():
+        return getattr(importlib.import_module("." + module, __package__), function)()
+    return factory
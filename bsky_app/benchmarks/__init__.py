@@ -0,0 +1,5 @@
+"""
+Benchmark scripts for the Bluesky application.
+
+Run them from the bsky_app directory, e.g. `python -m benchmarks.session_benchmark`.
+"""
@@ -0,0 +1,89 @@
+"""
+Report where cold-start import time goes and fail when it regresses.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter,
+parses the per-module timings it writes to stderr and prints the modules
+with the largest cumulative and self times. The total is compared with
+COLD_START_BUDGET_MS (env BSKY_COLD_START_BUDGET_MS); the script exits with
+status 1 when it is over budget, so it can guard against a heavy dependency
+creeping back into module scope.
+
+Usage: python -m benchmarks.importtime_report [module] [top]
+"""
+import os
+import sys
+import subprocess
+from config import get_setting
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _env():
+    env = dict(os.environ)
+    env.setdefault("GPT4O_DEPLOYMENT_NAME", "importtime-report")
+    env.setdefault("ENDPOINT_URL", "https://example.invalid")
+    env.setdefault("AZURE_OPENAI_API_KEY", "importtime-report")
+    return env
+
+
+def parse_importtime(output):
+    """
+    Parse -X importtime output into a list of (module, self_us, cumulative_us, depth).
+
+    Lines look like "import time:       153 |        542 |   encodings.aliases";
+    the module column is indented by two spaces per nesting level, so
+    top-level imports have depth 0.
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Header line
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), int(fields[0]), int(fields[1]), depth))
+    return entries
+
+
+def measure(module="main"):
+    """Import `module` under -X importtime and return its parsed entries."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=APP_DIR, env=_env(), stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, text=True)
+    if result.returncode:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError(errors[-1] if errors else f"import {module} failed")
+    return parse_importtime(result.stderr)
+
+
+def module_ms(entries, module):
+    """Cumulative import time of `module` itself in ms (interpreter start-up imports excluded)."""
+    return sum(cumulative for name, _, cumulative, depth in entries if depth == 0 and name == module) / 1000
+
+
+def main(module="main", top=15):
+    try:
+        entries = measure(module)
+    except RuntimeError as e:
+        print(f"import {module} failed: {e}")
+        return 2
+    print(f"Slowest imports for `import {module}` (cumulative ms / self ms):")
+    for name, self_us, cumulative, _ in sorted(entries, key=lambda e: e[2], reverse=True)[:top]:
+        print(f"  {cumulative / 1000:8.1f} {self_us / 1000:8.1f}  {name}")
+    print("Largest self times:")
+    for name, self_us, _, _ in sorted(entries, key=lambda e: e[1], reverse=True)[:top]:
+        print(f"  {self_us / 1000:8.1f}  {name}")
+    total = module_ms(entries, module)
+    budget = get_setting("COLD_START_BUDGET_MS")
+    print(f"import {module}: {total:.1f} ms across {len(entries)} modules (budget {budget:.0f} ms)")
+    if total > budget:
+        print("Cold start is over budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1] if len(sys.argv) > 1 else "main",
+                  int(sys.argv[2]) if len(sys.argv) > 2 else 15))
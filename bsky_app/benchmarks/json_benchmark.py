@@ -0,0 +1,168 @@
+"""
+Micro-benchmark and fuzz run for the LLM JSON extractor.
+
+benchmarks/json_corpus.jsonl holds agent answers in the shapes the workflows
+see (rewrites, leanings, validations, analysis arrays, candidate lists),
+each with the value it should parse to. Entries with "source": "agent" are
+real replies (from the autogen cache in .cache/41 and the LLM response
+cache); the rest are handwritten edge cases. Every entry is also mutated the way
+models tend to mangle JSON: code fences, prose before and after, single
+quotes and trailing commas. The report compares how many of them parse
+correctly with the old fence-stripping + json.loads and with
+find_json_text, and how long each takes per response.
+
+A second pass feeds randomly corrupted responses to the extractor to make
+sure it never raises. With --cache, the replies stored in the LLM response
+cache are added as well (they have no expected value, so they only count
+towards "found JSON" and timing). --export-cache appends the cached replies
+that parse unambiguously (code fences stripped, then json.loads) to the
+corpus as new seeds, with that parse as their expected value.
+
+Usage: python -m benchmarks.json_benchmark [--cache | --export-cache] [mutations_per_entry]
+"""
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+from config import get_setting
+from utils.json_extract import find_json_text
+from utils.helpers import get_reply_content
+
+CORPUS_FILE = os.path.join(os.path.dirname(__file__), "json_corpus.jsonl")
+
+
+def old_extract(text):
+    """The previous approach: strip code fences and hand the rest to json.loads."""
+    try:
+        return json.loads(text.replace("```json", "").replace("```", "").strip())
+    except ValueError:
+        return None
+
+
+def new_extract(text):
+    found = find_json_text(text)
+    return json.loads(found) if found is not None else None
+
+
+def _single_quote(text):
+    """Swap double for single quotes when the text has no apostrophes that would clash."""
+    return text.replace('"', "'") if "'" not in text and '\\"' not in text else text
+
+
+def _trailing_comma(text):
+    end = max(text.rfind("}"), text.rfind("]"))
+    return text[:end] + "," + text[end:] if end > 0 else text
+
+
+MUTATIONS = [
+    lambda text: "```json\n" + text + "\n```",
+    lambda text: "Sure! Here is the JSON you asked for:\n" + text,
+    lambda text: text + "\n\nLet me know if you would like any changes.",
+    _single_quote,
+    _trailing_comma,
+    lambda text: "Of course.\n```\n" + _trailing_comma(text) + "\n```\nHope this helps!",
+]
+
+
+def load_corpus(mutations_per_entry, rng):
+    with open(CORPUS_FILE, "r", encoding="utf-8") as f:
+        seeds = [json.loads(line) for line in f if line.strip()]
+    corpus = [(entry["response"], entry["expect"]) for entry in seeds]
+    for entry in seeds:
+        for _ in range(mutations_per_entry):
+            text = entry["response"]
+            for mutate in rng.sample(MUTATIONS, rng.randint(1, 3)):
+                text = mutate(text)
+            corpus.append((text, entry["expect"]))
+    return corpus
+
+
+def load_cached_replies():
+    """Return the agent replies stored in the LLM response cache."""
+    if not os.path.exists(get_setting("LLM_CACHE_PATH")):
+        return []
+    conn = sqlite3.connect(get_setting("LLM_CACHE_PATH"))
+    try:
+        rows = conn.execute("SELECT response FROM responses").fetchall()
+    finally:
+        conn.close()
+    return [get_reply_content(json.loads(row[0])) for row in rows]
+
+
+def export_cached_seeds():
+    """Append cached replies with an unambiguous parse to the corpus; returns how many were added."""
+    with open(CORPUS_FILE, "r", encoding="utf-8") as f:
+        known = {json.loads(line)["response"] for line in f if line.strip()}
+    added = 0
+    with open(CORPUS_FILE, "a", encoding="utf-8") as f:
+        for text in load_cached_replies():
+            expect = old_extract(text)
+            if expect is None or text in known:
+                continue
+            known.add(text)
+            f.write(json.dumps({"response": text, "expect": expect, "source": "agent"}) + "\n")
+            added += 1
+    return added
+
+
+def _time(extract, texts, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            extract(text)
+    return (time.perf_counter() - start) * 1e6 / (repeat * len(texts))
+
+
+def _corrupt(text, rng):
+    chars = list(text)
+    for _ in range(rng.randint(1, 6)):
+        position = rng.randrange(len(chars) + 1)
+        if chars and rng.random() < 0.5:
+            del chars[min(position, len(chars) - 1)]
+        else:
+            chars.insert(position, rng.choice("{}[]\"',:\\ \nabc1"))
+    return "".join(chars)
+
+
+def main(mutations_per_entry=20, use_cache=False):
+    rng = random.Random(0)
+    corpus = load_corpus(mutations_per_entry, rng)
+    texts = [text for text, _ in corpus]
+    print(f"Corpus: {len(corpus)} responses ({len(corpus) // (mutations_per_entry + 1)} seeds)")
+
+    for label, extract in (("fences + json.loads", old_extract), ("find_json_text", new_extract)):
+        correct = sum(1 for text, expect in corpus if extract(text) == expect)
+        print(f"{label:<20} correct {correct:5}/{len(corpus)} ({correct / len(corpus):6.1%})   "
+              f"{_time(extract, texts):7.1f} us per response")
+
+    if use_cache:
+        cached = load_cached_replies()
+        if cached:
+            for label, extract in (("fences + json.loads", old_extract), ("find_json_text", new_extract)):
+                found = sum(1 for text in cached if extract(text) is not None)
+                print(f"cached replies, {label:<20} found JSON in {found}/{len(cached)}")
+        else:
+            print("No cached replies found.")
+
+    crashes = 0
+    fuzzed = 0
+    for text in texts:
+        for _ in range(10):
+            fuzzed += 1
+            try:
+                find_json_text(_corrupt(text, rng))
+                find_json_text(_corrupt(text, rng), partial=True)
+            except Exception as e:
+                crashes += 1
+                print(f"Extractor raised {e!r}")
+    print(f"Fuzz: {fuzzed} corrupted responses, {crashes} exceptions")
+
+
+if __name__ == "__main__":
+    if "--export-cache" in sys.argv:
+        print(f"Added {export_cached_seeds()} cached replies to {CORPUS_FILE}")
+        sys.exit(0)
+    args = [arg for arg in sys.argv[1:] if arg != "--cache"]
+    main(int(args[0]) if args else 20, use_cache="--cache" in sys.argv)
@@ -0,0 +1,63 @@
+"""
+Measure how well the local political-leaning classifier agrees with Krsna.
+
+The posts Krsna has already labelled in the local store are split into a
+training and a held-out set. For each confidence threshold and minimum
+number of known n-grams the report shows how many held-out posts the
+classifier would answer on its own (LLM calls saved) and how often those
+answers match Krsna's label (agreement rate), to pick
+LEANING_CONFIDENCE_THRESHOLD and LEANING_MIN_KNOWN_FEATURES from.
+Finally the model is retrained on every labelled post and saved to
+LEANING_MODEL_PATH for the reply workflow to use.
+
+Usage: python -m benchmarks.leaning_benchmark [test_fraction]
+"""
+import sys
+import time
+import random
+from utils.store import get_post_store
+from utils.leaning import LeaningClassifier, hashed_features, normalize_leaning, train_leaning_classifier
+
+THRESHOLDS = [0.5, 0.6, 0.7, 0.8, 0.9, 0.95]
+MIN_KNOWN_FEATURES = [1, 3, 5]
+
+
+def main(test_fraction=0.2):
+    store = get_post_store()
+    examples = [(text, normalize_leaning(label)) for text, label in store.labeled_leanings()]
+    examples = [(text, label) for text, label in examples if label]
+    if len(examples) < 10:
+        print(f"Only {len(examples)} labelled posts in the store; run the reply workflow to collect more.")
+        return
+    random.Random(0).shuffle(examples)
+    split = max(1, int(len(examples) * test_fraction))
+    test, train = examples[:split], examples[split:]
+
+    classifier = LeaningClassifier()
+    start = time.perf_counter()
+    classifier.fit([text for text, _ in train], [label for _, label in train])
+    print(f"Trained on {len(train)} posts in {time.perf_counter() - start:.2f} s; testing on {len(test)}.")
+
+    start = time.perf_counter()
+    predictions = [(classifier.predict(text, min_known_features=0), label) for text, label in test]
+    per_post = (time.perf_counter() - start) * 1000 / len(test)
+    overall = sum(1 for (leaning, _), label in predictions if leaning == label) / len(test)
+    print(f"Prediction: {per_post:.3f} ms per post, overall agreement {overall:.1%}\n")
+    known = [classifier.known_features(hashed_features(text, classifier.dim)) for text, _ in test]
+
+    print(f"{'min known':>9} {'threshold':>9} {'LLM calls saved':>16} {'agreement':>10}")
+    for min_known in MIN_KNOWN_FEATURES:
+        for threshold in THRESHOLDS:
+            confident = [(leaning, label) for ((leaning, confidence), label), count in zip(predictions, known)
+                         if confidence >= threshold and count >= min_known]
+            agreement = (sum(1 for leaning, label in confident if leaning == label) / len(confident)
+                         if confident else 0.0)
+            print(f"{min_known:>9} {threshold:>9.2f} {len(confident):>7} ({len(confident) / len(test):>6.1%}) "
+                  f"{agreement:>10.1%}")
+
+    train_leaning_classifier(store)
+    print("\nSaved a model trained on all labelled posts.")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 0.2)
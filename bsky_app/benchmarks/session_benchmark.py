@@ -0,0 +1,48 @@
+"""
+Compare per-action latency of login-per-call against the shared session.
+
+Each action is a read-only get_timeline(limit=1) call so the benchmark can be
+run against a live account without posting anything.
+
+Usage: python -m benchmarks.session_benchmark [iterations]
+"""
+import sys
+import time
+import statistics
+from utils.bluesky import bluesky_login
+from utils.session import BlueskySessionManager
+
+
+def _run(label, action, iterations):
+    """Time `action` for the given number of iterations and print a summary."""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        action()
+        timings.append((time.perf_counter() - start) * 1000)
+    print(f"{label:<22} mean {statistics.mean(timings):8.1f} ms   "
+          f"median {statistics.median(timings):8.1f} ms   max {max(timings):8.1f} ms")
+    return timings
+
+
+def main(iterations=10):
+    print(f"Running {iterations} timeline reads per mode...")
+
+    def login_per_call():
+        client = bluesky_login()
+        client.get_timeline(limit=1)
+
+    manager = BlueskySessionManager()
+
+    def shared_session():
+        manager.get_client().get_timeline(limit=1)
+
+    baseline = _run("login per call", login_per_call, iterations)
+    shared = _run("shared session", shared_session, iterations)
+    print(f"Speed-up (mean): {statistics.mean(baseline) / statistics.mean(shared):.1f}x")
+    print(f"createSession calls: {iterations} vs {manager.logins} "
+          f"(session restored from disk: {manager.restores})")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
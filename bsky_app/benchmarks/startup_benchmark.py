@@ -0,0 +1,80 @@
+"""
+Measure cold-start cost of the application: import time and time to first menu.
+
+Each measurement runs in a fresh interpreter so nothing is cached in
+sys.modules. Import times are reported for the main entry points on top of
+a bare interpreter start; time to first menu runs main.py until it prints
+"Choose an action:" and then stops it. No network calls are made before
+the menu, so placeholder Azure settings are filled in when none are set.
+
+Usage: python -m benchmarks.startup_benchmark [runs]
+"""
+import os
+import sys
+import time
+import statistics
+import subprocess
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ["config", "utils", "agents", "workflow", "main"]
+MENU_MARKER = "Choose an action:"
+
+
+def _env():
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    env.setdefault("GPT4O_DEPLOYMENT_NAME", "startup-benchmark")
+    env.setdefault("ENDPOINT_URL", "https://example.invalid")
+    env.setdefault("AZURE_OPENAI_API_KEY", "startup-benchmark")
+    return env
+
+
+def _time_command(args):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable] + args, cwd=APP_DIR, env=_env(),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return time.perf_counter() - start
+
+
+def time_import(module, runs):
+    """Median seconds to import `module` in a fresh interpreter, minus interpreter start-up."""
+    baseline = statistics.median(_time_command(["-c", "pass"]) for _ in range(runs))
+    return statistics.median(_time_command(["-c", f"import {module}"]) for _ in range(runs)) - baseline
+
+
+def time_to_menu():
+    """Seconds from launching main.py until the first menu is printed."""
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "main.py"], cwd=APP_DIR, env=_env(), text=True,
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    try:
+        last_line = ""
+        for line in process.stdout:
+            if MENU_MARKER in line:
+                return time.perf_counter() - start
+            last_line = line.strip() or last_line
+        raise RuntimeError(f"main.py exited before showing the menu ({last_line})")
+    finally:
+        process.kill()
+        process.wait()
+
+
+def main(runs=5):
+    print(f"Median of {runs} cold starts:")
+    for module in MODULES:
+        try:
+            print(f"  import {module:<10} {time_import(module, runs) * 1000:8.1f} ms")
+        except RuntimeError as e:
+            print(f"  import {module:<10} failed: {e}")
+    try:
+        menu = statistics.median(time_to_menu() for _ in range(runs))
+    except RuntimeError as e:
+        print(f"  time to first menu failed: {e}")
+        return None
+    print(f"  time to first menu {menu * 1000:8.1f} ms")
+    return menu
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -1,29 +1,162 @@
 import os
-from dotenv import load_dotenv
-from openai import AzureOpenAI
-
-# Load environment variables
-load_dotenv('x.env')
-
-# Initialize Azure OpenAI client
-azure_client = AzureOpenAI(
-    azure_endpoint=os.getenv('ENDPOINT_URL'),
-    api_key=os.getenv('AZURE_OPENAI_API_KEY'),
-    api_version="2024-12-01-preview"
-)
-
-# GPT-4o deployment configuration
-gpt4o_deployment = os.getenv('GPT4O_DEPLOYMENT_NAME')
-assert gpt4o_deployment, "GPT4O deployment name missing in environment variables"
-
-config_list_gpt4o = [{
-    "model": gpt4o_deployment,
-    "api_key": os.getenv('AZURE_OPENAI_API_KEY'),
-    "base_url": os.getenv('ENDPOINT_URL'),
-    "api_type": "azure",
-    "api_version": "2024-12-01-preview"
-}]
-
-# Bluesky credentials
-BLUESKY_USERNAME = os.getenv('BSKYUNAME')
-BLUESKY_PASSWORD = os.getenv('BSKYPASSWD')
\ No newline at end of file
+from functools import lru_cache
+
+# Settings and clients are resolved on first use rather than at import time, so
+# importing this module (or anything that imports it) neither reads x.env nor
+# builds the Azure client nor fails when credentials are missing. Call
+# get_setting("NAME") and the get_* accessors at the point of use; the
+# module-level __getattr__ below only keeps old `from config import NAME`
+# imports working, and those read the environment as soon as they run.
+
+ENV_FILE = 'x.env'
+AZURE_API_VERSION = "2024-12-01-preview"
+
+
+def _flag(value):
+    return value == '1'
+
+
+def _list(value):
+    return [item.strip().lower() for item in value.split(',') if item.strip()]
+
+
+# name: (environment variable, default, type)
+_SETTINGS = {
+    # Bluesky credentials
+    'BLUESKY_USERNAME': ('BSKYUNAME', None, str),
+    'BLUESKY_PASSWORD': ('BSKYPASSWD', None, str),
+
+    # File where the exported Bluesky session string is kept between runs
+    'BLUESKY_SESSION_FILE': ('BSKY_SESSION_FILE', '.bsky_session', str),
+
+    # SQLite database holding synced posts, authors and analysis results
+    'POST_STORE_PATH': ('BSKY_POST_STORE', 'bsky_posts.db', str),
+
+    # JSON file caching handle -> DID lookups between runs (empty to keep them in memory only)
+    'HANDLE_CACHE_FILE': ('BSKY_HANDLE_CACHE', '.bsky_handles.json', str),
+
+    # Disk cache of agent replies for identical prompts
+    'LLM_CACHE_PATH': ('BSKY_LLM_CACHE', '.llm_cache.db', str),
+    'LLM_CACHE_TTL': ('BSKY_LLM_CACHE_TTL', '86400', int),
+    'LLM_CACHE_MAX_ENTRIES': ('BSKY_LLM_CACHE_MAX_ENTRIES', '5000', int),
+
+    # Local political-leaning classifier: saved model file, the confidence below
+    # which the leaning is still asked of Krsna, and how many of a post's n-grams
+    # the model must have seen in training to answer at all
+    'LEANING_MODEL_PATH': ('BSKY_LEANING_MODEL', '.leaning_model.npz', str),
+    'LEANING_CONFIDENCE_THRESHOLD': ('BSKY_LEANING_THRESHOLD', '0.8', float),
+    'LEANING_MIN_KNOWN_FEATURES': ('BSKY_LEANING_MIN_FEATURES', '3', int),
+
+    # Start both responders' drafts while Krsna is still categorizing a message
+    # (lower reply latency at the cost of one extra draft per reply)
+    'SPECULATIVE_REPLIES': ('BSKY_SPECULATIVE_REPLIES', '0', _flag),
+
+    # Generate Krsna's fair alternative reply in the background while the user
+    # reviews the first draft (no wait on rejection, extra tokens on approval)
+    'PREFETCH_FAIR_REPLY': ('BSKY_PREFETCH_FAIR_REPLY', '0', _flag),
+
+    # Number of reply candidates a responder is asked for in one call (1 = single reply)
+    'REPLY_CANDIDATES': ('BSKY_REPLY_CANDIDATES', '1', int),
+
+    # Stream Krsna's rewrites and the responders' drafts token by token
+    'STREAM_REPLIES': ('BSKY_STREAM_REPLIES', '0', _flag),
+
+    # JSON file of blocklist words and block/review patterns for local reply validation
+    'REPLY_RULES_FILE': ('BSKY_REPLY_RULES', 'reply_rules.json', str),
+
+    # Cold-start budget in milliseconds for `import main`; benchmarks.importtime_report
+    # exits non-zero when the measured import time exceeds it
+    'COLD_START_BUDGET_MS': ('BSKY_COLD_START_BUDGET_MS', '300', float),
+
+    # Headless daemon (main.py --daemon): seconds between timeline polls, replies
+    # drafted in parallel and at most drafted per cycle
+    'DAEMON_INTERVAL': ('BSKY_DAEMON_INTERVAL', '300', float),
+    'DAEMON_CONCURRENCY': ('BSKY_DAEMON_CONCURRENCY', '4', int),
+    'DAEMON_MAX_REPLIES': ('BSKY_DAEMON_MAX_REPLIES', '10', int),
+
+    # Krsna's message categories the daemon replies to
+    'DAEMON_REPLY_CATEGORIES': ('BSKY_DAEMON_REPLY_CATEGORIES', 'opinion,question', _list),
+
+    # When the daemon posts without approval: never (queue everything), validated
+    # (the validator or Krsna approved the reply) or always (unless validation rejected it)
+    'DAEMON_AUTO_POST': ('BSKY_DAEMON_AUTO_POST', 'never', str),
+
+    # Seconds the background worker waits between checks for approved replies to post
+    'POSTING_WORKER_INTERVAL': ('BSKY_POSTING_INTERVAL', '5', float),
+
+    # Seconds after which a reply left in "posting" (its worker died mid-post) is marked failed
+    'POSTING_LEASE': ('BSKY_POSTING_LEASE', '300', float),
+
+    # Queued reply drafts shown per page in the batch review
+    'REVIEW_PAGE_SIZE': ('BSKY_REVIEW_PAGE_SIZE', '20', int),
+}
+
+
+@lru_cache(maxsize=None)
+def load_environment():
+    """Load environment variables from x.env (once per process)."""
+    from dotenv import load_dotenv
+    load_dotenv(ENV_FILE)
+    return True
+
+
+@lru_cache(maxsize=None)
+def get_setting(name):
+    """Return a setting from _SETTINGS, read from the environment on first use."""
+    load_environment()
+    env_var, default, cast = _SETTINGS[name]
+    value = os.getenv(env_var, default)
+    return cast(value) if value is not None else None
+
+
+@lru_cache(maxsize=None)
+def get_azure_client():
+    """Return the Azure OpenAI client, built on first use."""
+    from openai import AzureOpenAI
+    load_environment()
+    return AzureOpenAI(
+        azure_endpoint=os.getenv('ENDPOINT_URL'),
+        api_key=os.getenv('AZURE_OPENAI_API_KEY'),
+        api_version=AZURE_API_VERSION
+    )
+
+
+@lru_cache(maxsize=None)
+def get_gpt4o_deployment():
+    """Return the GPT-4o deployment name; fails on first use if it is not configured."""
+    load_environment()
+    gpt4o_deployment = os.getenv('GPT4O_DEPLOYMENT_NAME')
+    assert gpt4o_deployment, "GPT4O deployment name missing in environment variables"
+    return gpt4o_deployment
+
+
+@lru_cache(maxsize=None)
+def get_config_list_gpt4o():
+    """Return the autogen config list for the GPT-4o deployment."""
+    return [{
+        "model": get_gpt4o_deployment(),
+        "api_key": os.getenv('AZURE_OPENAI_API_KEY'),
+        "base_url": os.getenv('ENDPOINT_URL'),
+        "api_type": "azure",
+        "api_version": AZURE_API_VERSION
+    }]
+
+
+_LAZY = {
+    'azure_client': get_azure_client,
+    'gpt4o_deployment': get_gpt4o_deployment,
+    'config_list_gpt4o': get_config_list_gpt4o,
+}
+
+
+def __getattr__(name):
+    """Resolve settings and clients on first attribute access (PEP 562)."""
+    if name in _LAZY:
+        return _LAZY[name]()
+    if name in _SETTINGS:
+        return get_setting(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY) + list(_SETTINGS))
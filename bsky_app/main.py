@@ -1,15 +1,24 @@
 # Change to absolute imports
+import argparse
+import threading
 from agents import initialize_agents  # Remove the dot
-from workflow import (
-    process_post_workflow, show_post_plan,
-    process_reply_workflow, show_reply_plan,
-    search_subject_flow, show_search_plan
-)
+import workflow  # Workflow modules are imported when their menu entry is first chosen
+
+def _posting_worker():
+    from utils.posting_worker import get_posting_worker
+    return get_posting_worker()
+
+def start_posting_worker():
+    """Start posting approved replies in the background; the Bluesky client is imported off the main thread."""
+    threading.Thread(target=lambda: _posting_worker().start(), name="reply-poster-start", daemon=True).start()
 
 def main():
     """Main function to drive the Bluesky posting, replying, and subject search workflows."""
-    # Initialize agents
+    # Agents are built on first use; Krsna takes part in every workflow, so build it
+    # in the background while the menu is shown
     agents = initialize_agents()
+    agents.warm_up(["krsna"])
+    start_posting_worker()
     
     # Main menu loop
     while True:
@@ -17,32 +26,81 @@ def main():
         print("1. Post a message to Bluesky")
         print("2. Process replies to Bluesky messages")
         print("3. Search messages by subject and possibly reply")
-        print("4. Exit")
+        print("4. Search all of Bluesky for a subject and possibly reply")
+        print("5. Review queued replies")
+        print("6. Exit")
         
-        choice = agents["sanjay"].get_human_input("Enter your choice (1, 2, 3, or 4): ").strip()
+        choice = agents["sanjay"].get_human_input("Enter your choice (1, 2, 3, 4, 5, or 6): ").strip()
         
         if choice == "1":
-            show_post_plan()
+            workflow.show_post_plan()
             user_input = agents["sanjay"].get_human_input("Enter the message to post: ").strip()
             if user_input:
-                process_post_workflow(user_input, agents)
+                workflow.process_post_workflow(user_input, agents)
             else:
                 print("No message entered.")
                 
         elif choice == "2":
-            show_reply_plan()
-            process_reply_workflow(agents)
+            workflow.show_reply_plan()
+            workflow.process_reply_workflow(agents)
             
         elif choice == "3":
-            show_search_plan()
-            search_subject_flow(agents)
+            workflow.show_search_plan()
+            workflow.search_subject_flow(agents)
             
         elif choice == "4":
+            workflow.show_search_plan()
+            workflow.search_posts_flow(agents)
+            
+        elif choice == "5":
+            workflow.show_review_plan()
+            workflow.review_reply_queue(agents)
+            
+        elif choice == "6":
+            worker = _posting_worker()
+            worker.stop(timeout=30)
+            print(f"Replies posted by the background worker this session: {worker.stats()['posted']}")
+            timings = ", ".join(f"{name} {seconds * 1000:.0f} ms"
+                                for name, seconds in agents.construction_times().items())
+            print(f"Agents built this session: {timings or 'none'}")
             print("Exiting the script.")
             break
             
         else:
-            print("Invalid choice. Please enter 1, 2, 3, or 4.")
+            print("Invalid choice. Please enter 1, 2, 3, 4, 5, or 6.")
+
+def run_daemon(interval=None, concurrency=None, auto_post=None, cycles=None):
+    """Run the headless reply daemon; only Krsna, Arjunan and Yudhistran are built, never Sanjay."""
+    agents = initialize_agents()
+    # Replies approved in a review (in this or another process) are posted alongside the daemon's own
+    worker = _posting_worker()
+    worker.start()
+    try:
+        daemon = workflow.ReplyDaemon(agents, interval=interval, concurrency=concurrency, auto_post=auto_post)
+        daemon.run(cycles=cycles)
+    finally:
+        # Let the reply being posted finish, so it is not left claimed
+        worker.stop(timeout=30)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Bluesky posting, replying and search assistant.")
+    parser.add_argument("--daemon", action="store_true",
+                        help="run without prompts: poll the timeline and post or queue replies")
+    parser.add_argument("--interval", type=float, help="seconds between daemon cycles (BSKY_DAEMON_INTERVAL)")
+    parser.add_argument("--concurrency", type=int, help="replies drafted in parallel (BSKY_DAEMON_CONCURRENCY)")
+    parser.add_argument("--auto-post", choices=["never", "validated", "always"],
+                        help="which replies the daemon posts without approval (BSKY_DAEMON_AUTO_POST)")
+    parser.add_argument("--cycles", type=int, help="stop the daemon after this many cycles")
+    parser.add_argument("--review", action="store_true",
+                        help="review queued reply drafts in bulk, then exit once approved replies are posted")
+    args = parser.parse_args()
+    if args.daemon:
+        run_daemon(args.interval, args.concurrency, args.auto_post, args.cycles)
+    elif args.review:
+        workflow.review_reply_queue(initialize_agents())
+        print("Posting approved replies...")
+        worker = _posting_worker()
+        worker.post_approved()
+        worker.stop(timeout=30)
+    else:
+        main()
\ No newline at end of file
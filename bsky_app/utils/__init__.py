@@ -2,40 +2,236 @@
 Utility functions for the ATProto application.
 """
 
-# Import and expose key functions from the utility modules
-from .bluesky import (
-    bluesky_login,
-    post_to_bluesky,
-    like_bluesky,
-    reply_to_bluesky,
-    fetch_bluesky_following,
-    post_to_bluesky_wrapper,
-    like_bluesky_wrapper,
-    reply_to_bluesky_wrapper,
-    fetch_bluesky_following_wrapper
-)
+import importlib
 
-from .helpers import (
-    extract_json_content,
-    extract_reply_text_from_raw,
-    trim_text
-)
+# Submodules are imported when one of their names is first looked up (PEP 562), so
+# `import utils.json_extract` or `from utils import trim_text` does not pull in
+# atproto through utils.bluesky. Maps each exported name to its submodule.
+_EXPORTS = {
+    'bluesky_login': 'bluesky',
+    'get_bluesky_client': 'bluesky',
+    'get_post_ref': 'bluesky',
+    'post_to_message': 'bluesky',
+    'post_to_bluesky': 'bluesky',
+    'like_bluesky': 'bluesky',
+    'reply_to_bluesky': 'bluesky',
+    'fetch_bluesky_following': 'bluesky',
+    'iter_bluesky_timeline': 'bluesky',
+    'iter_author_feed': 'bluesky',
+    'post_to_bluesky_wrapper': 'bluesky',
+    'like_bluesky_wrapper': 'bluesky',
+    'reply_to_bluesky_wrapper': 'bluesky',
+    'fetch_bluesky_following_wrapper': 'bluesky',
+    'AsyncBlueskySessionManager': 'async_bluesky',
+    'get_async_session_manager': 'async_bluesky',
+    'get_async_bluesky_client': 'async_bluesky',
+    'async_post_to_bluesky': 'async_bluesky',
+    'async_like_bluesky': 'async_bluesky',
+    'async_reply_to_bluesky': 'async_bluesky',
+    'async_fetch_bluesky_following': 'async_bluesky',
+    'async_fetch_author_feed': 'async_bluesky',
+    'async_fetch_author_feeds': 'async_bluesky',
+    'async_post_to_bluesky_wrapper': 'async_bluesky',
+    'async_like_bluesky_wrapper': 'async_bluesky',
+    'async_reply_to_bluesky_wrapper': 'async_bluesky',
+    'async_fetch_bluesky_following_wrapper': 'async_bluesky',
+    'async_fetch_author_feed_wrapper': 'async_bluesky',
+    'BlueskySessionManager': 'session',
+    'get_session_manager': 'session',
+    'PostRefCache': 'post_cache',
+    'get_post_cache': 'post_cache',
+    'BatchPostResolver': 'resolver',
+    'get_post_resolver': 'resolver',
+    'PostStore': 'store',
+    'get_post_store': 'store',
+    'sync_feed': 'store',
+    'sync_feed_views': 'store',
+    'advance_sync_state': 'store',
+    'sync_timeline': 'store',
+    'HandleResolver': 'handles',
+    'get_handle_resolver': 'handles',
+    'fetch_author_feeds': 'fanout',
+    'advance_author_cursors': 'fanout',
+    'PostSearch': 'search',
+    'get_post_search': 'search',
+    'search_bluesky_posts': 'search',
+    'PostIndex': 'index',
+    'get_post_index': 'index',
+    'search_local_posts': 'index',
+    'LLMResponseCache': 'llm_cache',
+    'get_llm_cache': 'llm_cache',
+    'cached_generate_reply': 'llm_cache',
+    'forget_cached_reply': 'llm_cache',
+    'BatchCategorizer': 'categorizer',
+    'get_categorizer': 'categorizer',
+    'LeaningClassifier': 'leaning',
+    'get_leaning_classifier': 'leaning',
+    'train_leaning_classifier': 'leaning',
+    'classify_leaning': 'leaning',
+    'leaning_stats': 'leaning',
+    'PrefetchedReply': 'prefetch',
+    'prefetch_reply': 'prefetch',
+    'prefetch_stats': 'prefetch',
+    'parse_candidates': 'candidates',
+    'score_candidate': 'candidates',
+    'rank_candidates': 'candidates',
+    'JsonStringFieldParser': 'streaming',
+    'stream_agent_reply': 'streaming',
+    'streaming_stats': 'streaming',
+    'ReplyValidator': 'validator',
+    'ValidationResult': 'validator',
+    'count_graphemes': 'validator',
+    'get_reply_validator': 'validator',
+    'find_json_text': 'json_extract',
+    'extract_json': 'json_extract',
+    'ReplyResult': 'json_extract',
+    'LeaningResult': 'json_extract',
+    'ReviewResult': 'json_extract',
+    'ReplyPostingWorker': 'posting_worker',
+    'get_posting_worker': 'posting_worker',
+    'extract_json_content': 'helpers',
+    'get_reply_content': 'helpers',
+    'extract_reply_text_from_raw': 'helpers',
+    'trim_text': 'helpers'
+}
 
 # Define what's available when using `from atproto_app.utils import *`
 __all__ = [
     # Bluesky functions
     'bluesky_login',
+    'get_bluesky_client',
+    'get_post_ref',
+    'post_to_message',
     'post_to_bluesky',
     'like_bluesky',
     'reply_to_bluesky',
     'fetch_bluesky_following',
+    'iter_bluesky_timeline',
+    'iter_author_feed',
     'post_to_bluesky_wrapper',
     'like_bluesky_wrapper',
     'reply_to_bluesky_wrapper',
     'fetch_bluesky_following_wrapper',
     
+    # Async Bluesky functions
+    'AsyncBlueskySessionManager',
+    'get_async_session_manager',
+    'get_async_bluesky_client',
+    'async_post_to_bluesky',
+    'async_like_bluesky',
+    'async_reply_to_bluesky',
+    'async_fetch_bluesky_following',
+    'async_fetch_author_feed',
+    'async_fetch_author_feeds',
+    'async_post_to_bluesky_wrapper',
+    'async_like_bluesky_wrapper',
+    'async_reply_to_bluesky_wrapper',
+    'async_fetch_bluesky_following_wrapper',
+    'async_fetch_author_feed_wrapper',
+    
+    # Session management
+    'BlueskySessionManager',
+    'get_session_manager',
+    
+    # Post reference cache
+    'PostRefCache',
+    'get_post_cache',
+    
+    # Batched post lookups
+    'BatchPostResolver',
+    'get_post_resolver',
+    
+    # Local post store
+    'PostStore',
+    'get_post_store',
+    'sync_feed',
+    'sync_feed_views',
+    'advance_sync_state',
+    'sync_timeline',
+    
+    # Handle -> DID resolution cache
+    'HandleResolver',
+    'get_handle_resolver',
+    
+    # Multi-author fan-out
+    'fetch_author_feeds',
+    'advance_author_cursors',
+    
+    # Server-side post search
+    'PostSearch',
+    'get_post_search',
+    'search_bluesky_posts',
+    
+    # Local inverted index
+    'PostIndex',
+    'get_post_index',
+    'search_local_posts',
+    
+    # LLM response cache
+    'LLMResponseCache',
+    'get_llm_cache',
+    'cached_generate_reply',
+    'forget_cached_reply',
+    
+    # Chunked batch categorisation
+    'BatchCategorizer',
+    'get_categorizer',
+    
+    # Local political-leaning classifier
+    'LeaningClassifier',
+    'get_leaning_classifier',
+    'train_leaning_classifier',
+    'classify_leaning',
+    'leaning_stats',
+    
+    # Background reply prefetching
+    'PrefetchedReply',
+    'prefetch_reply',
+    'prefetch_stats',
+    
+    # Multi-candidate replies
+    'parse_candidates',
+    'score_candidate',
+    'rank_candidates',
+    
+    # Streaming replies
+    'JsonStringFieldParser',
+    'stream_agent_reply',
+    'streaming_stats',
+    
+    # Local reply validation
+    'ReplyValidator',
+    'ValidationResult',
+    'count_graphemes',
+    'get_reply_validator',
+    
+    # JSON extraction from LLM output
+    'find_json_text',
+    'extract_json',
+    'ReplyResult',
+    'LeaningResult',
+    'ReviewResult',
+    
+    # Background posting of approved replies
+    'ReplyPostingWorker',
+    'get_posting_worker',
+    
     # Helper functions
     'extract_json_content',
+    'get_reply_content',
     'extract_reply_text_from_raw',
     'trim_text'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    """Import the submodule that defines `name` on first access."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
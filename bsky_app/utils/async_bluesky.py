@@ -0,0 +1,233 @@
+"""
+Asyncio versions of the Bluesky helpers in utils.bluesky.
+
+All calls go through one shared atproto AsyncClient, so independent
+requests can be awaited concurrently, e.g.:
+
+    results = await asyncio.gather(
+        async_like_bluesky_wrapper(uri),
+        async_reply_to_bluesky_wrapper(uri, "Well said."),
+    )
+
+Results have the same shape as the synchronous functions: dicts from the
+plain functions and JSON strings from the *_wrapper functions.
+"""
+import json
+import asyncio
+import weakref
+import threading
+import mimetypes
+import atproto
+from .session import BlueskySessionManager
+from .post_cache import get_post_cache
+from .resolver import get_post_resolver
+from .bluesky import post_to_message
+
+
+class AsyncBlueskySessionManager(BlueskySessionManager):
+    """
+    Session manager handing out shared AsyncClients, persisted to the same session file.
+
+    An AsyncClient and the lock guarding its creation belong to the event loop
+    they were made on, so one is kept per running loop (and dropped with it);
+    each loop restores the saved session on first use.
+    """
+
+    def __init__(self, username=None, password=None, session_file=None):
+        super().__init__(username, password, session_file)
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._async_locks = weakref.WeakKeyDictionary()
+
+    async def get_async_client(self):
+        """Return the running loop's shared AsyncClient, logging in or restoring the session on first use."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is not None:
+            return client
+        with self._lock:
+            async_lock = self._async_locks.get(loop)
+            if async_lock is None:
+                async_lock = self._async_locks[loop] = asyncio.Lock()
+        async with async_lock:
+            if loop not in self._async_clients:
+                self._async_clients[loop] = await self._connect_async()
+            return self._async_clients[loop]
+
+    def reset(self):
+        """Drop the shared clients so the next get_client() / get_async_client() logs in again."""
+        super().reset()
+        with self._lock:
+            self._async_clients.clear()
+
+    async def _connect_async(self):
+        """Build an AsyncClient from the saved session, or from a fresh password login."""
+        session_string = self._load_session()
+        if session_string:
+            client = atproto.AsyncClient()
+            client.on_session_change(self._on_session_change)
+            try:
+                await client.login(session_string=session_string)
+                self.restores += 1
+                return client
+            except Exception as e:
+                print(f"Saved Bluesky session could not be restored ({e}); logging in again.")
+        client = atproto.AsyncClient()
+        client.on_session_change(self._on_session_change)
+        await client.login(self.username, self.password)
+        self.logins += 1
+        return client
+
+
+_async_session_manager = None
+_async_session_manager_lock = threading.Lock()
+
+
+def get_async_session_manager():
+    """Return the process-wide async session manager, created on first use."""
+    global _async_session_manager
+    if _async_session_manager is None:
+        with _async_session_manager_lock:
+            if _async_session_manager is None:
+                _async_session_manager = AsyncBlueskySessionManager()
+    return _async_session_manager
+
+
+async def get_async_bluesky_client():
+    """Return the shared, session-persisted AsyncClient"""
+    return await get_async_session_manager().get_async_client()
+
+
+async def async_get_post_ref(post_uri):
+    """Return the cached CID/root/parent refs for a post, resolving them in a batched getPosts on a miss"""
+    cache = get_post_cache()
+    post_ref = cache.get(post_uri)
+    if post_ref:
+        return post_ref
+    # Shares the batching resolver with the synchronous helpers, so concurrent
+    # async likes and replies are coalesced into one getPosts request
+    post = await get_post_resolver().resolve_async(post_uri)
+    if post is None:
+        return None
+    return cache.remember(post)
+
+
+async def async_post_to_bluesky(message, image_path=None):
+    """Post content to Bluesky, optionally with an image."""
+    try:
+        client = await get_async_bluesky_client()
+        if image_path:
+            mime_type = mimetypes.guess_type(image_path)[0]
+            if not mime_type:
+                mime_type = "image/jpeg"
+            with open(image_path, "rb") as f:
+                image_binary = f.read()
+            upload_response = await client.com.atproto.repo.upload_blob(
+                image_binary, headers={"Content-Type": mime_type}
+            )
+            await client.send_post(
+                text=message,
+                embed={
+                    '$type': 'app.bsky.embed.images',
+                    'images': [{
+                        'alt': 'Image shared by AI agent',
+                        'image': upload_response.blob
+                    }]
+                }
+            )
+            return {"status": "success", "message": "Posted with image successfully"}
+        else:
+            await client.send_post(text=message)
+            return {"status": "success", "message": "Posted successfully"}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+async def async_like_bluesky(post_uri):
+    """Like a post on Bluesky identified by its URI."""
+    try:
+        if len(post_uri.split('/')) < 5:
+            return {"status": "error", "message": "Invalid post URI format"}
+        client = await get_async_bluesky_client()
+        post_ref = await async_get_post_ref(post_uri)
+        if not post_ref:
+            return {"status": "error", "message": "Post not found."}
+        await client.like(uri=post_uri, cid=post_ref["cid"])
+        return {"status": "success", "message": "Post liked successfully"}
+    except Exception as e:
+        return {"status": "error", "message": f"Error: {str(e)}"}
+
+
+async def async_reply_to_bluesky(original_uri, reply_content):
+    """Post a reply to a given message on Bluesky identified by its URI."""
+    try:
+        if len(original_uri.split('/')) < 5:
+            return {"status": "error", "message": "Invalid original URI format"}
+        client = await get_async_bluesky_client()
+        post_ref = await async_get_post_ref(original_uri)
+        if not post_ref:
+            return {"status": "error", "message": "Original post not found."}
+        parent = {"uri": original_uri, "cid": post_ref["cid"]}
+        await client.send_post(
+            text=reply_content,
+            reply_to={
+                "root": post_ref["root"] or parent,
+                "parent": parent
+            }
+        )
+        return {"status": "success", "message": "Reply posted successfully"}
+    except Exception as e:
+        return {"status": "error", "message": f"Error: {str(e)}"}
+
+
+async def async_fetch_bluesky_following(limit=20):
+    """Fetch the latest posts from accounts the user is following on Bluesky."""
+    try:
+        client = await get_async_bluesky_client()
+        timeline = await client.get_timeline(limit=limit)
+        posts = [post_to_message(feed_view.post, idx) for idx, feed_view in enumerate(timeline.feed, start=1)]
+        return {"status": "success", "posts": posts}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+async def async_fetch_author_feed(actor, limit=20):
+    """Fetch the latest posts of one author (handle or DID)."""
+    try:
+        client = await get_async_bluesky_client()
+        feed = await client.get_author_feed(actor=actor, limit=limit)
+        posts = [post_to_message(feed_view.post, idx) for idx, feed_view in enumerate(feed.feed, start=1)]
+        return {"status": "success", "posts": posts}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+async def async_fetch_author_feeds(actors, limit=20):
+    """Fetch several author feeds concurrently; returns {actor: result dict}."""
+    results = await asyncio.gather(*(async_fetch_author_feed(actor, limit) for actor in actors))
+    return dict(zip(actors, results))
+
+
+# Wrapper functions that return JSON strings
+async def async_post_to_bluesky_wrapper(message, image_path=None):
+    """Wrapper for async_post_to_bluesky that returns JSON string instead of dict"""
+    return json.dumps(await async_post_to_bluesky(message, image_path))
+
+
+async def async_like_bluesky_wrapper(post_uri):
+    """Wrapper for async_like_bluesky that returns JSON string instead of dict"""
+    return json.dumps(await async_like_bluesky(post_uri=post_uri))
+
+
+async def async_reply_to_bluesky_wrapper(original_uri, reply_content):
+    """Wrapper for async_reply_to_bluesky that returns JSON string instead of dict"""
+    return json.dumps(await async_reply_to_bluesky(original_uri=original_uri, reply_content=reply_content))
+
+
+async def async_fetch_bluesky_following_wrapper(limit=20):
+    """Wrapper for async_fetch_bluesky_following that returns JSON string"""
+    return json.dumps(await async_fetch_bluesky_following(limit))
+
+
+async def async_fetch_author_feed_wrapper(actor, limit=20):
+    """Wrapper for async_fetch_author_feed that returns JSON string"""
+    return json.dumps(await async_fetch_author_feed(actor, limit))
@@ -1,19 +1,50 @@
 import os
 import json
 import mimetypes
+from datetime import datetime, timezone
 import atproto
-from config import BLUESKY_USERNAME, BLUESKY_PASSWORD  # Changed from ..config to config
+from config import get_setting
+from .session import get_session_manager
+from .post_cache import get_post_cache
+from .resolver import get_post_resolver
 
 # Rest of your file remains unchanged
 def bluesky_login(username=None, password=None):
-    """Login to Bluesky"""
+    """Login to Bluesky with a fresh client (one createSession call per use)"""
     client = atproto.Client()
-    client.login(username or BLUESKY_USERNAME, password or BLUESKY_PASSWORD)
+    client.login(username or get_setting("BLUESKY_USERNAME"), password or get_setting("BLUESKY_PASSWORD"))
     return client
+
+def get_bluesky_client():
+    """Return the shared, session-persisted Bluesky client"""
+    return get_session_manager().get_client()
+
+def post_to_message(post, number):
+    """Convert an atproto PostView into the message dict used by the workflows, caching its refs"""
+    get_post_cache().remember(post)
+    return {
+        "number": number,
+        "did": post.uri,
+        "author": post.author.display_name or post.author.handle,
+        "text": post.record.text,
+        "timestamp": post.indexed_at
+    }
+
+def get_post_ref(post_uri):
+    """Return the cached CID/root/parent refs for a post, resolving them in a batched getPosts on a miss"""
+    cache = get_post_cache()
+    post_ref = cache.get(post_uri)
+    if post_ref:
+        return post_ref
+    post = get_post_resolver().resolve(post_uri)
+    if post is None:
+        return None
+    return cache.remember(post)
+
 def post_to_bluesky(message, image_path=None):
     """Post content to Bluesky, optionally with an image."""
     try:
-        client = bluesky_login()
+        client = get_bluesky_client()
         if image_path:
             mime_type = mimetypes.guess_type(image_path)[0]
             if not mime_type:
@@ -42,15 +73,14 @@ def post_to_bluesky(message, image_path=None):
 def like_bluesky(post_uri):
     """Like a post on Bluesky identified by its URI."""
     try:
-        client = bluesky_login()
+        client = get_bluesky_client()
         parts = post_uri.split('/')
         if len(parts) < 5:
             return {"status": "error", "message": "Invalid post URI format"}
-        response = client.app.bsky.feed.get_posts({"uris": [post_uri]})
-        if not response.posts:
+        post_ref = get_post_ref(post_uri)
+        if not post_ref:
             return {"status": "error", "message": "Post not found."}
-        post = response.posts[0]
-        client.like(uri=post_uri, cid=post.cid)
+        client.like(uri=post_uri, cid=post_ref["cid"])
         return {"status": "success", "message": "Post liked successfully"}
     except Exception as e:
         return {"status": "error", "message": f"Error: {str(e)}"}
@@ -58,42 +88,99 @@ def like_bluesky(post_uri):
 def reply_to_bluesky(original_uri, reply_content):
     """Post a reply to a given message on Bluesky identified by its URI."""
     try:
-        client = bluesky_login()
+        client = get_bluesky_client()
         parts = original_uri.split('/')
         if len(parts) < 5:
             return {"status": "error", "message": "Invalid original URI format"}
         did = parts[2]
         rkey = parts[-1]
-        response = client.app.bsky.feed.get_posts({"uris": [original_uri]})
-        if not response.posts:
+        post_ref = get_post_ref(original_uri)
+        if not post_ref:
             return {"status": "error", "message": "Original post not found."}
-        original_post = response.posts[0]
+        parent = {"uri": original_uri, "cid": post_ref["cid"]}
         client.send_post(
             text=reply_content,
             reply_to={
-                "root": {"uri": original_uri, "cid": original_post.cid},
-                "parent": {"uri": original_uri, "cid": original_post.cid}
+                "root": post_ref["root"] or parent,
+                "parent": parent
             }
         )
         return {"status": "success", "message": "Reply posted successfully"}
     except Exception as e:
         return {"status": "error", "message": f"Error: {str(e)}"}
 
+def parse_timestamp(value):
+    """Parse an ATProto ISO-8601 timestamp (or pass through a datetime) as an aware datetime"""
+    if value is None or isinstance(value, datetime):
+        parsed = value
+    else:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed is not None and parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+def feed_item_time(feed_view):
+    """Time an item entered the feed: the repost time for reposts, otherwise the post's index time"""
+    reason = getattr(feed_view, "reason", None)
+    return getattr(reason, "indexed_at", None) or feed_view.post.indexed_at
+
+def iter_feed_views(fetch_page, max_posts=None, since=None, stop_at_uri=None, page_size=50):
+    """
+    Follow a feed's cursor page by page, yielding raw feed view items lazily.
+
+    `fetch_page(cursor=..., limit=...)` returns one page of the feed. Iteration
+    stops after `max_posts` items, at the first item older than `since`, or
+    when the post with URI `stop_at_uri` (the last one seen previously) comes up.
+    """
+    since = parse_timestamp(since)
+    cursor = None
+    count = 0
+    while True:
+        limit = page_size if max_posts is None else min(page_size, max_posts - count)
+        if limit <= 0:
+            return
+        page = fetch_page(cursor=cursor, limit=limit)
+        for feed_view in page.feed:
+            if stop_at_uri and feed_view.post.uri == stop_at_uri:
+                return
+            if since and parse_timestamp(feed_item_time(feed_view)) < since:
+                return
+            count += 1
+            yield feed_view
+            if max_posts is not None and count >= max_posts:
+                return
+        cursor = page.cursor
+        if not cursor or not page.feed:
+            return
+
+def _iter_feed(fetch_page, **kwargs):
+    """Wrap iter_feed_views, numbering each post as a workflow message dict."""
+    for idx, feed_view in enumerate(iter_feed_views(fetch_page, **kwargs), start=1):
+        yield post_to_message(feed_view.post, idx)
+
+def fetch_timeline_page(cursor=None, limit=50):
+    """Fetch one page of the home timeline with the shared client."""
+    return get_bluesky_client().get_timeline(cursor=cursor, limit=limit)
+
+def iter_bluesky_timeline(max_posts=None, since=None, stop_at_uri=None, page_size=50):
+    """Iterate over the home timeline across pages, newest first."""
+    return _iter_feed(
+        fetch_timeline_page,
+        max_posts=max_posts, since=since, stop_at_uri=stop_at_uri, page_size=page_size
+    )
+
+def iter_author_feed(actor, max_posts=None, since=None, stop_at_uri=None, page_size=50):
+    """Iterate over an author's feed (handle or DID) across pages, newest first."""
+    client = get_bluesky_client()
+    return _iter_feed(
+        lambda cursor, limit: client.get_author_feed(actor=actor, cursor=cursor, limit=limit),
+        max_posts=max_posts, since=since, stop_at_uri=stop_at_uri, page_size=page_size
+    )
+
 def fetch_bluesky_following(limit=20):
     """Fetch the latest posts from accounts the user is following on Bluesky."""
     try:
-        client = bluesky_login()
-        timeline = client.get_timeline(limit=limit)
-        posts = []
-        for idx, feed_view in enumerate(timeline.feed, start=1):
-            post = feed_view.post
-            posts.append({
-                "number": idx,
-                "did": post.uri,
-                "author": post.author.display_name or post.author.handle,
-                "text": post.record.text,
-                "timestamp": post.indexed_at
-            })
+        posts = list(iter_bluesky_timeline(max_posts=limit))
         return {"status": "success", "posts": posts}
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -0,0 +1,53 @@
+from .json_extract import extract_json
+from .validator import get_reply_validator
+
+
+def parse_candidates(content):
+    """
+    Parse a multi-candidate reply into a list of reply strings.
+
+    Accepts {"candidates": [...]}, a bare JSON array, and items that are
+    either strings or objects with a 'formatted_message' or 'text' field.
+    Returns [] if the content holds no candidate list.
+    """
+    result = extract_json(content, partial=True)
+    if isinstance(result, dict):
+        result = result.get("candidates", [])
+    if not isinstance(result, list):
+        return []
+    candidates = []
+    for item in result:
+        if isinstance(item, dict):
+            item = item.get("formatted_message") or item.get("text")
+        if isinstance(item, str) and item.strip():
+            candidates.append(item.strip())
+    return candidates
+
+
+def score_candidate(text, max_length=180):
+    """
+    Check a reply locally and score it; returns (score, problems).
+
+    The score starts at how close the reply comes to max_length characters
+    (the responders are asked for exactly that) and loses half a point per
+    problem the reply validator finds.
+    """
+    problems = [description for _, description in get_reply_validator().check(text)]
+    length = len(text)
+    score = 1.0 - min(abs(max_length - length), max_length) / max_length
+    return score - 0.5 * len(problems), problems
+
+
+def rank_candidates(candidates, max_length=180):
+    """Drop duplicates, score each candidate and return them best first as dicts with text, score and problems."""
+    ranked = []
+    seen = set()
+    for text in candidates:
+        key = " ".join(text.casefold().split())
+        if key in seen:
+            continue
+        seen.add(key)
+        score, problems = score_candidate(text, max_length)
+        ranked.append({"text": text, "score": score, "problems": problems})
+    ranked.sort(key=lambda candidate: candidate["score"], reverse=True)
+    return ranked
@@ -0,0 +1,154 @@
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .helpers import extract_json_content, get_reply_content
+from .llm_cache import cached_generate_reply, forget_cached_reply
+
+
+def estimate_tokens(text):
+    """Rough token count for prompt budgeting (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+def parse_analysis_list(content):
+    """Parse an analysis reply into a list of dicts; accepts a bare array or an object wrapping one."""
+    result = json.loads(extract_json_content(content))
+    if isinstance(result, list):
+        return [item for item in result if isinstance(item, dict)]
+    if isinstance(result, dict):
+        for value in result.values():
+            if isinstance(value, list):
+                return [item for item in value if isinstance(item, dict)]
+    raise ValueError("analysis reply contains no JSON array")
+
+
+class BatchCategorizer:
+    """
+    Categorise many messages by sending token-bounded chunks to an agent concurrently.
+
+    `build_prompt(chunk)` turns a list of message dicts into the prompt text;
+    the agent must answer with a JSON array whose items carry `id_field`
+    matching the message's "number". Chunks whose reply fails to parse (or
+    that leave messages unanswered) are retried on their own, up to
+    `max_retries` times, so one bad reply no longer discards the whole batch.
+    A retry halves the chunks and marks the prompt as a retry, so neither
+    response cache (ours or autogen's) can hand back the same bad reply.
+
+    The chunk size adapts between runs: it halves when replies fail to parse,
+    shrinks when chunks are slower than `target_latency` seconds, and grows
+    again while chunks are fast and clean.
+    """
+
+    def __init__(self, agent, build_prompt, id_field="number", chunk_size=10, min_chunk_size=2,
+                 max_chunk_size=40, max_chunk_tokens=2000, max_concurrency=4, max_retries=2,
+                 target_latency=10.0):
+        self.agent = agent
+        self.build_prompt = build_prompt
+        self.id_field = id_field
+        self.chunk_size = chunk_size
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.max_chunk_tokens = max_chunk_tokens
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.target_latency = target_latency
+        self._lock = threading.Lock()
+        self.chunks_sent = 0
+        self.parse_failures = 0
+
+    def _chunks(self, messages, chunk_size=None):
+        """Split messages into chunks bounded by chunk_size (default self.chunk_size) and max_chunk_tokens."""
+        chunk_size = chunk_size or self.chunk_size
+        chunks, chunk, tokens = [], [], 0
+        for msg in messages:
+            msg_tokens = estimate_tokens(msg.get("text", "")) + 20
+            if chunk and (len(chunk) >= chunk_size or tokens + msg_tokens > self.max_chunk_tokens):
+                chunks.append(chunk)
+                chunk, tokens = [], 0
+            chunk.append(msg)
+            tokens += msg_tokens
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    def _run_chunk(self, chunk, attempt=0):
+        """Send one chunk (`attempt` > 0 for a retry); returns (results by number, latency, parsed_ok)."""
+        start = time.monotonic()
+        prompt = self.build_prompt(chunk)
+        if attempt:
+            prompt += (f"\n\n(Retry {attempt}: the previous answer could not be used. "
+                       "Reply with the JSON array only, with one item per message.)")
+        request = [{"role": "user", "content": prompt}]
+        try:
+            reply = cached_generate_reply(self.agent, request)
+            items = parse_analysis_list(get_reply_content(reply))
+        except Exception:
+            # Do not let a malformed reply be served from the cache on retry
+            forget_cached_reply(self.agent, request)
+            return {}, time.monotonic() - start, False
+        wanted = {msg.get("number") for msg in chunk}
+        results = {}
+        for item in items:
+            number = item.get(self.id_field)
+            if isinstance(number, str) and number.isdigit():
+                number = int(number)
+            if number in wanted:
+                results[number] = item
+        if len(results) < len(wanted):
+            # An incomplete reply is not reused either, here or on a later run
+            forget_cached_reply(self.agent, request)
+        return results, time.monotonic() - start, True
+
+    def _tune(self, latencies, failures, total):
+        """Adjust chunk_size from this round's latencies and parse-failure rate."""
+        with self._lock:
+            self.chunks_sent += total
+            self.parse_failures += failures
+            if failures and failures / total > 0.2:
+                self.chunk_size = max(self.min_chunk_size, self.chunk_size // 2)
+            elif latencies and max(latencies) > self.target_latency:
+                self.chunk_size = max(self.min_chunk_size, int(self.chunk_size * 0.75))
+            elif not failures and latencies and max(latencies) < self.target_latency / 2:
+                self.chunk_size = min(self.max_chunk_size, int(self.chunk_size * 1.5) + 1)
+
+    def categorize(self, messages):
+        """Return {message number: analysis dict} for every message the agent answered."""
+        results = {}
+        pending = list(messages)
+        for attempt in range(self.max_retries + 1):
+            if not pending:
+                break
+            chunks = self._chunks(pending, max(1, self.chunk_size >> attempt))
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+                outcomes = list(pool.map(self._run_chunk, chunks, [attempt] * len(chunks)))
+            latencies = [latency for _, latency, ok in outcomes if ok]
+            failures = sum(1 for _, _, ok in outcomes if not ok)
+            self._tune(latencies, failures, len(chunks))
+            for chunk_results, _, _ in outcomes:
+                results.update(chunk_results)
+            pending = [msg for msg in pending if msg.get("number") not in results]
+        return results
+
+    def stats(self):
+        with self._lock:
+            return {"chunk_size": self.chunk_size, "chunks_sent": self.chunks_sent,
+                    "parse_failures": self.parse_failures}
+
+
+_categorizers = {}
+_categorizers_lock = threading.Lock()
+
+
+def get_categorizer(name, agent, build_prompt, **kwargs):
+    """
+    Return the categorizer registered under `name`, creating it on first use.
+
+    Keeping one instance per task lets the tuned chunk size carry over between runs.
+    """
+    with _categorizers_lock:
+        categorizer = _categorizers.get(name)
+        if categorizer is None:
+            categorizer = _categorizers[name] = BatchCategorizer(agent, build_prompt, **kwargs)
+        categorizer.agent = agent
+        return categorizer
@@ -0,0 +1,95 @@
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from .bluesky import get_bluesky_client, post_to_message, feed_item_time, parse_timestamp
+from .handles import get_handle_resolver
+from .store import get_post_store, sync_feed_views, advance_sync_state
+
+
+def author_feed_key(did):
+    """Sync-state key under which an author's high-water mark is stored."""
+    return f"author:{did}"
+
+
+def _fetch_one_author(handle, store, max_posts_per_author, incremental, advance):
+    """Resolve one handle and fetch its feed items (only new ones when incremental)."""
+    actor = get_handle_resolver().resolve(handle)
+    if not actor:
+        return handle, None, []
+    did = actor["did"]
+    client = get_bluesky_client()
+
+    def fetch_page(cursor=None, limit=50):
+        return client.get_author_feed(actor=did, cursor=cursor, limit=limit)
+
+    if incremental:
+        feed_views = sync_feed_views(store, author_feed_key(did), fetch_page,
+                                     max_posts=max_posts_per_author, page_size=min(max_posts_per_author, 50),
+                                     advance=advance)
+    else:
+        feed_views = fetch_page(limit=min(max_posts_per_author, 100)).feed
+        store.save_feed_views(feed_views, source=author_feed_key(did))
+    return handle, actor, feed_views
+
+
+def fetch_author_feeds(handles, max_workers=8, max_posts_per_author=20, incremental=True, advance=True,
+                       store=None):
+    """
+    Resolve many handles and fetch their author feeds concurrently.
+
+    Work is spread over a bounded thread pool sharing the session client. With
+    `incremental`, each author's newest seen post is stored as a per-author
+    cursor, so later runs only fetch posts published since. Returns a dict with
+    the merged, newest-first message list plus the handles that failed.
+
+    With `advance=False` the cursors are not moved; the result's "pending"
+    maps each author's cursor key to the new feed items, to be passed to
+    advance_author_cursors() once it is known which posts were shown.
+    """
+    store = store or get_post_store()
+    handles = list(dict.fromkeys(h.strip().lstrip("@") for h in handles if h.strip()))
+    per_author = []
+    pending = {}
+    not_found = []
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(_fetch_one_author, handle, store, max_posts_per_author, incremental, advance): handle
+            for handle in handles
+        }
+        for future, handle in futures.items():
+            try:
+                _, actor, feed_views = future.result()
+            except Exception as e:
+                errors[handle] = str(e)
+                continue
+            if actor is None:
+                not_found.append(handle)
+            elif feed_views:
+                per_author.append(feed_views)
+                if incremental and not advance:
+                    pending[author_feed_key(actor["did"])] = feed_views
+
+    # Write the handles resolved by this batch once, rather than after each lookup
+    get_handle_resolver().save()
+
+    # Each author feed is already newest first, so a k-way merge keeps the stream ordered
+    merged = heapq.merge(*per_author, key=lambda fv: parse_timestamp(feed_item_time(fv)), reverse=True)
+    messages = [post_to_message(feed_view.post, idx) for idx, feed_view in enumerate(merged, start=1)]
+    return {"status": "success", "posts": messages, "not_found": not_found, "errors": errors, "pending": pending}
+
+
+def advance_author_cursors(pending, shown_uris, store=None):
+    """
+    Move the cursors of authors whose new posts were all shown; returns how many moved.
+
+    A cursor only marks the newest post seen, so an author with any post left
+    unshown keeps the old cursor and the posts are fetched again next time.
+    """
+    store = store or get_post_store()
+    shown_uris = set(shown_uris)
+    advanced = 0
+    for feed, feed_views in pending.items():
+        if all(feed_view.post.uri in shown_uris for feed_view in feed_views):
+            advance_sync_state(store, feed, feed_views)
+            advanced += 1
+    return advanced
@@ -0,0 +1,166 @@
+import os
+import json
+import time
+import atexit
+import tempfile
+import threading
+from atproto.exceptions import BadRequestError
+from config import get_setting
+from .session import get_session_manager
+
+
+def _actor_summary(actor):
+    """Reduce an atproto profile/actor view to the fields the workflows use."""
+    return {
+        "did": actor.did,
+        "handle": actor.handle,
+        "display_name": getattr(actor, "display_name", None),
+        "description": getattr(actor, "description", None)
+    }
+
+
+class HandleResolver:
+    """
+    Cache of handle -> DID and profile summary lookups.
+
+    Successful lookups are kept for `ttl` seconds; lookups that found no
+    account are cached as negative results for `negative_ttl` seconds so
+    repeated misses do not hit the network either. With a `cache_file` the
+    entries are loaded at start-up; new lookups mark the cache dirty and it is
+    written back at most every `save_interval` seconds, and by save().
+    """
+
+    def __init__(self, ttl=86400, negative_ttl=3600, cache_file=None, client_factory=None, save_interval=5.0):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.cache_file = cache_file
+        self.client_factory = client_factory or (lambda: get_session_manager().get_client())
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self.save_interval = save_interval
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _get(self, key):
+        """Return (found, summary) for a cache key, treating expired entries as missing."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            ttl = self.ttl if entry["summary"] else self.negative_ttl
+            if time.time() - entry["stored_at"] > ttl:
+                del self._entries[key]
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            return True, entry["summary"]
+
+    def _put(self, key, summary):
+        with self._lock:
+            self._entries[key] = {"summary": summary, "stored_at": time.time()}
+            self._dirty = True
+
+    def resolve(self, handle):
+        """Return the profile summary for an exact handle (or DID), or None if there is no such account."""
+        handle = handle.lstrip("@").lower()
+        found, summary = self._get(handle)
+        if found:
+            return summary
+        try:
+            summary = _actor_summary(self.client_factory().get_profile(handle))
+        except BadRequestError:
+            # getProfile answers 400 for unknown or malformed actors
+            summary = None
+        self._put(handle, summary)
+        if summary:
+            self._put(summary["handle"].lower(), summary)
+            self._put(summary["did"], summary)
+        self._maybe_save()
+        return summary
+
+    def find(self, term):
+        """
+        Return the first account whose handle contains `term`, using actor search on a miss.
+
+        Every actor returned by the search is cached under its own handle as well.
+        """
+        term = term.lstrip("@").lower()
+        key = f"search:{term}"
+        found, summary = self._get(key)
+        if found:
+            return summary
+        summary = None
+        search_results = self.client_factory().app.bsky.actor.search_actors({"term": term})
+        for actor in search_results.actors:
+            actor_summary = _actor_summary(actor)
+            self._put(actor.handle.lower(), actor_summary)
+            if summary is None and term in actor.handle.lower():
+                summary = actor_summary
+        self._put(key, summary)
+        self._maybe_save()
+        return summary
+
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _load(self):
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable handle cache {self.cache_file}: {e}")
+            self._entries = {}
+
+    def _maybe_save(self):
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+
+    def save(self):
+        """Write the cache file if entries changed since the last save."""
+        if not self.cache_file:
+            return
+        # One writer at a time, each through its own temp file, so saves never clash
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                data = json.dumps(self._entries)
+                self._dirty = False
+            self._last_save = time.monotonic()
+            tmp_path = None
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.cache_file)),
+                                                suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(data)
+                os.replace(tmp_path, self.cache_file)
+            except OSError as e:
+                print(f"Could not save handle cache: {e}")
+                with self._lock:
+                    self._dirty = True
+                if tmp_path and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+
+_handle_resolver = None
+_handle_resolver_lock = threading.Lock()
+
+
+def get_handle_resolver():
+    """Return the process-wide handle resolver, backed by HANDLE_CACHE_FILE if set."""
+    global _handle_resolver
+    if _handle_resolver is None:
+        with _handle_resolver_lock:
+            if _handle_resolver is None:
+                _handle_resolver = HandleResolver(cache_file=get_setting("HANDLE_CACHE_FILE"))
+                # Lookups since the last periodic save are written on exit
+                atexit.register(_handle_resolver.save)
+    return _handle_resolver
@@ -1,12 +1,24 @@
 import json
+from .json_extract import find_json_text
 
 def extract_json_content(content_str):
-    """Extract JSON content even if wrapped in code fences"""
+    """Extract the first JSON object or array, even if wrapped in code fences or prose"""
     if content_str is None:
         return ""
+    found = find_json_text(content_str)
+    if found is not None:
+        return found
     cleaned = content_str.replace("```json", "").replace("```", "").strip()
     return cleaned
 
+def get_reply_content(reply):
+    """Return the text content of an agent reply, whether it is a string, dict or message object"""
+    if isinstance(reply, str):
+        return reply
+    if isinstance(reply, dict):
+        return reply.get("content", "") or ""
+    return getattr(reply, "content", "") or ""
+
 def extract_reply_text_from_raw(raw_content):
     """
     Attempt to extract meaningful text from a raw string response.
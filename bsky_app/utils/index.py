@@ -0,0 +1,168 @@
+import re
+import heapq
+import bisect
+import itertools
+import threading
+from .store import get_post_store
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text):
+    """Split text into case-folded word tokens."""
+    return [token.casefold() for token in _TOKEN_RE.findall(text or "")]
+
+
+class PostIndex:
+    """
+    In-process inverted index over post text.
+
+    Posts are identified by URI and mapped to dense integer ids; each token
+    maps to the set of ids containing it, and a sorted vocabulary supports
+    prefix queries. Tokens new to the index are merged into the vocabulary
+    once per add() or update_from_store() batch rather than inserted one by
+    one. All query terms must match (AND); a term ending in '*'
+    (or every term, with prefix=True) matches any token starting with it.
+    Results come back newest first.
+    """
+
+    def __init__(self):
+        self._postings = {}
+        self._vocabulary = []
+        self._unmerged = set()
+        self._ids = {}
+        self._uris = []
+        self._times = []
+        self._tokens = []
+        self._last_version = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, uri, text, feed_time="", merge=True):
+        """Index (or re-index) a post's text; merge=False leaves new tokens to be merged with a later batch."""
+        with self._lock:
+            doc_id = self._ids.get(uri)
+            if doc_id is None:
+                doc_id = len(self._uris)
+                self._ids[uri] = doc_id
+                self._uris.append(uri)
+                self._times.append(feed_time or "")
+                self._tokens.append(())
+            else:
+                self._unindex(doc_id)
+                self._times[doc_id] = feed_time or self._times[doc_id]
+            tokens = tuple(set(tokenize(text)))
+            self._tokens[doc_id] = tokens
+            for token in tokens:
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = set()
+                    self._unmerged.add(token)
+                postings.add(doc_id)
+            if merge:
+                self._merge_vocabulary()
+
+    def _merge_vocabulary(self):
+        """Merge the tokens added since the last merge into the sorted vocabulary in one pass."""
+        if self._unmerged:
+            self._vocabulary = list(heapq.merge(self._vocabulary, sorted(self._unmerged)))
+            self._unmerged.clear()
+
+    def remove(self, uri):
+        """Drop a post from the index."""
+        with self._lock:
+            doc_id = self._ids.pop(uri, None)
+            if doc_id is not None:
+                self._unindex(doc_id)
+                self._uris[doc_id] = None
+
+    def _unindex(self, doc_id):
+        for token in self._tokens[doc_id]:
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.discard(doc_id)
+                if not postings:
+                    del self._postings[token]
+                    if token in self._unmerged:
+                        self._unmerged.discard(token)
+                    else:
+                        self._vocabulary.pop(bisect.bisect_left(self._vocabulary, token))
+        self._tokens[doc_id] = ()
+
+    def _match_term(self, term, prefix):
+        """Return the ids containing `term` (or a token starting with it when `prefix`)."""
+        if not prefix:
+            return self._postings.get(term, set())
+        start = bisect.bisect_left(self._vocabulary, term)
+        postings = []
+        for token in itertools.islice(self._vocabulary, start, None):
+            if not token.startswith(term):
+                break
+            postings.append(self._postings[token])
+        return set().union(*postings)
+
+    def search(self, query, limit=20, prefix=False):
+        """Return up to `limit` URIs of posts matching every term of `query`, newest first."""
+        terms = []
+        for raw in query.split():
+            is_prefix = prefix or raw.endswith("*")
+            terms.extend((token, is_prefix) for token in tokenize(raw))
+        if not terms:
+            return []
+        with self._lock:
+            self._merge_vocabulary()
+            matches = sorted((self._match_term(term, is_prefix) for term, is_prefix in terms), key=len)
+            result = set(matches[0])
+            for ids in matches[1:]:
+                result &= ids
+                if not result:
+                    return []
+            best = heapq.nlargest(limit, result, key=self._times.__getitem__)
+            return [self._uris[doc_id] for doc_id in best]
+
+    def update_from_store(self, store=None):
+        """
+        Index posts added to (or updated in) the store since the last call; returns how many.
+
+        Follows the posts' version rather than their rowid, because an upsert
+        of an already stored post (e.g. edited text) keeps its rowid, and
+        rather than a timestamp, which can repeat or step back with the clock.
+        """
+        store = store or get_post_store()
+        with self._lock:
+            rows = store.posts_changed_since(self._last_version)
+            for row in rows:
+                self.add(row["uri"], row["text"], row["feed_time"], merge=False)
+                self._last_version = max(self._last_version, row["version"])
+            self._merge_vocabulary()
+            return len(rows)
+
+
+_post_index = None
+_post_index_lock = threading.Lock()
+
+
+def get_post_index():
+    """Return the process-wide post index, loading the stored posts on first use."""
+    global _post_index
+    if _post_index is None:
+        with _post_index_lock:
+            if _post_index is None:
+                index = PostIndex()
+                index.update_from_store()
+                _post_index = index
+    return _post_index
+
+
+def search_local_posts(query, limit=20, prefix=True):
+    """Search stored post history for `query`, picking up newly stored posts first."""
+    try:
+        store = get_post_store()
+        index = get_post_index()
+        index.update_from_store(store)
+        posts = store.get_messages(index.search(query, limit=limit, prefix=prefix))
+        return {"status": "success", "posts": posts}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
@@ -0,0 +1,217 @@
+import re
+import json
+
+_OPENERS = {"{": "}", "[": "]"}
+_LITERALS = {"True": "true", "False": "false", "None": "null", "true": "true", "false": "false", "null": "null"}
+_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?")
+
+
+def _scan(text, start, partial):
+    """
+    Scan one JSON value starting at text[start] ('{' or '[') and return it as strict JSON text.
+
+    The scan is a single left-to-right pass that repairs common LLM mistakes as
+    it goes: single-quoted strings, raw newlines inside strings, trailing
+    commas, unquoted keys and Python literals (True/False/None). Returns
+    (json_text, end_index), or (None, index_to_resume_from) if the brackets do
+    not balance. With `partial`, a value cut off by the end of the text is
+    closed, e.g. a reply truncated at the token limit.
+    """
+    out = []
+    stack = []
+    quote = None
+    i = start
+    length = len(text)
+    while i < length:
+        char = text[i]
+        if quote:
+            if char == "\\" and i + 1 < length:
+                following = text[i + 1]
+                # \' is not a JSON escape; the quote itself is enough inside "..."
+                out.append("'" if following == "'" else char + following)
+                i += 2
+                continue
+            if char == quote:
+                out.append('"')
+                quote = None
+            elif char == '"':
+                out.append('\\"')
+            else:
+                out.append(_ESCAPES.get(char, char))
+            i += 1
+            continue
+        if char in "\"'":
+            quote = char
+            out.append('"')
+        elif char in _OPENERS:
+            stack.append(_OPENERS[char])
+            out.append(char)
+        elif char in "}]":
+            if not stack or stack.pop() != char:
+                return None, i + 1
+            while out and out[-1] in " \n\r\t,":
+                out.pop()  # Trailing comma before the closing bracket
+            out.append(char)
+            if not stack:
+                return "".join(out), i + 1
+        elif char == "-" or char.isdigit():
+            number = _NUMBER_RE.match(text, i)
+            if number:
+                # Consumed whole, so an exponent ("1e5") is not mistaken for prose
+                out.append(number.group())
+                i = number.end()
+                continue
+            out.append(char)
+        elif char.isalpha() or char == "_":
+            end = i
+            while end < length and (text[end].isalnum() or text[end] in "_-"):
+                end += 1
+            word = text[i:end]
+            rest = end
+            while rest < length and text[rest] in " \t":
+                rest += 1
+            if rest < length and text[rest] == ":":
+                out.append(json.dumps(word))  # Unquoted key
+            elif word in _LITERALS:
+                out.append(_LITERALS[word])
+            else:
+                return None, i  # Prose inside the brackets: not JSON
+            i = end
+            continue
+        else:
+            out.append(char)
+        i += 1
+    if partial and stack:
+        if quote:
+            out.append('"')
+        while out and out[-1] in " \n\r\t,:":
+            out.pop()
+        out.extend(reversed(stack))
+        return "".join(out), length
+    return None, length
+
+
+def find_json_text(text, partial=False):
+    """
+    Return the first balanced JSON object or array in `text` as strict JSON text, or None.
+
+    Code fences, leading and trailing prose are skipped; see _scan for the
+    mistakes that are repaired along the way. An empty or all-number array
+    (a "[1]" citation in the prose) is only returned if no other JSON value
+    follows it.
+    """
+    if not text:
+        return None
+    i = 0
+    length = len(text)
+    fallback = None
+    while i < length:
+        if text[i] not in _OPENERS:
+            i += 1
+            continue
+        candidate, end = _scan(text, i, partial)
+        if candidate is not None:
+            try:
+                value = json.loads(candidate)
+            except ValueError:
+                pass
+            else:
+                if not _is_citation(value):
+                    return candidate
+                fallback = fallback or candidate
+                i = end
+                continue
+        i = max(end, i + 1) if candidate is None else i + 1
+    return fallback
+
+
+def _is_citation(value):
+    """True for an array that is empty or holds only numbers, like a "[1]" reference."""
+    return isinstance(value, list) and all(
+        isinstance(item, (int, float)) and not isinstance(item, bool) for item in value
+    )
+
+
+def extract_json(text, default=None, partial=False):
+    """Parse the first JSON object or array in `text`; returns `default` if there is none."""
+    candidate = find_json_text(text, partial=partial)
+    return json.loads(candidate) if candidate is not None else default
+
+
+def _first_string(data, fields):
+    """Return the first non-empty string among `fields` of a dict (or a nested {'text': ...})."""
+    for field in fields:
+        value = data.get(field)
+        if isinstance(value, dict):
+            value = value.get("text")
+        if isinstance(value, str) and value.strip():
+            return value
+    return ""
+
+
+class ReplyResult:
+    """A reply text from a responder or from Krsna's rewrite / fair alternative."""
+
+    FIELDS = ["formatted_message", "final_reply", "reply", "response", "analyzed_reply", "message", "text", "content"]
+
+    def __init__(self, text, parsed):
+        self.text = text
+        self.parsed = parsed
+
+    @classmethod
+    def from_text(cls, content, ignore=()):
+        """
+        Read the reply from an agent answer.
+
+        Fields are tried in FIELDS order, skipping values listed in `ignore`
+        (e.g. bare category labels). If no JSON is found the raw text is used
+        and `parsed` is False.
+        """
+        data = extract_json(content, partial=True)
+        if isinstance(data, dict):
+            for field in cls.FIELDS:
+                text = _first_string(data, [field])
+                if text and text.strip().lower() not in ignore:
+                    return cls(text, True)
+        if isinstance(data, str) and data.strip():
+            return cls(data, True)
+        return cls((content or "").replace("```json", "").replace("```", "").strip(), False)
+
+
+class LeaningResult:
+    """Krsna's political_analysis answer: category and reasoning."""
+
+    def __init__(self, category, reasoning):
+        self.category = category
+        self.reasoning = reasoning
+
+    @classmethod
+    def from_text(cls, content):
+        """Return the parsed result, or None if the answer holds no JSON object."""
+        data = extract_json(content)
+        if not isinstance(data, dict):
+            return None
+        category = data.get("category") or data.get("leaning") or "middle"
+        return cls(str(category), data.get("reasoning", "No reasoning provided"))
+
+
+class ReviewResult:
+    """Krsna's validate_response answer: whether the reply is valid, its edit and feedback."""
+
+    def __init__(self, valid, edited_response, feedback):
+        self.valid = valid
+        self.edited_response = edited_response
+        self.feedback = feedback
+
+    @classmethod
+    def from_text(cls, content, original):
+        """Return the parsed result (the edit defaults to `original`), or None if there is no JSON object."""
+        data = extract_json(content)
+        if not isinstance(data, dict):
+            return None
+        valid = data.get("valid", False)
+        if isinstance(valid, str):
+            valid = valid.strip().lower() in ("true", "yes")
+        edited = _first_string(data, ["edited_response", "formatted_message"]) or original
+        return cls(bool(valid), edited, data.get("feedback", "No feedback provided"))
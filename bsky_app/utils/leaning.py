@@ -0,0 +1,165 @@
+import os
+import re
+import zlib
+import threading
+from config import get_setting
+
+try:
+    import numpy as np
+except ImportError:  # The classifier is an optional fast path; without NumPy every call goes to the LLM
+    np = None
+
+LEANINGS = ["far-left", "left", "middle", "right", "far-right"]
+_TOKEN_RE = re.compile(r"[#@]?\w+", re.UNICODE)
+
+
+def normalize_leaning(label):
+    """Map an LLM leaning label onto LEANINGS, or None if it is not one of them."""
+    if not isinstance(label, str):
+        return None
+    label = label.strip().lower().replace(" ", "-").replace("_", "-")
+    return label if label in LEANINGS else None
+
+
+def hashed_features(text, dim):
+    """Hash word unigrams and bigrams of `text` into feature indices in [0, dim)."""
+    tokens = [token.casefold() for token in _TOKEN_RE.findall(text or "")]
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    return sorted({zlib.crc32(gram.encode("utf-8")) % dim for gram in grams})
+
+
+class LeaningClassifier:
+    """
+    Hashed n-gram softmax (multinomial logistic regression) model of political leaning.
+
+    It is trained on the leanings Krsna has already assigned to stored posts
+    and scored with NumPy. predict() returns the most likely leaning and its
+    probability; callers fall back to the LLM when that confidence is low.
+    The probability is not calibrated: a post made only of n-grams never seen
+    in training is scored from the bias alone, which can still look confident,
+    so predict() declines posts with fewer than `min_known_features` n-grams
+    that carry trained weights.
+    """
+
+    def __init__(self, dim=2 ** 16):
+        self.dim = dim
+        self.weights = None
+        self.bias = None
+
+    @property
+    def trained(self):
+        return self.weights is not None
+
+    def _scores(self, features):
+        logits = self.weights[features].sum(axis=0) + self.bias
+        logits -= logits.max()
+        probs = np.exp(logits)
+        return probs / probs.sum()
+
+    def known_features(self, features):
+        """Count the hashed features that received weights in training."""
+        return int(np.count_nonzero(np.abs(self.weights[features]).sum(axis=1)))
+
+    def predict(self, text, min_known_features=1):
+        """
+        Return (leaning, confidence); (None, 0.0) if the model is untrained, NumPy is
+        missing, or fewer than `min_known_features` of the text's n-grams were seen in training.
+        """
+        if np is None or not self.trained:
+            return None, 0.0
+        features = hashed_features(text, self.dim)
+        if not features or self.known_features(features) < min_known_features:
+            return None, 0.0
+        probs = self._scores(features)
+        best = int(probs.argmax())
+        return LEANINGS[best], float(probs[best])
+
+    def fit(self, texts, labels, epochs=8, learning_rate=0.2, l2=1e-5, seed=0):
+        """Train with per-example SGD on (text, leaning) pairs; unknown labels are skipped."""
+        if np is None:
+            raise RuntimeError("NumPy is required to train the leaning classifier")
+        examples = []
+        for text, label in zip(texts, labels):
+            label = normalize_leaning(label)
+            features = hashed_features(text, self.dim)
+            if label and features:
+                examples.append((features, LEANINGS.index(label)))
+        if not examples:
+            raise ValueError("no labelled examples to train on")
+        self.weights = np.zeros((self.dim, len(LEANINGS)))
+        self.bias = np.zeros(len(LEANINGS))
+        rng = np.random.default_rng(seed)
+        for epoch in range(epochs):
+            rate = learning_rate / (1 + epoch)
+            for i in rng.permutation(len(examples)):
+                features, target = examples[i]
+                gradient = self._scores(features)
+                gradient[target] -= 1.0
+                self.weights[features] -= rate * (gradient + l2 * self.weights[features])
+                self.bias -= rate * gradient
+        return len(examples)
+
+    def save(self, path=None):
+        np.savez_compressed(path or get_setting("LEANING_MODEL_PATH"), weights=self.weights, bias=self.bias)
+
+    @classmethod
+    def load(cls, path=None):
+        """Load a saved model; returns an untrained classifier if there is none."""
+        path = path or get_setting("LEANING_MODEL_PATH")
+        classifier = cls()
+        if np is None or not os.path.exists(path):
+            return classifier
+        data = np.load(path)
+        classifier.weights = data["weights"]
+        classifier.bias = data["bias"]
+        classifier.dim = classifier.weights.shape[0]
+        return classifier
+
+
+def train_leaning_classifier(store, save=True):
+    """Train a classifier on every stored post with an LLM-assigned leaning."""
+    examples = store.labeled_leanings()
+    classifier = LeaningClassifier()
+    classifier.fit([text for text, _ in examples], [label for _, label in examples])
+    if save:
+        classifier.save()
+    return classifier
+
+
+_classifier = None
+_classifier_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {"local": 0, "llm": 0}
+
+
+def get_leaning_classifier():
+    """Return the process-wide classifier loaded from LEANING_MODEL_PATH."""
+    global _classifier
+    if _classifier is None:
+        with _classifier_lock:
+            if _classifier is None:
+                _classifier = LeaningClassifier.load()
+    return _classifier
+
+
+def classify_leaning(text, llm_fallback, threshold=0.8, min_known_features=3):
+    """
+    Classify `text` locally and only call `llm_fallback(text)` below `threshold` confidence
+    or when fewer than `min_known_features` of its n-grams were seen in training.
+
+    Returns (leaning, confidence, source) where source is "local" or "llm".
+    """
+    leaning, confidence = get_leaning_classifier().predict(text, min_known_features=min_known_features)
+    source = "local" if leaning and confidence >= threshold else "llm"
+    # Leanings are classified from the daemon's drafting threads concurrently
+    with _stats_lock:
+        _stats[source] += 1
+    if source == "local":
+        return leaning, confidence, "local"
+    return llm_fallback(text), confidence, "llm"
+
+
+def leaning_stats():
+    """Return how many classifications were answered locally versus by the LLM."""
+    with _stats_lock:
+        return dict(_stats)
@@ -0,0 +1,131 @@
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from config import get_setting
+
+
+def agent_model(agent):
+    """Return the model (deployment) name an autogen agent is configured with."""
+    llm_config = getattr(agent, "llm_config", None) or {}
+    config_list = llm_config.get("config_list") or [{}]
+    return config_list[0].get("model")
+
+
+def prompt_key(model, system_message, messages):
+    """Content address of a completion request: SHA-256 over model, system message and messages."""
+    payload = json.dumps([model, system_message, messages], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Disk-backed (SQLite) cache of agent replies keyed by a hash of the request.
+
+    Entries expire after `ttl` seconds; once more than `max_entries` are
+    stored, the least recently used ones are evicted.
+    """
+
+    def __init__(self, path=None, ttl=None, max_entries=None):
+        self.path = path or get_setting("LLM_CACHE_PATH")
+        self.ttl = get_setting("LLM_CACHE_TTL") if ttl is None else ttl
+        self.max_entries = get_setting("LLM_CACHE_MAX_ENTRIES") if max_entries is None else max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL, last_used_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_used_at)")
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return the cached reply for `key`, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or (self.ttl and now - row[1] > self.ttl):
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_used_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key, response):
+        """Store a reply and evict the least recently used entries beyond max_entries."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, last_used_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(response), now, now)
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                "ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def delete(self, key):
+        """Remove one entry, e.g. a reply that turned out to be unusable."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def stats(self):
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        total = self.hits + self.misses
+        return {"size": size, "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0}
+
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """Return the process-wide LLM response cache."""
+    global _llm_cache
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = LLMResponseCache()
+    return _llm_cache
+
+
+def cached_generate_reply(agent, messages, use_cache=True):
+    """
+    Call agent.generate_reply(messages=...) through the response cache.
+
+    Identical requests (same model, system message and messages) are answered
+    from the cache; empty replies are never cached. Pass use_cache=False for
+    prompts that must produce a fresh answer, e.g. asking for an alternative.
+    """
+    if not use_cache:
+        return agent.generate_reply(messages=messages)
+    cache = get_llm_cache()
+    key = prompt_key(agent_model(agent), getattr(agent, "system_message", None), messages)
+    reply = cache.get(key)
+    if reply is not None:
+        return reply
+    reply = agent.generate_reply(messages=messages)
+    if reply:
+        try:
+            cache.put(key, reply)
+        except (TypeError, ValueError):
+            pass  # Replies that are not JSON-serialisable are simply not cached
+    return reply
+
+
+def forget_cached_reply(agent, messages):
+    """Drop the cached reply for a request so the next call asks the agent again."""
+    get_llm_cache().delete(prompt_key(agent_model(agent), getattr(agent, "system_message", None), messages))
@@ -0,0 +1,76 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+class PostRefCache:
+    """
+    Bounded LRU cache of post references keyed by post URI.
+
+    Each entry holds the post's CID and, when the post is itself a reply,
+    the strong refs of its thread root and parent. Entries older than `ttl`
+    seconds are treated as missing, and the least recently used entry is
+    evicted once `max_size` is reached.
+    """
+
+    def __init__(self, max_size=2048, ttl=3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def put(self, uri, cid, root=None, parent=None):
+        """Record the CID (and optional root/parent refs) for a post URI and return the entry."""
+        if not uri or not cid:
+            return None
+        entry = {"uri": uri, "cid": cid, "root": root, "parent": parent, "stored_at": time.monotonic()}
+        with self._lock:
+            self._entries[uri] = entry
+            self._entries.move_to_end(uri)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return entry
+
+    def get(self, uri):
+        """Return the cached reference dict for a URI, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(uri)
+            if entry is None:
+                self.misses += 1
+                return None
+            if self.ttl and time.monotonic() - entry["stored_at"] > self.ttl:
+                del self._entries[uri]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(uri)
+            self.hits += 1
+            return entry
+
+    def remember(self, post):
+        """Record the references of an atproto PostView and return the entry."""
+        root = parent = None
+        reply = getattr(getattr(post, "record", None), "reply", None)
+        if reply is not None:
+            root = {"uri": reply.root.uri, "cid": reply.root.cid}
+            parent = {"uri": reply.parent.uri, "cid": reply.parent.cid}
+        return self.put(post.uri, post.cid, root=root, parent=parent)
+
+    def clear(self):
+        """Remove all cached references."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return hit/miss counters and the current size."""
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_post_cache = PostRefCache()
+
+
+def get_post_cache():
+    """Return the process-wide post reference cache."""
+    return _post_cache
@@ -0,0 +1,104 @@
+import time
+import threading
+from config import get_setting
+from .bluesky import reply_to_bluesky
+from .store import get_post_store
+
+
+class ReplyPostingWorker:
+    """
+    Background thread that posts approved replies from the reply queue.
+
+    Each approved entry is claimed (status "posting") before it is sent, so
+    two processes sharing the store never post the same reply twice; the
+    outcome is recorded as "posted" or "failed" with the error. The queue is
+    checked every `interval` seconds, or at once after wake(). `min_gap`
+    seconds are kept between posts to stay clear of Bluesky's rate limits.
+    Claims older than `lease` seconds, left by a worker that stopped
+    mid-post, are marked "failed" when the worker starts.
+    """
+
+    def __init__(self, store=None, interval=None, min_gap=1.0, lease=None):
+        self.store = store or get_post_store()
+        self.interval = get_setting("POSTING_WORKER_INTERVAL") if interval is None else interval
+        self.lease = get_setting("POSTING_LEASE") if lease is None else lease
+        self.min_gap = min_gap
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.posted = 0
+        self.failed = 0
+
+    def post_approved(self):
+        """Post every approved reply now; returns (posted, failed) for this pass."""
+        posted = failed = 0
+        for entry in self.store.queued_replies(statuses=("approved",)):
+            if self._stop.is_set():
+                break
+            if not self.store.claim_reply(entry["id"]):
+                continue
+            result = reply_to_bluesky(original_uri=entry["uri"], reply_content=entry["reply"])
+            if result.get("status") == "success":
+                self.store.set_reply_status(entry["id"], "posted")
+                posted += 1
+            else:
+                print(f"Posting queued reply {entry['id']} failed: {result.get('message')}")
+                self.store.set_reply_status(entry["id"], "failed", error=result.get("message"))
+                failed += 1
+            time.sleep(self.min_gap)
+        with self._lock:
+            self.posted += posted
+            self.failed += failed
+        return posted, failed
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.post_approved()
+            except Exception as e:
+                print(f"Reply posting worker error: {e}")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def start(self):
+        """Start the worker thread if it is not running, first releasing stale claims."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                released = self.store.release_stale_claims(self.lease)
+                if released:
+                    print(f"{released} queued replies were interrupted while posting and may have been posted; "
+                          "they are marked failed for review.")
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="reply-poster", daemon=True)
+                self._thread.start()
+
+    def wake(self):
+        """Check the queue now instead of at the next interval, e.g. right after approvals."""
+        self._wake.set()
+
+    def stop(self, timeout=None):
+        """Stop the worker after the reply it is posting, waiting up to `timeout` seconds."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self):
+        with self._lock:
+            return {"running": bool(self._thread and self._thread.is_alive()),
+                    "posted": self.posted, "failed": self.failed}
+
+
+_posting_worker = None
+_posting_worker_lock = threading.Lock()
+
+
+def get_posting_worker():
+    """Return the process-wide reply posting worker (not started)."""
+    global _posting_worker
+    if _posting_worker is None:
+        with _posting_worker_lock:
+            if _posting_worker is None:
+                _posting_worker = ReplyPostingWorker()
+    return _posting_worker
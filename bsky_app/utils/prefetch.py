@@ -0,0 +1,85 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .helpers import get_reply_content
+from .categorizer import estimate_tokens
+from .llm_cache import cached_generate_reply
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+_stats_lock = threading.Lock()
+_stats = {"started": 0, "used": 0, "discarded": 0, "tokens_used": 0, "tokens_wasted": 0, "seconds_saved": 0.0}
+
+
+def _estimate_cost(messages, reply):
+    """Approximate tokens of one request: prompt plus reply."""
+    prompt = "".join(str(message.get("content", "")) for message in messages)
+    return estimate_tokens(prompt) + estimate_tokens(get_reply_content(reply) or "")
+
+
+class PrefetchedReply:
+    """
+    An agent reply generated in the background before anyone knows it is needed.
+
+    result() waits for (or immediately returns) the reply and records how much
+    waiting was saved; discard() records the tokens spent for nothing. Token
+    counts are estimates from prompt and reply length, enough to weigh the
+    latency gained against the extra spend with prefetch_stats().
+    """
+
+    def __init__(self, agent, messages, use_cache=True):
+        self.agent = agent
+        self.messages = messages
+        self.use_cache = use_cache
+        self.generation_time = None
+        self._settled = False
+        with _stats_lock:
+            _stats["started"] += 1
+        self._future = _executor.submit(self._generate)
+
+    def _generate(self):
+        start = time.monotonic()
+        reply = cached_generate_reply(self.agent, self.messages, use_cache=self.use_cache)
+        self.generation_time = time.monotonic() - start
+        return reply
+
+    def result(self):
+        """Return the reply, waiting for it if it is still being generated."""
+        start = time.monotonic()
+        reply = self._future.result()
+        waited = time.monotonic() - start
+        if not self._settled:
+            self._settled = True
+            with _stats_lock:
+                _stats["used"] += 1
+                _stats["tokens_used"] += _estimate_cost(self.messages, reply)
+                _stats["seconds_saved"] += max(0.0, self.generation_time - waited)
+        return reply
+
+    def discard(self):
+        """Give up on the reply; its tokens are counted as wasted once generation finishes."""
+        if self._settled:
+            return
+        self._settled = True
+        if self._future.cancel():
+            with _stats_lock:
+                _stats["discarded"] += 1
+            return
+
+        def record(future):
+            tokens = 0 if future.exception() else _estimate_cost(self.messages, future.result())
+            with _stats_lock:
+                _stats["discarded"] += 1
+                _stats["tokens_wasted"] += tokens
+
+        self._future.add_done_callback(record)
+
+
+def prefetch_reply(agent, messages, use_cache=True):
+    """Start generating `agent`'s reply to `messages` in the background."""
+    return PrefetchedReply(agent, messages, use_cache=use_cache)
+
+
+def prefetch_stats():
+    """Return counts of prefetched replies used and discarded, estimated tokens, and seconds saved."""
+    with _stats_lock:
+        return dict(_stats)
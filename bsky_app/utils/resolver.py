@@ -0,0 +1,136 @@
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from .session import get_session_manager
+
+# app.bsky.feed.getPosts accepts at most 25 URIs per request
+MAX_GET_POSTS_URIS = 25
+
+
+def _fetch_posts(uris):
+    """Fetch PostViews for a list of URIs with the shared client."""
+    client = get_session_manager().get_client()
+    response = client.app.bsky.feed.get_posts({"uris": uris})
+    return response.posts
+
+
+class BatchPostResolver:
+    """
+    Coalesce single-URI post lookups into batched getPosts requests.
+
+    Callers submit URIs and wait on a Future. A background thread collects
+    pending URIs for up to `window` seconds (or until `max_batch` are queued),
+    sends them as one getPosts request and completes every waiting Future
+    with its PostView, or None if the post was not returned. Concurrent
+    lookups of the same URI share a single Future.
+    """
+
+    def __init__(self, fetch_posts=None, window=0.02, max_batch=MAX_GET_POSTS_URIS):
+        self.fetch_posts = fetch_posts or _fetch_posts
+        self.window = window
+        self.max_batch = min(max_batch, MAX_GET_POSTS_URIS)
+        self._pending = OrderedDict()
+        self._first_pending_at = None
+        self._cond = threading.Condition()
+        self._thread = None
+        self._batches = 0
+        self._uris = 0
+        self._max_batch_size = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+        self._errors = 0
+
+    def submit(self, uri):
+        """Queue a URI lookup and return a Future resolving to its PostView (or None)."""
+        with self._cond:
+            future = self._pending.get(uri)
+            if future is None:
+                future = Future()
+                if not self._pending:
+                    self._first_pending_at = time.monotonic()
+                self._pending[uri] = future
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="post-resolver", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return future
+
+    def resolve(self, uri, timeout=30):
+        """Block until the PostView for `uri` is available."""
+        return self.submit(uri).result(timeout=timeout)
+
+    async def resolve_async(self, uri):
+        """Await the PostView for `uri` from an asyncio caller."""
+        return await asyncio.wrap_future(self.submit(uri))
+
+    def _next_batch(self):
+        """Wait for the batching window to close and take up to max_batch pending lookups."""
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            deadline = self._first_pending_at + self.window
+            while len(self._pending) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = []
+            while self._pending and len(batch) < self.max_batch:
+                batch.append(self._pending.popitem(last=False))
+            # Leftover lookups have already waited a full window, so they go out next
+            return batch
+
+    def _run(self):
+        while True:
+            self._flush(self._next_batch())
+
+    def _flush(self, batch):
+        """Send one getPosts request for the batch and complete its Futures."""
+        uris = [uri for uri, _ in batch]
+        start = time.monotonic()
+        try:
+            posts = self.fetch_posts(uris)
+        except Exception as e:
+            self._record(len(uris), time.monotonic() - start, error=True)
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        self._record(len(uris), time.monotonic() - start)
+        posts_by_uri = {post.uri: post for post in posts}
+        for uri, future in batch:
+            future.set_result(posts_by_uri.get(uri))
+
+    def _record(self, size, latency, error=False):
+        with self._cond:
+            self._batches += 1
+            self._uris += size
+            self._max_batch_size = max(self._max_batch_size, size)
+            self._total_latency += latency
+            self._max_latency = max(self._max_latency, latency)
+            if error:
+                self._errors += 1
+
+    def stats(self):
+        """Return batch-size and request-latency statistics."""
+        with self._cond:
+            batches = self._batches
+            return {
+                "batches": batches,
+                "uris": self._uris,
+                "errors": self._errors,
+                "mean_batch_size": self._uris / batches if batches else 0.0,
+                "max_batch_size": self._max_batch_size,
+                "mean_latency_ms": self._total_latency * 1000 / batches if batches else 0.0,
+                "max_latency_ms": self._max_latency * 1000,
+                "pending": len(self._pending)
+            }
+
+
+_post_resolver = BatchPostResolver()
+
+
+def get_post_resolver():
+    """Return the process-wide batching post resolver."""
+    return _post_resolver
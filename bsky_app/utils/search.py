@@ -0,0 +1,110 @@
+import time
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from .bluesky import get_bluesky_client, post_to_message
+
+
+def _iso(value):
+    """Format a datetime (or pass through a string) for searchPosts since/until."""
+    if value is None or isinstance(value, str):
+        return value
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+class PostSearch:
+    """
+    Server-side subject search through app.bsky.feed.searchPosts.
+
+    Results are paged with the response cursor and filtered by language and
+    time window on the server. Each fetched page is kept in a small LRU cache
+    keyed by the full query (text, filters, cursor), so re-running a subject
+    search within `page_ttl` seconds does not hit the network again.
+    """
+
+    def __init__(self, page_ttl=300, max_pages=256, client_factory=None):
+        self.page_ttl = page_ttl
+        self.max_pages = max_pages
+        self.client_factory = client_factory or get_bluesky_client
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _fetch_page(self, params):
+        """Return one searchPosts page, from the page cache when fresh."""
+        key = tuple(sorted(params.items()))
+        with self._lock:
+            entry = self._pages.get(key)
+            if entry and time.monotonic() - entry[0] <= self.page_ttl:
+                self._pages.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        page = self.client_factory().app.bsky.feed.search_posts(params)
+        with self._lock:
+            self._pages[key] = (time.monotonic(), page)
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        return page
+
+    def iter_posts(self, query, lang=None, since=None, until=None, max_posts=100, sort="latest", page_size=50):
+        """
+        Yield message dicts for posts matching `query`, newest first with sort="latest".
+
+        `since`/`until` bound the time window (datetimes or ISO strings), `lang`
+        restricts results to one language code such as "en".
+        """
+        params = {"q": query, "sort": sort}
+        if lang:
+            params["lang"] = lang
+        if since:
+            params["since"] = _iso(since)
+        if until:
+            params["until"] = _iso(until)
+        count = 0
+        cursor = None
+        while count < max_posts:
+            page_params = dict(params, limit=min(page_size, max_posts - count))
+            if cursor:
+                page_params["cursor"] = cursor
+            page = self._fetch_page(page_params)
+            for post in page.posts:
+                langs = getattr(post.record, "langs", None)
+                if lang and langs and lang not in langs:
+                    continue
+                count += 1
+                yield post_to_message(post, count)
+                if count >= max_posts:
+                    return
+            cursor = page.cursor
+            if not cursor or not page.posts:
+                return
+
+    def stats(self):
+        with self._lock:
+            return {"pages": len(self._pages), "hits": self.hits, "misses": self.misses}
+
+
+_post_search = PostSearch()
+
+
+def get_post_search():
+    """Return the process-wide post search backend."""
+    return _post_search
+
+
+def search_bluesky_posts(query, lang=None, hours=None, max_posts=20):
+    """Search all of Bluesky for posts about `query`, optionally within the last `hours` hours."""
+    try:
+        since = None
+        if hours:
+            # Whole minutes keep the page-cache key stable across quick re-runs
+            since = (datetime.now(timezone.utc) - timedelta(hours=hours)).replace(second=0, microsecond=0)
+        posts = list(get_post_search().iter_posts(query, lang=lang, since=since, max_posts=max_posts))
+        return {"status": "success", "posts": posts}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
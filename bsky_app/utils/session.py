@@ -0,0 +1,111 @@
+import os
+import time
+import threading
+import atproto
+from atproto import SessionEvent
+from config import get_setting
+
+
+class BlueskySessionManager:
+    """
+    Process-wide holder of a single logged-in atproto Client.
+
+    The first call to get_client() restores the session string saved on disk,
+    or falls back to a password login (createSession) if there is none or it
+    is no longer usable. Every session change reported by the client (create,
+    refresh) is written back to disk, so restarts reuse the same tokens.
+    The atproto Client refreshes the access JWT shortly before it expires
+    under its own lock, which makes the shared client safe to use from threads.
+    """
+
+    def __init__(self, username=None, password=None, session_file=None):
+        self.username = username or get_setting("BLUESKY_USERNAME")
+        self.password = password or get_setting("BLUESKY_PASSWORD")
+        self.session_file = session_file or get_setting("BLUESKY_SESSION_FILE")
+        self._client = None
+        self._lock = threading.Lock()
+        self.logins = 0
+        self.restores = 0
+
+    def get_client(self):
+        """Return the shared client, logging in or restoring the session on first use."""
+        client = self._client
+        if client is not None:
+            return client
+        with self._lock:
+            if self._client is None:
+                self._client = self._connect()
+            return self._client
+
+    def reset(self):
+        """Drop the shared client so the next get_client() logs in again."""
+        with self._lock:
+            self._client = None
+
+    def _connect(self):
+        """Build a client from the saved session, or from a fresh password login."""
+        session_string = self._load_session()
+        if session_string:
+            client = atproto.Client()
+            client.on_session_change(self._on_session_change)
+            try:
+                client.login(session_string=session_string)
+                self.restores += 1
+                return client
+            except Exception as e:
+                print(f"Saved Bluesky session could not be restored ({e}); logging in again.")
+        client = atproto.Client()
+        client.on_session_change(self._on_session_change)
+        client.login(self.username, self.password)
+        self.logins += 1
+        return client
+
+    def _on_session_change(self, event, session):
+        """Persist the session whenever it is created or refreshed."""
+        if event in (SessionEvent.CREATE, SessionEvent.REFRESH):
+            self._save_session(session.export())
+
+    def _load_session(self):
+        """Read the saved session string, ignoring it if the refresh token has expired."""
+        if not self.session_file or not os.path.exists(self.session_file):
+            return None
+        try:
+            with open(self.session_file, "r", encoding="utf-8") as f:
+                session_string = f.read().strip()
+        except OSError:
+            return None
+        if not session_string:
+            return None
+        try:
+            session = atproto.Session.decode(session_string)
+            exp = session.refresh_jwt_payload.exp
+            if exp and exp <= time.time():
+                return None
+        except Exception:
+            return None
+        return session_string
+
+    def _save_session(self, session_string):
+        """Write the session string to disk, readable only by the current user."""
+        if not self.session_file:
+            return
+        try:
+            fd = os.open(self.session_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(session_string)
+        except OSError as e:
+            print(f"Could not save Bluesky session: {e}")
+
+
+_session_manager = None
+_session_manager_lock = threading.Lock()
+
+
+def get_session_manager():
+    """Return the process-wide session manager."""
+    global _session_manager
+    if _session_manager is None:
+        with _session_manager_lock:
+            if _session_manager is None:
+                _session_manager = BlueskySessionManager()
+    return _session_manager
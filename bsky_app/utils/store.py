@@ -0,0 +1,455 @@
+import json
+import time
+import sqlite3
+import threading
+from config import get_setting
+from .post_cache import get_post_cache
+from .bluesky import iter_feed_views, feed_item_time, fetch_timeline_page
+
+TIMELINE_FEED = "timeline"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS authors (
+    did TEXT PRIMARY KEY,
+    handle TEXT,
+    display_name TEXT,
+    updated_at REAL
+);
+CREATE TABLE IF NOT EXISTS posts (
+    uri TEXT PRIMARY KEY,
+    cid TEXT NOT NULL,
+    author_did TEXT,
+    text TEXT,
+    created_at TEXT,
+    indexed_at TEXT,
+    feed_time TEXT,
+    root_uri TEXT,
+    root_cid TEXT,
+    parent_uri TEXT,
+    parent_cid TEXT,
+    source TEXT,
+    fetched_at REAL,
+    version INTEGER
+);
+CREATE INDEX IF NOT EXISTS posts_feed_time ON posts (feed_time);
+CREATE INDEX IF NOT EXISTS posts_author ON posts (author_did, feed_time);
+CREATE TABLE IF NOT EXISTS analysis (
+    uri TEXT PRIMARY KEY,
+    category TEXT,
+    subject TEXT,
+    style TEXT,
+    leaning TEXT,
+    details TEXT,
+    analyzed_at REAL
+);
+CREATE TABLE IF NOT EXISTS reply_queue (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    uri TEXT NOT NULL UNIQUE,
+    reply TEXT,
+    leaning TEXT,
+    responder TEXT,
+    verdict TEXT,
+    status TEXT NOT NULL,
+    error TEXT,
+    created_at REAL,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS reply_queue_status ON reply_queue (status, id);
+CREATE TABLE IF NOT EXISTS sync_state (
+    feed TEXT PRIMARY KEY,
+    last_uri TEXT,
+    last_feed_time TEXT,
+    updated_at REAL
+);
+CREATE TABLE IF NOT EXISTS watermarks (
+    name TEXT PRIMARY KEY,
+    rowid_mark INTEGER,
+    updated_at REAL
+);
+"""
+
+
+class PostStore:
+    """
+    Local SQLite (WAL mode) store of posts, authors and analysis results keyed by URI.
+
+    One connection is shared between threads and serialised with a lock;
+    WAL mode lets other processes read the database while it is written.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or get_setting("POST_STORE_PATH")
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+        self._conn.commit()
+
+    def _migrate(self):
+        """Bring a store created by an older version up to the current schema."""
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(posts)")}
+        if "version" not in columns:
+            self._conn.execute("ALTER TABLE posts ADD COLUMN version INTEGER")
+            self._conn.execute("UPDATE posts SET version = rowid")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS posts_version ON posts (version)")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def save_feed_views(self, feed_views, source=TIMELINE_FEED):
+        """Insert or update posts and their authors from atproto feed view items."""
+        post_rows = []
+        author_rows = {}
+        for feed_view in feed_views:
+            post = feed_view.post
+            reply = getattr(post.record, "reply", None)
+            post_rows.append((
+                post.uri, post.cid, post.author.did, post.record.text,
+                getattr(post.record, "created_at", None), post.indexed_at, feed_item_time(feed_view),
+                reply.root.uri if reply else None, reply.root.cid if reply else None,
+                reply.parent.uri if reply else None, reply.parent.cid if reply else None,
+                source
+            ))
+            author_rows[post.author.did] = (post.author.did, post.author.handle, post.author.display_name)
+        with self._lock, self._conn:
+            now = time.time()
+            post_rows = [row + (now,) for row in post_rows]
+            self._conn.executemany(
+                "INSERT INTO authors (did, handle, display_name, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(did) DO UPDATE SET handle=excluded.handle, "
+                "display_name=excluded.display_name, updated_at=excluded.updated_at",
+                [row + (now,) for row in author_rows.values()]
+            )
+            self._conn.executemany(
+                "INSERT INTO posts (uri, cid, author_did, text, created_at, indexed_at, feed_time, "
+                "root_uri, root_cid, parent_uri, parent_cid, source, fetched_at, version) "
+                # Every insert or update takes the next version, so readers can follow
+                # changes in write order (see posts_changed_since)
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, (SELECT COALESCE(MAX(version), 0) + 1 FROM posts)) "
+                "ON CONFLICT(uri) DO UPDATE SET cid=excluded.cid, text=excluded.text, "
+                "feed_time=MAX(posts.feed_time, excluded.feed_time), fetched_at=excluded.fetched_at, "
+                "version=excluded.version",
+                post_rows
+            )
+        return len(post_rows)
+
+    def _rows_to_messages(self, rows):
+        """Convert post rows into workflow message dicts and warm the post reference cache."""
+        cache = get_post_cache()
+        messages = []
+        for idx, row in enumerate(rows, start=1):
+            root = {"uri": row["root_uri"], "cid": row["root_cid"]} if row["root_uri"] else None
+            parent = {"uri": row["parent_uri"], "cid": row["parent_cid"]} if row["parent_uri"] else None
+            cache.put(row["uri"], row["cid"], root=root, parent=parent)
+            messages.append({
+                "number": idx,
+                "did": row["uri"],
+                "author": row["display_name"] or row["handle"],
+                "text": row["text"],
+                "timestamp": row["indexed_at"]
+            })
+        return messages
+
+    def recent_messages(self, limit=20, source=TIMELINE_FEED, author_did=None):
+        """Return the newest stored posts as workflow message dicts, newest first."""
+        query = ("SELECT p.*, a.handle, a.display_name FROM posts p "
+                 "LEFT JOIN authors a ON a.did = p.author_did WHERE 1=1")
+        params = []
+        if source:
+            query += " AND p.source = ?"
+            params.append(source)
+        if author_did:
+            query += " AND p.author_did = ?"
+            params.append(author_did)
+        query += " ORDER BY p.feed_time DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return self._rows_to_messages(rows)
+
+    def get_messages(self, uris):
+        """Return stored posts for the given URIs as message dicts, in the order given."""
+        if not uris:
+            return []
+        placeholders = ",".join("?" * len(uris))
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT p.*, a.handle, a.display_name FROM posts p "
+                f"LEFT JOIN authors a ON a.did = p.author_did WHERE p.uri IN ({placeholders})",
+                list(uris)
+            ).fetchall()
+        rows_by_uri = {row["uri"]: row for row in rows}
+        return self._rows_to_messages([rows_by_uri[uri] for uri in uris if uri in rows_by_uri])
+
+    def posts_since_rowid(self, rowid, batch_size=None):
+        """Return (rowid, uri, text, feed_time) rows inserted after `rowid`, oldest first."""
+        query = "SELECT rowid, uri, text, feed_time FROM posts WHERE rowid > ? ORDER BY rowid"
+        params = [rowid]
+        if batch_size:
+            query += " LIMIT ?"
+            params.append(batch_size)
+        with self._lock:
+            return self._conn.execute(query, params).fetchall()
+
+    def posts_changed_since(self, version):
+        """Return (uri, text, feed_time, version) rows inserted or updated after `version`, oldest first."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT uri, text, feed_time, version FROM posts WHERE version > ? ORDER BY version",
+                (version,)
+            ).fetchall()
+
+    def unqueued_posts(self, after_rowid, source=TIMELINE_FEED, exclude_author=None, limit=None):
+        """
+        Return stored posts after `after_rowid` that have no reply queue entry, oldest first.
+
+        Each message dict also carries the post's "rowid", for moving a watermark past it.
+        """
+        query = ("SELECT p.rowid, p.*, a.handle, a.display_name FROM posts p "
+                 "LEFT JOIN authors a ON a.did = p.author_did "
+                 "WHERE p.rowid > ? AND p.source = ? "
+                 "AND NOT EXISTS (SELECT 1 FROM reply_queue q WHERE q.uri = p.uri)")
+        params = [after_rowid, source]
+        if exclude_author:
+            query += " AND p.author_did != ?"
+            params.append(exclude_author)
+        query += " ORDER BY p.rowid"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        messages = self._rows_to_messages(rows)
+        for msg, row in zip(messages, rows):
+            msg["rowid"] = row["rowid"]
+        return messages
+
+    def max_post_rowid(self):
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM posts").fetchone()[0]
+
+    def count_posts(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+    def save_analysis(self, uri, category=None, subject=None, style=None, leaning=None, details=None):
+        """Store (or update) the analysis result for a post; None fields keep their stored value."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO analysis (uri, category, subject, style, leaning, details, analyzed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(uri) DO UPDATE SET "
+                "category=COALESCE(excluded.category, analysis.category), "
+                "subject=COALESCE(excluded.subject, analysis.subject), "
+                "style=COALESCE(excluded.style, analysis.style), "
+                "leaning=COALESCE(excluded.leaning, analysis.leaning), "
+                "details=COALESCE(excluded.details, analysis.details), "
+                "analyzed_at=excluded.analyzed_at",
+                (uri, category, subject, style, leaning,
+                 json.dumps(details) if details is not None else None, time.time())
+            )
+
+    def get_analyses(self, uris):
+        """Return {uri: analysis dict} for the URIs that have stored analysis results."""
+        if not uris:
+            return {}
+        placeholders = ",".join("?" * len(uris))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM analysis WHERE uri IN ({placeholders})", list(uris)
+            ).fetchall()
+        analyses = {}
+        for row in rows:
+            analysis = dict(row)
+            analysis["details"] = json.loads(row["details"]) if row["details"] else None
+            analyses[row["uri"]] = analysis
+        return analyses
+
+    def labeled_leanings(self):
+        """Return (text, leaning) pairs for every stored post with an LLM-assigned political leaning."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT p.text, a.leaning FROM analysis a JOIN posts p ON p.uri = a.uri "
+                "WHERE a.leaning IS NOT NULL AND p.text != '' ORDER BY p.rowid"
+            ).fetchall()
+        return [(row["text"], row["leaning"]) for row in rows]
+
+    def queue_reply(self, uri, reply, status="pending", leaning=None, responder=None, verdict=None, error=None):
+        """
+        Record a drafted reply to the post `uri` and return its queue id.
+
+        Status is "pending" (awaiting approval), "approved", "posting" (claimed
+        by the posting worker), "posted", "rejected", "failed" or "skipped"
+        (not to be replied to); a post has at most one entry, which a new
+        draft replaces.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO reply_queue (uri, reply, leaning, responder, verdict, status, error, "
+                "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(uri) DO UPDATE SET "
+                "reply=excluded.reply, leaning=excluded.leaning, responder=excluded.responder, "
+                "verdict=excluded.verdict, status=excluded.status, error=excluded.error, "
+                "updated_at=excluded.updated_at",
+                (uri, reply, leaning, responder, verdict, status, error, now, now)
+            )
+            return self._conn.execute("SELECT id FROM reply_queue WHERE uri = ?", (uri,)).fetchone()[0]
+
+    def set_reply_status(self, reply_id, status, reply=None, error=None):
+        """Update a queued reply's status; a None reply keeps the stored text."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE reply_queue SET status = ?, reply = COALESCE(?, reply), error = ?, updated_at = ? "
+                "WHERE id = ?",
+                (status, reply, error, time.time(), reply_id)
+            )
+
+    def claim_reply(self, reply_id):
+        """Move an approved reply to "posting"; False if another worker (or process) claimed it first."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE reply_queue SET status = 'posting', updated_at = ? WHERE id = ? AND status = 'approved'",
+                (time.time(), reply_id)
+            )
+        return cursor.rowcount == 1
+
+    def release_stale_claims(self, lease):
+        """
+        Mark replies claimed more than `lease` seconds ago and never settled as failed.
+
+        Such a claim belongs to a worker that stopped mid-post, so the reply may
+        or may not be on Bluesky; it is left for a person to check rather than
+        posted again. Returns the number of replies released.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE reply_queue SET status = 'failed', error = 'interrupted, may have been posted', "
+                "updated_at = ? WHERE status = 'posting' AND updated_at < ?",
+                (now, now - lease)
+            )
+        return cursor.rowcount
+
+    def queued_replies(self, statuses=("pending",), limit=None, offset=0):
+        """Return queue entries with the given statuses, oldest first, with the post text, author and category."""
+        placeholders = ",".join("?" * len(statuses))
+        query = ("SELECT q.*, p.text, a.display_name, a.handle, an.category FROM reply_queue q "
+                 "LEFT JOIN posts p ON p.uri = q.uri LEFT JOIN authors a ON a.did = p.author_did "
+                 f"LEFT JOIN analysis an ON an.uri = q.uri WHERE q.status IN ({placeholders}) ORDER BY q.id")
+        params = list(statuses)
+        if limit:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def reply_queue_counts(self):
+        """Return {status: number of queue entries}."""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM reply_queue GROUP BY status").fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def queued_uris(self, uris):
+        """Return the subset of `uris` that already have a reply queue entry."""
+        if not uris:
+            return set()
+        placeholders = ",".join("?" * len(uris))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT uri FROM reply_queue WHERE uri IN ({placeholders})", list(uris)
+            ).fetchall()
+        return {row["uri"] for row in rows}
+
+    def get_watermark(self, name):
+        """Return the posts rowid stored under `name` by a consumer of the store, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT rowid_mark FROM watermarks WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_watermark(self, name, rowid):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO watermarks (name, rowid_mark, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET rowid_mark=excluded.rowid_mark, updated_at=excluded.updated_at",
+                (name, rowid, time.time())
+            )
+
+    def get_sync_state(self, feed):
+        """Return the high-water mark (last_uri, last_feed_time) for a feed, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM sync_state WHERE feed = ?", (feed,)).fetchone()
+        return dict(row) if row else None
+
+    def set_sync_state(self, feed, last_uri, last_feed_time):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO sync_state (feed, last_uri, last_feed_time, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(feed) DO UPDATE SET last_uri=excluded.last_uri, "
+                "last_feed_time=excluded.last_feed_time, updated_at=excluded.updated_at",
+                (feed, last_uri, last_feed_time, time.time())
+            )
+
+
+def sync_feed(store, feed, fetch_page, max_posts=500, page_size=50):
+    """
+    Fetch only the items of a feed newer than its stored high-water mark and save them.
+
+    The first sync of a feed fetches up to `max_posts` items; later syncs fetch
+    every item back to the previously newest post, however many, so the store
+    has no gap between syncs. Returns the number of new items stored.
+    """
+    return len(sync_feed_views(store, feed, fetch_page, max_posts=max_posts, page_size=page_size))
+
+
+def sync_feed_views(store, feed, fetch_page, max_posts=500, page_size=50, advance=True):
+    """
+    Like sync_feed, but return the new feed view items (newest first) instead of their count.
+
+    With `advance=False` the items are stored but the high-water mark is left
+    where it was; call advance_sync_state() once they have been handled.
+    """
+    state = store.get_sync_state(feed)
+    feed_views = list(iter_feed_views(
+        fetch_page,
+        # The cap only bounds the first sync; a capped later sync would silently skip posts
+        max_posts=None if state else max_posts,
+        since=state["last_feed_time"] if state else None,
+        stop_at_uri=state["last_uri"] if state else None,
+        page_size=page_size
+    ))
+    if not feed_views:
+        return []
+    store.save_feed_views(feed_views, source=feed)
+    if advance:
+        advance_sync_state(store, feed, feed_views)
+    return feed_views
+
+
+def advance_sync_state(store, feed, feed_views):
+    """Move a feed's high-water mark to the newest of `feed_views` (newest first)."""
+    if feed_views:
+        newest = feed_views[0]
+        store.set_sync_state(feed, newest.post.uri, feed_item_time(newest))
+
+
+def sync_timeline(store=None, max_posts=500):
+    """Incrementally sync the home timeline into the post store."""
+    return sync_feed(store or get_post_store(), TIMELINE_FEED, fetch_timeline_page, max_posts=max_posts)
+
+
+_post_store = None
+_post_store_lock = threading.Lock()
+
+
+def get_post_store():
+    """Return the process-wide post store, opening it on first use."""
+    global _post_store
+    if _post_store is None:
+        with _post_store_lock:
+            if _post_store is None:
+                _post_store = PostStore()
+    return _post_store
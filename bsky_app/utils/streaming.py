@@ -0,0 +1,162 @@
+import re
+import json
+import time
+import threading
+from config import get_azure_client
+from .llm_cache import agent_model, prompt_key, get_llm_cache
+from .helpers import get_reply_content, extract_json_content
+
+_stats_lock = threading.Lock()
+_stats = {"streams": 0, "aborted": 0, "first_text_seconds": 0.0, "total_seconds": 0.0}
+
+
+class JsonStringFieldParser:
+    """
+    Incrementally decode one string field of a JSON object as it streams in.
+
+    feed() takes the next chunk of raw completion text and returns the newly
+    available characters of the field's value (escapes decoded), so they can be
+    shown before the object is complete. Text before the field and after its
+    closing quote is ignored.
+    """
+
+    _ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+    def __init__(self, field):
+        self._start_re = re.compile(r'"' + re.escape(field) + r'"\s*:\s*"')
+        self._buffer = ""
+        self._pos = None
+        self.value = ""
+        self.done = False
+
+    def feed(self, chunk):
+        self._buffer += chunk
+        if self.done:
+            return ""
+        if self._pos is None:
+            match = self._start_re.search(self._buffer)
+            if not match:
+                return ""
+            self._pos = match.end()
+        out = []
+        buffer, pos = self._buffer, self._pos
+        while pos < len(buffer):
+            char = buffer[pos]
+            if char == '"':
+                self.done = True
+                pos += 1
+                break
+            if char != "\\":
+                out.append(char)
+                pos += 1
+                continue
+            if pos + 1 >= len(buffer):
+                break  # Wait for the rest of the escape sequence
+            escape = buffer[pos + 1]
+            if escape != "u":
+                out.append(self._ESCAPES.get(escape, escape))
+                pos += 2
+                continue
+            # \uXXXX, or a surrogate pair \uXXXX\uXXXX; a cut-off or malformed escape
+            # is treated as incomplete, so nothing more is shown until it decodes
+            if pos + 6 > len(buffer):
+                break
+            try:
+                code = int(buffer[pos + 2:pos + 6], 16)
+            except ValueError:
+                break
+            length = 6
+            if 0xD800 <= code < 0xDC00:
+                if pos + 8 > len(buffer):
+                    break
+                if buffer[pos + 6:pos + 8] == "\\u":
+                    length = 12
+            if pos + length > len(buffer):
+                break
+            try:
+                out.append(json.loads('"' + buffer[pos:pos + length] + '"'))
+            except ValueError:
+                break
+            pos += length
+        self._pos = pos
+        text = "".join(out)
+        self.value += text
+        return text
+
+
+def stream_agent_reply(agent, messages, field="formatted_message", use_cache=True, echo=print):
+    """
+    Get an agent's reply as a token stream, showing text as soon as it arrives.
+
+    The request (agent system message plus `messages`) is sent straight to the
+    Azure OpenAI deployment the agent is configured with, using stream=True.
+    With `field`, only that string field of the JSON reply is shown; otherwise
+    the raw text is. Pressing Ctrl+C aborts the completion so no further
+    tokens are generated; the function then returns None. Completed replies
+    go into the same response cache as cached_generate_reply().
+    """
+    key = prompt_key(agent_model(agent), getattr(agent, "system_message", None), messages)
+    if use_cache:
+        reply = get_llm_cache().get(key)
+        if reply is not None:
+            content = get_reply_content(reply)
+            if field:
+                parser = JsonStringFieldParser(field)
+                parser.feed(extract_json_content(content))
+                echo(parser.value or content)
+            else:
+                echo(content)
+            return content
+
+    request = list(messages)
+    if getattr(agent, "system_message", None):
+        request = [{"role": "system", "content": agent.system_message}] + request
+    start = time.monotonic()
+    first_text = None
+    parts = []
+    parser = JsonStringFieldParser(field) if field else None
+    stream = None
+    aborted = False
+    try:
+        # Inside the try, so Ctrl+C while waiting for the response also counts as an abort
+        stream = get_azure_client().chat.completions.create(model=agent_model(agent), messages=request, stream=True)
+        for chunk in stream:
+            if not chunk.choices:
+                continue  # Azure sends content-filter results in chunks without choices
+            delta = chunk.choices[0].delta.content or ""
+            if not delta:
+                continue
+            parts.append(delta)
+            visible = parser.feed(delta) if parser else delta
+            if visible:
+                if first_text is None:
+                    first_text = time.monotonic() - start
+                echo(visible, end="", flush=True)
+    except KeyboardInterrupt:
+        aborted = True
+        if stream is not None:
+            stream.close()
+        echo("\n[aborted]")
+    else:
+        echo()
+    with _stats_lock:
+        _stats["streams"] += 1
+        _stats["aborted"] += aborted
+        _stats["first_text_seconds"] += first_text or 0.0
+        _stats["total_seconds"] += time.monotonic() - start
+    if aborted:
+        return None
+    content = "".join(parts)
+    if use_cache and content:
+        get_llm_cache().put(key, content)
+    return content
+
+
+def streaming_stats():
+    """Return stream counts and mean seconds to first visible text and to completion."""
+    with _stats_lock:
+        stats = dict(_stats)
+    streams = stats["streams"] or 1
+    return {"streams": stats["streams"], "aborted": stats["aborted"],
+            "mean_first_text_seconds": stats["first_text_seconds"] / streams,
+            "mean_total_seconds": stats["total_seconds"] / streams}
@@ -0,0 +1,165 @@
+import os
+import re
+import json
+import threading
+import unicodedata
+from config import get_setting
+
+# Bluesky rejects posts longer than 300 graphemes
+BLUESKY_MAX_GRAPHEMES = 300
+
+# Political category labels a responder sometimes returns instead of (or inside) a reply
+CATEGORY_LABELS = ["progressive", "liberal", "centrist", "conservative", "strongly conservative",
+                   "left", "right", "middle", "far-left", "far-right"]
+
+# Used when REPLY_RULES_FILE does not exist: links and mentions are left to Krsna to judge
+DEFAULT_RULES = {
+    "blocklist": [],
+    "block_patterns": [],
+    "review_patterns": [r"https?://\S+", r"(?<!\w)@[\w.-]+"]
+}
+
+_ZWJ = "\u200d"
+_JSON_KEY_RE = re.compile(r'"\s*(formatted_message|edited_response|candidates|category|valid)\s*"\s*:')
+
+
+def _extends_grapheme(char):
+    """True for code points that attach to the preceding character rather than starting a grapheme."""
+    code = ord(char)
+    return (unicodedata.combining(char) or unicodedata.category(char) in ("Mn", "Me", "Mc")
+            or 0xFE00 <= code <= 0xFE0F or 0x1F3FB <= code <= 0x1F3FF or 0xE0020 <= code <= 0xE007F)
+
+
+def count_graphemes(text):
+    """
+    Count user-perceived characters the way Bluesky's length limit does.
+
+    Combining marks, variation selectors, skin-tone modifiers, emoji tag
+    sequences, ZWJ-joined emoji and regional-indicator flag pairs each count
+    as part of a single grapheme.
+    """
+    count = 0
+    join_next = False
+    pending_flag = False
+    for char in text or "":
+        code = ord(char)
+        if char == _ZWJ:
+            join_next = True
+            continue
+        if join_next or _extends_grapheme(char):
+            join_next = False
+            continue
+        if 0x1F1E6 <= code <= 0x1F1FF:
+            if pending_flag:
+                pending_flag = False
+                continue
+            pending_flag = True
+        else:
+            pending_flag = False
+        count += 1
+    return count
+
+
+class ValidationResult:
+    """Outcome of a local check: verdict is "pass", "fail" or "review" (ask the LLM)."""
+
+    def __init__(self, verdict, problems):
+        self.verdict = verdict
+        self.problems = problems
+
+    def __repr__(self):
+        return f"ValidationResult({self.verdict!r}, {self.problems!r})"
+
+
+class ReplyValidator:
+    """
+    Rule-based reply checks that decide clear-cut drafts without an LLM call.
+
+    A draft fails outright when it is empty, is a bare category label, is (or
+    contains) raw JSON from the agent's answer, exceeds Bluesky's grapheme
+    limit, or matches the blocklist or a block pattern. It goes to review when
+    it is longer than the target length, mentions a far-left/far-right label,
+    or matches a review pattern. Everything else passes.
+
+    Rules are read from a JSON file with optional "blocklist" (words),
+    "block_patterns" and "review_patterns" (regular expressions) lists.
+    """
+
+    def __init__(self, rules=None, rules_file=None, target_length=180, max_graphemes=BLUESKY_MAX_GRAPHEMES):
+        if rules is None:
+            rules = self._load_rules(rules_file or get_setting("REPLY_RULES_FILE"))
+        self.target_length = target_length
+        self.max_graphemes = max_graphemes
+        words = [re.escape(word) for word in rules.get("blocklist", []) if word]
+        self._blocklist = re.compile(r"\b(" + "|".join(words) + r")\b", re.IGNORECASE) if words else None
+        self._block_patterns = [re.compile(p, re.IGNORECASE) for p in rules.get("block_patterns", [])]
+        self._review_patterns = [re.compile(p, re.IGNORECASE) for p in rules.get("review_patterns", [])]
+        self._lock = threading.Lock()
+        self.counts = {"pass": 0, "fail": 0, "review": 0}
+
+    @staticmethod
+    def _load_rules(path):
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return DEFAULT_RULES
+
+    def check(self, text):
+        """Return the problems found in `text` as (severity, description) pairs."""
+        problems = []
+        stripped = (text or "").strip()
+        if not stripped:
+            return [("fail", "empty reply")]
+        lowered = stripped.casefold()
+        if lowered.strip(" .!'\"") in CATEGORY_LABELS:
+            problems.append(("fail", "category label instead of a reply"))
+        elif "far-left" in lowered or "far-right" in lowered:
+            problems.append(("review", "mentions a category label"))
+        if stripped.startswith(("{", "[")) or _JSON_KEY_RE.search(stripped):
+            problems.append(("fail", "looks like raw JSON"))
+        graphemes = count_graphemes(stripped)
+        if graphemes > self.max_graphemes:
+            problems.append(("fail", f"{graphemes} graphemes, over the Bluesky limit of {self.max_graphemes}"))
+        elif graphemes > self.target_length:
+            problems.append(("review", f"{graphemes} characters, over the {self.target_length} target"))
+        if self._blocklist:
+            match = self._blocklist.search(stripped)
+            if match:
+                problems.append(("fail", f"blocked word '{match.group(0)}'"))
+        for pattern in self._block_patterns:
+            if pattern.search(stripped):
+                problems.append(("fail", f"matches blocked pattern {pattern.pattern!r}"))
+        for pattern in self._review_patterns:
+            if pattern.search(stripped):
+                problems.append(("review", f"matches review pattern {pattern.pattern!r}"))
+        return problems
+
+    def validate(self, text):
+        """Classify a draft as pass, fail or review and count the verdict."""
+        problems = self.check(text)
+        severities = {severity for severity, _ in problems}
+        verdict = "fail" if "fail" in severities else "review" if problems else "pass"
+        with self._lock:
+            self.counts[verdict] += 1
+        return ValidationResult(verdict, [description for _, description in problems])
+
+    def stats(self):
+        """Return verdict counts; every pass or fail is an LLM validation call avoided."""
+        with self._lock:
+            counts = dict(self.counts)
+        counts["llm_calls_avoided"] = counts["pass"] + counts["fail"]
+        return counts
+
+
+_validator = None
+_validator_lock = threading.Lock()
+
+
+def get_reply_validator():
+    """Return the process-wide reply validator, loading REPLY_RULES_FILE on first use."""
+    global _validator
+    if _validator is None:
+        with _validator_lock:
+            if _validator is None:
+                _validator = ReplyValidator()
+    return _validator
@@ -1,13 +1,33 @@
-from .post_workflow import process_post_workflow, show_post_plan
-from .reply_workflow import process_reply_workflow, show_reply_plan
-from .search_workflow import search_subject_flow, show_search_plan
+import importlib
+
+# Workflow modules (and the Bluesky / LLM clients they pull in) are imported
+# only when one of their functions is first looked up, e.g. workflow.process_post_workflow
+_EXPORTS = {
+    'process_post_workflow': 'post_workflow',
+    'show_post_plan': 'post_workflow',
+    'process_reply_workflow': 'reply_workflow',
+    'show_reply_plan': 'reply_workflow',
+    'search_subject_flow': 'search_workflow',
+    'search_users_flow': 'search_workflow',
+    'search_posts_flow': 'search_workflow',
+    'show_search_plan': 'search_workflow',
+    'review_reply_queue': 'review_workflow',
+    'show_review_plan': 'review_workflow',
+    'ReplyDaemon': 'daemon'
+}
 
 # Export the main workflow functions
-__all__ = [
-    'process_post_workflow', 
-    'show_post_plan',
-    'process_reply_workflow', 
-    'show_reply_plan',
-    'search_subject_flow', 
-    'show_search_plan'
-]
\ No newline at end of file
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Import the workflow module that defines `name` on first access (PEP 562)."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,147 @@
+# filepath: atproto_app/workflow/daemon.py
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config import get_setting
+from utils.bluesky import get_bluesky_client, fetch_timeline_page, reply_to_bluesky_wrapper
+from utils.store import TIMELINE_FEED, get_post_store, sync_feed
+from .reply_workflow import categorize_messages, draft_reply
+
+# Review verdicts (see reply_workflow._review_reply) under which each policy posts without approval
+AUTO_POST_POLICIES = {
+    "never": (),
+    "validated": ("pass", "valid"),
+    "always": ("pass", "valid", "edited", "unchecked")
+}
+
+# Store watermark: rowid up to which every timeline post has been handled by the daemon
+DAEMON_WATERMARK = "daemon"
+
+
+class ReplyDaemon:
+    """
+    Headless reply loop: sync the timeline, categorise stored posts and reply to them.
+
+    Each cycle stores the timeline posts that arrived since the last sync,
+    then takes its candidates from the store: timeline posts (however they
+    were synced) after the daemon's watermark that have no reply queue entry
+    yet. Krsna categorises them; posts in other categories are queued as
+    "skipped", and for up to `max_replies` posts whose category is in
+    `reply_categories` a reply is drafted, `concurrency` at a time, with the
+    same leaning, responder (Arjunan / Yudhistran) and validation steps as
+    the interactive reply workflow. The `auto_post` policy (a key of
+    AUTO_POST_POLICIES) decides which replies are posted right away; the rest
+    are left in the reply queue with status "pending" for approval.
+
+    Every handled post gets a queue entry, so no post is drafted twice, while
+    posts left without one (not categorised, over `max_replies`, or cut short
+    by an error) are candidates again in the next cycle. The watermark only
+    moves past posts that have an entry.
+    """
+
+    def __init__(self, agents, interval=None, concurrency=None, max_replies=None, reply_categories=None,
+                 auto_post=None, max_posts=100, store=None):
+        self.agents = agents
+        self.interval = get_setting("DAEMON_INTERVAL") if interval is None else interval
+        self.concurrency = concurrency or get_setting("DAEMON_CONCURRENCY")
+        self.max_replies = get_setting("DAEMON_MAX_REPLIES") if max_replies is None else max_replies
+        self.reply_categories = [category.lower() for category in
+                                 (reply_categories or get_setting("DAEMON_REPLY_CATEGORIES"))]
+        self.auto_post = auto_post or get_setting("DAEMON_AUTO_POST")
+        if self.auto_post not in AUTO_POST_POLICIES:
+            raise ValueError(f"unknown auto-post policy {self.auto_post!r}; "
+                             f"expected one of {', '.join(AUTO_POST_POLICIES)}")
+        self.max_posts = max_posts
+        self.store = store or get_post_store()
+        self._own_did = None
+
+    def own_did(self):
+        """DID of the logged-in account, whose own posts are never replied to."""
+        if self._own_did is None:
+            self._own_did = get_bluesky_client().me.did
+        return self._own_did
+
+    def _handle(self, message):
+        """Draft a reply to one message and post or queue it; returns "posted", "queued" or "failed"."""
+        try:
+            draft = draft_reply(self.agents, message)
+        except Exception as e:
+            print(f"Drafting a reply to {message['did']} failed: {e}")
+            self.store.queue_reply(message["did"], None, status="failed", error=str(e))
+            return "failed"
+        details = {"leaning": draft["leaning"], "responder": draft["responder"], "verdict": draft["verdict"]}
+        if draft["verdict"] not in AUTO_POST_POLICIES[self.auto_post]:
+            self.store.queue_reply(message["did"], draft["text"], status="pending", **details)
+            return "queued"
+        # Claimed before posting, as the posting worker does, so a crash mid-post leaves an
+        # entry (released as failed after the lease) instead of a post to reply to again
+        reply_id = self.store.queue_reply(message["did"], draft["text"], status="posting", **details)
+        reply_result = json.loads(reply_to_bluesky_wrapper(original_uri=message["did"], reply_content=draft["text"]))
+        if reply_result.get("status") == "success":
+            self.store.set_reply_status(reply_id, "posted")
+            return "posted"
+        print(f"Posting the reply to {message['did']} failed: {reply_result.get('message')}")
+        self.store.set_reply_status(reply_id, "failed", error=reply_result.get("message"))
+        return "failed"
+
+    def run_cycle(self):
+        """Run one poll cycle; returns counts of new posts, candidates, selected posts and their outcomes."""
+        counts = {"new_posts": 0, "candidates": 0, "skipped": 0, "selected": 0, "posted": 0, "queued": 0, "failed": 0}
+        watermark = self.store.get_watermark(DAEMON_WATERMARK)
+        if watermark is None:
+            # First run: start from the posts synced from now on rather than the whole history
+            watermark = self.store.max_post_rowid()
+            self.store.set_watermark(DAEMON_WATERMARK, watermark)
+        counts["new_posts"] = sync_feed(self.store, TIMELINE_FEED, fetch_timeline_page, max_posts=self.max_posts)
+        messages = self.store.unqueued_posts(watermark, exclude_author=self.own_did(), limit=self.max_posts)
+        counts["candidates"] = len(messages)
+        if not messages:
+            return counts
+        categorize_messages(messages, self.agents["krsna"])
+        selected = []
+        for msg in messages:
+            category = msg.get("category", "Not Categorized")
+            if category == "Not Categorized":
+                continue  # No entry, so it is categorised again next cycle
+            if category.lower() in self.reply_categories:
+                selected.append(msg)
+            else:
+                self.store.queue_reply(msg["did"], None, status="skipped")
+                counts["skipped"] += 1
+        selected = selected[:self.max_replies]
+        counts["selected"] = len(selected)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for outcome in pool.map(self._handle, selected):
+                counts[outcome] += 1
+
+        # Move the watermark over the leading posts that now have a queue entry
+        handled = self.store.queued_uris([msg["did"] for msg in messages])
+        for msg in messages:
+            if msg["did"] not in handled:
+                break
+            watermark = msg["rowid"]
+        self.store.set_watermark(DAEMON_WATERMARK, watermark)
+        return counts
+
+    def run(self, cycles=None):
+        """Run a cycle every `interval` seconds until `cycles` have run or Ctrl+C; returns the cycles run."""
+        print(f"Reply daemon started: every {self.interval:.0f}s, {self.concurrency} concurrent drafts, "
+              f"auto-post policy '{self.auto_post}', replying to: {', '.join(self.reply_categories)}")
+        completed = 0
+        try:
+            while cycles is None or completed < cycles:
+                started = time.monotonic()
+                try:
+                    counts = self.run_cycle()
+                    summary = ", ".join(f"{name.replace('_', ' ')} {count}" for name, count in counts.items())
+                    print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Cycle {completed + 1}: {summary}")
+                except Exception as e:
+                    # A failed cycle (network, login) is retried at the next interval
+                    print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Cycle {completed + 1} failed: {e}")
+                completed += 1
+                if cycles is not None and completed >= cycles:
+                    break
+                time.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+        except KeyboardInterrupt:
+            print("\nReply daemon stopped.")
+        return completed
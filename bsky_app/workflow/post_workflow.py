@@ -1,6 +1,10 @@
 # filepath: atproto_app/workflow/post_workflow.py
 import json
-from utils.helpers import extract_json_content
+from config import get_setting
+from utils.llm_cache import cached_generate_reply
+from utils.streaming import stream_agent_reply
+from utils.json_extract import ReplyResult
+from utils.helpers import get_reply_content
 from utils.bluesky import post_to_bluesky_wrapper
 
 def show_post_plan():
@@ -40,19 +44,16 @@ def process_post_workflow(user_input, agents):
             "Return your answer in a JSON object with the key 'formatted_message'."
         )
     })
-    krsna_response = krsna.generate_reply(messages=[{"role": "user", "content": rewrite_prompt}])
-    if isinstance(krsna_response, str):
-        krsna_content = krsna_response
-    elif isinstance(krsna_response, dict):
-        krsna_content = krsna_response.get("content", "")
+    if get_setting("STREAM_REPLIES"):
+        # Show the rewrite as it is generated; Ctrl+C aborts it and keeps the original
+        print("Krsna's rewrite (Ctrl+C to abort): ", end="", flush=True)
+        krsna_response = stream_agent_reply(krsna, [{"role": "user", "content": rewrite_prompt}])
+        if krsna_response is None:
+            print("Rewrite aborted.")
     else:
-        krsna_content = getattr(krsna_response, "content", "")
-    krsna_content = extract_json_content(krsna_content)
-    try:
-        krsna_json = json.loads(krsna_content)
-        rewritten_message = krsna_json.get("formatted_message", "")
-    except json.JSONDecodeError:
-        rewritten_message = krsna_content  # Fallback if JSON parsing fails
+        krsna_response = cached_generate_reply(krsna, [{"role": "user", "content": rewrite_prompt}])
+    # Falls back to the raw answer if it holds no JSON (or nothing, if the rewrite was aborted)
+    rewritten_message = ReplyResult.from_text(get_reply_content(krsna_response)).text
 
     if not rewritten_message:
         rewritten_message = original_message  # Fallback if no rewrite obtained
@@ -1,16 +1,30 @@
 # filepath: atproto_app/workflow/reply_workflow.py
 import json
-from utils.helpers import extract_json_content, trim_text
+from concurrent.futures import ThreadPoolExecutor
+from config import get_setting
+from utils.llm_cache import cached_generate_reply
+from utils.categorizer import get_categorizer
+from utils.leaning import classify_leaning
+from utils.prefetch import prefetch_reply
+from utils.streaming import stream_agent_reply
+from utils.candidates import parse_candidates, rank_candidates
+from utils.validator import CATEGORY_LABELS, get_reply_validator
+from utils.json_extract import ReplyResult, LeaningResult, ReviewResult
+from utils.helpers import get_reply_content, trim_text
 from utils.bluesky import fetch_bluesky_following_wrapper, like_bluesky_wrapper, reply_to_bluesky_wrapper
+from utils.store import get_post_store, sync_timeline
+from .review_workflow import parse_selection
 
 def show_reply_plan():
     """Display the plan for processing replies"""
     print("\nPlan for Processing Replies:")
     print("Steps:")
-    print("  1. The system fetches messages from Bluesky.")
+    print("  1. The system syncs new messages from Bluesky into the local store.")
     print("  2. Krsna categorizes messages into political leanings.")
     print("  3. Sanjay displays the messages for you to select one.")
     print("  4. You choose to like and/or reply to the selected message.")
+    print("     Selecting several messages (e.g. '1,3-5' or 'all') queues agent drafts for batch review instead.")
+    print("     For agent replies, a local classifier estimates the political leaning; Krsna is asked when it is unsure.")
     print("  5. For replies, if agent-generated, Arjunan or Yudhistran is used based on the message's category,")
     print("     then Krsna may edit the reply following tone guidelines, and finally Bheeman posts it.")
     print("Agents Involved:")
@@ -19,65 +33,81 @@ def show_reply_plan():
     print("  - Arjunan / Yudhistran (Responder)")
     print("  - Bheeman (Poster)\n")
 
+def _analysis_store():
+    """Return the local post store used to remember analysis results, or None if unavailable."""
+    try:
+        return get_post_store()
+    except Exception as e:
+        print(f"Analysis store unavailable ({e}); analyzing all messages.")
+        return None
+
+def _build_categorize_prompt(messages):
+    """Build Krsna's analysis prompt for a chunk of messages."""
+    # Create a more neutral, safe prompt for message analysis
+    message_data = []
+    for msg in messages:
+        message_data.append({
+            "number": msg.get("number", 0),
+            "text": msg.get("text", ""),
+            "author": msg.get("author", "Unknown")
+        })
+    
+    # Create a more neutral prompt that doesn't trigger content filters
+    return json.dumps({
+        "task": "analyze",
+        "messages": message_data,
+        "instruction": (
+            "You are Krsna, the analyst. For each message, please provide:\n"
+            "1. Analyze the text to determine its general subject matter and overall communication style.\n"
+            "2. For each message, assign a category (neutral, informational, opinion, question).\n"
+            "Return a JSON array of objects, each with: 'number', 'category', 'subject', and 'style'.\n"
+            "Keep your analysis objective and professional."
+        )
+    })
+
 def categorize_messages(messages, krsna_agent):
-    """Use Krsna to analyze a list of messages for textual intent and tone."""
+    """
+    Use Krsna to analyze a list of messages for textual intent and tone.
+    Results are stored per post URI, so only messages not analyzed before are sent to Krsna.
+    """
     if not messages:
         return []
+    store = _analysis_store()
+    stored = {}
+    if store:
+        stored = store.get_analyses([msg["did"] for msg in messages if msg.get("did")])
+        stored = {uri: analysis for uri, analysis in stored.items() if analysis.get("category")}
+    pending = [msg for msg in messages if msg.get("did") not in stored]
+    if stored:
+        print(f"Reusing stored analysis for {len(messages) - len(pending)} of {len(messages)} messages.")
     try:
-        # Create a more neutral, safe prompt for message analysis
-        message_data = []
-        for msg in messages:
-            message_data.append({
-                "number": msg.get("number", 0),
-                "text": msg.get("text", ""),
-                "author": msg.get("author", "Unknown")
-            })
-        
-        # Create a more neutral prompt that doesn't trigger content filters
-        prompt = json.dumps({
-            "task": "analyze",
-            "messages": message_data,
-            "instruction": (
-                "You are Krsna, the analyst. For each message, please provide:\n"
-                "1. Analyze the text to determine its general subject matter and overall communication style.\n"
-                "2. For each message, assign a category (neutral, informational, opinion, question).\n"
-                "Return a JSON array of objects, each with: 'number', 'category', 'subject', and 'style'.\n"
-                "Keep your analysis objective and professional."
-            )
-        })
-        
-        analysis_result = krsna_agent.generate_reply(messages=[{"role": "user", "content": prompt}])
-        
-        if isinstance(analysis_result, str):
-            analysis_content = analysis_result
-        elif isinstance(analysis_result, dict):
-            analysis_content = analysis_result.get("content", "")
-        else:
-            analysis_content = getattr(analysis_result, "content", "")
-            
-        analysis_content = extract_json_content(analysis_content)
-        
-        try:
-            result_json = json.loads(analysis_content)
-            if isinstance(result_json, list):
-                analyzed_messages = result_json
-            else:
-                print("Unexpected analysis format. Using default analysis.")
-                analyzed_messages = []
-        except json.JSONDecodeError:
-            print("Failed to parse analysis result; using default analysis.")
-            analyzed_messages = []
+        analyzed_by_number = {}
+        if pending:
+            # Pending messages go to Krsna in token-bounded chunks, sent concurrently;
+            # a chunk whose reply cannot be parsed is retried on its own
+            categorizer = get_categorizer("reply_categorize", krsna_agent, _build_categorize_prompt)
+            analyzed_by_number = categorizer.categorize(pending)
+            if len(analyzed_by_number) < len(pending):
+                print(f"No analysis returned for {len(pending) - len(analyzed_by_number)} messages; "
+                      "using default analysis for them.")
             
-        # Merge the analysis into each message:
+        # Merge stored and new analysis into each message:
         for msg in messages:
+            stored_analysis = stored.get(msg.get("did"))
+            if stored_analysis:
+                msg["category"] = stored_analysis["category"]
+                msg["analysis"] = f"Subject: {stored_analysis['subject']}, Style: {stored_analysis['style']}"
+                continue
             msg_number = msg.get("number", 0)
-            analysis_found = next((am for am in analyzed_messages if am.get("number") == msg_number), None)
+            analysis_found = analyzed_by_number.get(msg_number)
             if analysis_found:
                 category = analysis_found.get("category", "Not Categorized")
                 subject = analysis_found.get("subject", "Unknown Subject")
                 style = analysis_found.get("style", "Neutral Style")
                 msg["category"] = category
                 msg["analysis"] = f"Subject: {subject}, Style: {style}"
+                if store and msg.get("did"):
+                    store.save_analysis(msg["did"], category=category, subject=subject, style=style)
             else:
                 msg["category"] = "Not Categorized"
                 msg["analysis"] = "Not Analyzed"
@@ -91,21 +121,261 @@ def categorize_messages(messages, krsna_agent):
             msg["analysis"] = "Not Analyzed"
         return messages
 
+def _ask_krsna_leaning(krsna_agent, text):
+    """Ask Krsna for a message's political leaning; returns the category, or None if the reply cannot be parsed."""
+    # NEW WORKFLOW: Enhanced categorization for message political leaning
+    categorize_prompt = json.dumps({
+        "task": "political_analysis",
+        "message": text,
+        "instruction": (
+            "Analyze this message and determine its political leaning on a scale: "
+            "'far-left', 'left', 'middle', 'right', or 'far-right'. "
+            "Consider the content, tone, and perspective. "
+            "Return a JSON object with keys: 'category' and 'reasoning'."
+        )
+    })
+    
+    # Get categorization from Krsna
+    categorization = cached_generate_reply(krsna_agent, [{"role": "user", "content": categorize_prompt}])
+    
+    # Parse categorization
+    result = LeaningResult.from_text(get_reply_content(categorization))
+    if result is None:
+        return None
+    print(f"Message categorized as: {result.category}")
+    print(f"Reasoning: {result.reasoning}")
+    return result.category
+
+def _message_leaning(message, ask_krsna):
+    """
+    Return a message's political leaning: stored, from the local classifier, or from ask_krsna(text).
+
+    A leaning Krsna assigns is stored with the post; 'middle' is used when his
+    answer cannot be parsed.
+    """
+    # Reuse a stored political leaning for this post if it was analyzed before
+    store = _analysis_store()
+    if store and message.get("did"):
+        stored_analysis = store.get_analyses([message["did"]]).get(message["did"])
+        if stored_analysis and stored_analysis["leaning"]:
+            print(f"Message categorized as: {stored_analysis['leaning']} (stored analysis)")
+            return stored_analysis["leaning"]
+    
+    # The local classifier answers confident cases; Krsna is only asked below the threshold
+    category, confidence, source = classify_leaning(
+        message["text"], ask_krsna, threshold=get_setting("LEANING_CONFIDENCE_THRESHOLD"),
+        min_known_features=get_setting("LEANING_MIN_KNOWN_FEATURES")
+    )
+    if source == "local":
+        print(f"Message categorized as: {category} (local classifier, {confidence:.0%} confidence)")
+    elif category:
+        if store and message.get("did"):
+            store.save_analysis(message["did"], leaning=category)
+    else:
+        print("Categorization parsing failed. Defaulting to 'middle'.")
+        category = "middle"
+    return category
+
+def _build_reply_prompt(message_text, category, candidates=1):
+    """
+    Return (responder, prompt) for replying to a message with the given political leaning.
+
+    Far-right messages go to Yudhistran, everything else to Arjunan. A category
+    of None builds Arjunan's speculative prompt, used before the leaning is known.
+    With candidates > 1 the responder is asked for that many alternative replies
+    in one JSON array instead of a single reply.
+    """
+    if candidates > 1:
+        output = (f"Write {candidates} distinct candidate responses and return them in a JSON object "
+                  "with key 'candidates' holding an array of strings.")
+    else:
+        output = "Return your response in a JSON object with key 'formatted_message'."
+    if category and category.lower() == "far-right":
+        return "yudhistran", json.dumps({
+            "task": "reply",
+            "message": message_text,
+            "instruction": (
+                "You are Yudhistran, the balanced mediator. This message appears to have 'far-right' views. "
+                "Craft a measured, soothing response that finds middle ground while maintaining respect. "
+                "Aim for exactly 180 characters. " + output
+            )
+        })
+    if category:
+        views = "This message has been categorized as having " + category + " political views. "
+    else:
+        views = "Consider the political views this message expresses. "
+    return "arjunan", json.dumps({
+        "task": "reply",
+        "message": message_text,
+        "instruction": (
+            "You are Arjunan. " + views +
+            "Craft a thoughtful, assertive response in exactly 180 characters. " + output
+        )
+    })
+
+def _parse_reply_text(reply_content):
+    """Extract the reply text from a responder's answer, falling back to the raw content."""
+    # Bare category labels are not replies, even when they sit in a reply field
+    result = ReplyResult.from_text(reply_content, ignore=CATEGORY_LABELS)
+    if not result.parsed:
+        print("No suitable reply field found. Using raw agent response.")
+    return result.text
+
+def _generate_reply_draft(reply_agent, agent_prompt):
+    """Ask a responder for a reply and extract the reply text from its answer."""
+    agent_response = cached_generate_reply(reply_agent, [{"role": "user", "content": agent_prompt}])
+    return _parse_reply_text(get_reply_content(agent_response))
+
+def _generate_reply_candidates(reply_agent, agent_prompt):
+    """Ask a responder for several replies in one call and return them ranked by local checks."""
+    agent_response = cached_generate_reply(reply_agent, [{"role": "user", "content": agent_prompt}])
+    reply_content = get_reply_content(agent_response)
+    candidates = parse_candidates(reply_content)
+    if not candidates:
+        print("No candidate list found. Using the response as a single reply.")
+        candidates = [_parse_reply_text(reply_content)]
+    return rank_candidates(candidates, max_length=180)
+
+def _choose_candidate(sanjay, ranked):
+    """Show the ranked candidates and return the text of the one the user picks (default: the best)."""
+    print("\nCandidate replies (best first):")
+    for number, candidate in enumerate(ranked, 1):
+        problems = f"  [{'; '.join(candidate['problems'])}]" if candidate["problems"] else ""
+        print(f"{number}. ({candidate['score']:.2f}) {candidate['text']}{problems}")
+    choice = sanjay.get_human_input(f"Choose a reply by number (1-{len(ranked)}, default 1): ").strip()
+    if choice.isdigit() and 1 <= int(choice) <= len(ranked):
+        return ranked[int(choice) - 1]["text"]
+    return ranked[0]["text"]
+
+def _draft_function():
+    """Return the draft generator for the configured number of reply candidates."""
+    return _generate_reply_candidates if get_setting("REPLY_CANDIDATES") > 1 else _generate_reply_draft
+
+def _start_speculative_drafts(agents, message_text):
+    """
+    Start Yudhistran's and Arjunan's drafts in the background before the leaning is known.
+
+    Returns (pool, {responder: future}); the caller keeps the draft matching
+    the category and discards the other.
+    """
+    pool = ThreadPoolExecutor(max_workers=2)
+    drafts = {}
+    for category in ("far-right", None):
+        responder, prompt = _build_reply_prompt(message_text, category,
+                                                candidates=get_setting("REPLY_CANDIDATES"))
+        drafts[responder] = pool.submit(_draft_function(), agents[responder], prompt)
+    return pool, drafts
+
+def _review_reply(krsna, message_text, reply_text):
+    """
+    Check a draft with the local rules and, only when they are unsure, with Krsna.
+
+    Returns (reply, verdict): verdict is "pass" or "fail" from the local
+    validator, "valid" or "edited" from Krsna (the reply is then his edit),
+    or "unchecked" when Krsna's answer could not be parsed.
+    """
+    validator = get_reply_validator()
+    local_check = validator.validate(reply_text)
+    if local_check.verdict == "pass":
+        print("✅ Local validation passed; Krsna's validation skipped "
+              f"({validator.stats()['llm_calls_avoided']} validation calls avoided so far).")
+        return reply_text, "pass"
+    if local_check.verdict == "fail":
+        print(f"❌ Local validation rejected the reply: {'; '.join(local_check.problems)}")
+        return reply_text, "fail"
+    
+    print(f"Local validation needs a second opinion: {'; '.join(local_check.problems)}")
+    # Send to Krsna for validation
+    validate_prompt = json.dumps({
+        "task": "validate_response",
+        "original_message": message_text,
+        "agent_response": reply_text,
+        "instruction": (
+            "As Krsna, evaluate if this response is appropriate, respectful, and fits within 180 characters. "
+            "Return a JSON object with keys: 'valid' (boolean), 'edited_response' (string), and 'feedback' (string)."
+        )
+    })
+    
+    print("Sending to Krsna for validation...")
+    validation = cached_generate_reply(krsna, [{"role": "user", "content": validate_prompt}])
+    
+    # Process validation results
+    review = ReviewResult.from_text(get_reply_content(validation), reply_text)
+    if review is None:
+        print("Validation parsing failed: no JSON object in Krsna's answer.")
+        print("Using original agent response without validation.")
+        return reply_text, "unchecked"
+    if review.valid:
+        print("✅ Krsna has validated the reply as appropriate.")
+    else:
+        print("⚠️ Krsna has concerns about the reply and has edited it.")
+    print(f"Feedback: {review.feedback}")
+    return review.edited_response, "valid" if review.valid else "edited"
+
+def draft_reply(agents, message):
+    """
+    Generate and check a reply to `message` without asking the user anything.
+
+    Used by the headless daemon: the leaning comes from the stored analysis,
+    the local classifier or Krsna, and with several candidates the best-ranked
+    one is kept. Returns a dict with the reply 'text', the 'leaning', the
+    'responder' and the review 'verdict' (see _review_reply).
+    """
+    krsna = agents["krsna"]
+    category = _message_leaning(message, lambda text: _ask_krsna_leaning(krsna, text))
+    candidates = get_setting("REPLY_CANDIDATES")
+    responder, agent_prompt = _build_reply_prompt(message["text"], category, candidates=candidates)
+    draft = _draft_function()(agents[responder], agent_prompt)
+    if candidates > 1:
+        draft = draft[0]["text"]
+    reply_text, verdict = _review_reply(krsna, message["text"], draft)
+    return {"text": trim_text(reply_text, 180), "leaning": category, "responder": responder, "verdict": verdict}
+
+def queue_reply_drafts(agents, messages, concurrency=4):
+    """
+    Draft agent replies to several messages in parallel and queue them for batch review.
+
+    Nothing is posted until the drafts are approved; returns the number queued.
+    """
+    try:
+        store = get_post_store()
+    except Exception as e:
+        print(f"Reply queue unavailable ({e}); no drafts queued.")
+        return 0
+    
+    def draft_and_queue(message):
+        try:
+            draft = draft_reply(agents, message)
+        except Exception as e:
+            print(f"Drafting a reply to message {message.get('number')} failed: {e}")
+            return False
+        store.queue_reply(message["did"], draft["text"], status="pending", leaning=draft["leaning"],
+                          responder=draft["responder"], verdict=draft["verdict"])
+        return True
+    
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return sum(pool.map(draft_and_queue, messages))
+
 def process_reply_workflow(agents):
     """Handle the workflow for replying to messages with improved error handling and agent coordination."""
     # Extract agents
     sanjay = agents["sanjay"]
     krsna = agents["krsna"]
-    arjunan = agents["arjunan"]
-    yudhistran = agents["yudhistran"]
     
-    # Fetch messages from BlueSky
-    fetched_messages_json = fetch_bluesky_following_wrapper(limit=20)
-    fetched_messages = json.loads(fetched_messages_json)
-    if fetched_messages["status"] != "success":
-        print("Error fetching messages:", fetched_messages["message"])
-        return
-    messages = fetched_messages["posts"]
+    # Sync only new timeline posts into the local store, then read the latest 20 from it
+    try:
+        store = get_post_store()
+        new_posts = sync_timeline(store)
+        print(f"Synced {new_posts} new posts from Bluesky.")
+        messages = store.recent_messages(limit=20)
+    except Exception as e:
+        print(f"Local post store unavailable ({e}); fetching messages directly.")
+        fetched_messages_json = fetch_bluesky_following_wrapper(limit=20)
+        fetched_messages = json.loads(fetched_messages_json)
+        if fetched_messages["status"] != "success":
+            print("Error fetching messages:", fetched_messages["message"])
+            return
+        messages = fetched_messages["posts"]
     
     # Categorize messages
     categorization_result = categorize_messages(messages=messages, krsna_agent=krsna)
@@ -131,11 +401,26 @@ def process_reply_workflow(agents):
             print(f"Error displaying message: {e}", msg)
     
     # Get user selection
-    selection = sanjay.get_human_input("Select a message by number (e.g., '1') or type 'skip' to skip: ").strip().lower()
+    selection = sanjay.get_human_input(
+        "Select a message by number (e.g., '1'), several to queue agent drafts for batch review "
+        "(e.g., '1,3-5' or 'all'), or type 'skip' to skip: "
+    ).strip().lower()
     if selection == "skip":
         print("Skipping reply workflow.")
         return
     
+    if selection == "all" or "," in selection or "-" in selection:
+        try:
+            numbers = set(parse_selection(selection, len(categorization_result)))
+        except ValueError as e:
+            print(f"Invalid selection: {e}")
+            return
+        selected_messages = [msg for msg in categorization_result if msg.get("number") in numbers]
+        print(f"Drafting replies to {len(selected_messages)} messages...")
+        queued = queue_reply_drafts(agents, selected_messages)
+        print(f"Queued {queued} reply drafts. Review them with 'Review queued replies' in the main menu.")
+        return
+    
     try:
         selected_number = int(selection.split()[0])
     except ValueError:
@@ -173,149 +458,64 @@ def process_reply_workflow(agents):
         return
     
     # Get reply type
+    locally_rejected = False
     reply_type = sanjay.get_human_input("Type 'human' to reply yourself or 'agent' for agent-generated reply: ").strip().lower()
     
     if reply_type == "human":
         # Human generated reply
         reply_text = sanjay.get_human_input("Enter your reply text: ")
     elif reply_type == "agent":
-        # NEW WORKFLOW: Enhanced categorization for message political leaning
-        categorize_prompt = json.dumps({
-            "task": "political_analysis",
-            "message": selected_message["text"],
-            "instruction": (
-                "Analyze this message and determine its political leaning on a scale: "
-                "'far-left', 'left', 'middle', 'right', or 'far-right'. "
-                "Consider the content, tone, and perspective. "
-                "Return a JSON object with keys: 'category' and 'reasoning'."
-            )
-        })
-        
-        # Get categorization from Krsna
-        categorization = krsna.generate_reply(messages=[{"role": "user", "content": categorize_prompt}])
-        if isinstance(categorization, str):
-            cat_content = categorization
-        elif isinstance(categorization, dict):
-            cat_content = categorization.get("content", "")
-        else:
-            cat_content = getattr(categorization, "content", "")
-        cat_content = extract_json_content(cat_content)
-        
-        # Parse categorization
-        try:
-            cat_json = json.loads(cat_content)
-            category = cat_json.get("category", "middle")
-            reasoning = cat_json.get("reasoning", "No reasoning provided")
-            print(f"Message categorized as: {category}")
-            print(f"Reasoning: {reasoning}")
-        except:
-            print("Categorization parsing failed. Defaulting to 'middle'.")
-            category = "middle"
+        speculation = None
+        def ask_krsna(text):
+            nonlocal speculation
+            if get_setting("SPECULATIVE_REPLIES"):
+                # Both responders start drafting while Krsna is still categorizing
+                speculation = _start_speculative_drafts(agents, text)
+            return _ask_krsna_leaning(krsna, text)
+        category = _message_leaning(selected_message, ask_krsna)
         
         # Select appropriate agent based on political leaning
-        if category.lower() == "far-right":
+        responder, agent_prompt = _build_reply_prompt(selected_message["text"], category,
+                                                      candidates=get_setting("REPLY_CANDIDATES"))
+        if responder == "yudhistran":
             print("Message categorized as 'far-right'. Using Yudhistran for a soothing, middle-ground response.")
-            agent_prompt = json.dumps({
-                "task": "reply",
-                "message": selected_message["text"],
-                "instruction": (
-                    "You are Yudhistran, the balanced mediator. This message appears to have 'far-right' views. "
-                    "Craft a measured, soothing response that finds middle ground while maintaining respect. "
-                    "Aim for exactly 180 characters and return your response in a JSON object with key "
-                    "'formatted_message'."
-                )
-            })
-            reply_agent = yudhistran
         else:
             print(f"Message categorized as '{category}'. Using Arjunan for a response.")
-            agent_prompt = json.dumps({
-                "task": "reply",
-                "message": selected_message["text"],
-                "instruction": (
-                    "You are Arjunan. This message has been categorized as having " + category + " political views. "
-                    "Craft a thoughtful, assertive response in exactly 180 characters. "
-                    "Return your response in a JSON object with key 'formatted_message'."
-                )
-            })
-            reply_agent = arjunan
+        reply_agent = agents[responder]
         
-        # Generate the reply with the selected agent
-        print(f"Generating response with {reply_agent.name}...")
-        agent_response = reply_agent.generate_reply(messages=[{"role": "user", "content": agent_prompt}])
-        if isinstance(agent_response, str):
-            reply_content = agent_response
-        elif isinstance(agent_response, dict):
-            reply_content = agent_response.get("content", "")
-        else:
-            reply_content = getattr(agent_response, "content", "")
-        reply_content = extract_json_content(reply_content)
-        
-        # Parse the reply
-        try:
-            reply_json = json.loads(reply_content)
-            reply_text = reply_json.get("formatted_message", "")
-            
-            # FIX: Safely handle dictionary values
-            if not reply_text:
-                for field in ["final_reply", "reply", "analyzed_reply", "message", "text", "content"]:
-                    if field in reply_json:
-                        candidate = reply_json.get(field, "")
-                        # Check if candidate is a string before calling lower()
-                        if isinstance(candidate, str):
-                            if candidate.lower() not in ["progressive", "liberal", "centrist", "conservative",
-                                                        "strongly conservative", "left", "right", "far-left", "far-right"]:
-                                reply_text = candidate
-                                break
-                        elif isinstance(candidate, dict):
-                            # Handle dictionary case
-                            if 'text' in candidate:
-                                reply_text = candidate['text']
-                                break
-            
-            if not reply_text:
-                print("No suitable reply field found. Using raw agent response.")
-                reply_text = reply_content
-        except Exception as e:
-            print(f"Reply parsing failed: {e}")
-            reply_text = reply_content
-        
-        # Send to Krsna for validation
-        validate_prompt = json.dumps({
-            "task": "validate_response",
-            "original_message": selected_message["text"],
-            "agent_response": reply_text,
-            "instruction": (
-                "As Krsna, evaluate if this response is appropriate, respectful, and fits within 180 characters. "
-                "Return a JSON object with keys: 'valid' (boolean), 'edited_response' (string), and 'feedback' (string)."
-            )
-        })
-        
-        print("Sending to Krsna for validation...")
-        validation = krsna.generate_reply(messages=[{"role": "user", "content": validate_prompt}])
-        if isinstance(validation, str):
-            valid_content = validation
-        elif isinstance(validation, dict):
-            valid_content = validation.get("content", "")
+        if speculation:
+            # Keep the speculative draft from the matching responder and discard the other
+            pool, drafts = speculation
+            for name, future in drafts.items():
+                if name != responder:
+                    future.cancel()
+            pool.shutdown(wait=False)
+            print(f"Using {reply_agent.name}'s draft generated during categorization...")
+            try:
+                draft = drafts[responder].result()
+            except Exception as e:
+                print(f"Speculative draft failed ({e}); generating again.")
+                draft = _draft_function()(reply_agent, agent_prompt)
+        elif get_setting("STREAM_REPLIES") and get_setting("REPLY_CANDIDATES") == 1:
+            # Show the draft as it is generated; Ctrl+C aborts it early
+            print(f"{reply_agent.name}'s draft (Ctrl+C to abort): ", end="", flush=True)
+            reply_response = stream_agent_reply(reply_agent, [{"role": "user", "content": agent_prompt}])
+            if reply_response is None:
+                draft = sanjay.get_human_input("Draft aborted. Enter your reply text: ")
+            else:
+                draft = _parse_reply_text(reply_response)
         else:
-            valid_content = getattr(validation, "content", "")
-        valid_content = extract_json_content(valid_content)
+            # Generate the reply with the selected agent
+            print(f"Generating response with {reply_agent.name}...")
+            draft = _draft_function()(reply_agent, agent_prompt)
+        # With several candidates the user picks from the locally ranked list
+        reply_text = _choose_candidate(sanjay, draft) if get_setting("REPLY_CANDIDATES") > 1 else draft
         
-        # Process validation results
-        try:
-            valid_json = json.loads(valid_content)
-            is_valid = valid_json.get("valid", False)
-            validation_feedback = valid_json.get("feedback", "No feedback provided")
-            if is_valid:
-                edited_reply = valid_json.get("edited_response", reply_text)
-                print("✅ Krsna has validated the reply as appropriate.")
-            else:
-                edited_reply = valid_json.get("edited_response", reply_text)
-                print("⚠️ Krsna has concerns about the reply and has edited it.")
-            print(f"Feedback: {validation_feedback}")
-        except Exception as e:
-            print(f"Validation parsing failed: {e}")
-            edited_reply = reply_text
-            print("Using original agent response without validation.")
+        # Drafts that clearly pass or fail the local rules skip Krsna's validation
+        edited_reply, verdict = _review_reply(krsna, selected_message["text"], reply_text)
+        if verdict == "fail":
+            locally_rejected = True
+            print("Asking Krsna for an alternative instead.")
     else:
         print("Invalid reply type. Reply cancelled.")
         return
@@ -323,46 +523,40 @@ def process_reply_workflow(agents):
     # Ensure the reply is within length limits
     edited_reply = trim_text(edited_reply, 180)
     
-    # Show final reply to user and get approval
-    print("\nFinal reply message:")
-    print(f"\"{edited_reply}\"")
-    approval = sanjay.get_human_input("Are you satisfied with this reply? (yes/no): ").strip().lower()
+    fair_prompt = json.dumps({
+        "task": "fair_response",
+        "original_message": selected_message["text"],
+        "instruction": (
+            "As Krsna, please provide a fair and balanced reply to this message. "
+            "The previous reply was not satisfactory to the user. "
+            "Create a thoughtful response in exactly 180 characters that is politically balanced "
+            "and respectful. Return as JSON with key 'formatted_message'."
+        )
+    })
+    fair_request = [{"role": "user", "content": fair_prompt}]
+    # Optionally have Krsna's alternative to an agent draft ready before the user decides on it
+    # (a reply the user wrote themselves is rarely turned down for Krsna's)
+    prefetched_fair = (prefetch_reply(krsna, fair_request, use_cache=False)
+                       if reply_type == "agent" and get_setting("PREFETCH_FAIR_REPLY") else None)
+    
+    # Show final reply to user and get approval (a locally rejected draft goes straight to the alternative)
+    if locally_rejected:
+        approval = "no"
+    else:
+        print("\nFinal reply message:")
+        print(f"\"{edited_reply}\"")
+        approval = sanjay.get_human_input("Are you satisfied with this reply? (yes/no): ").strip().lower()
     
     # If user is not satisfied, ask Krsna for a fair alternative
     if approval != "yes":
-        print("You're not satisfied with the reply. Asking Krsna for an alternative...")
+        if not locally_rejected:
+            print("You're not satisfied with the reply. Asking Krsna for an alternative...")
         
-        fair_prompt = json.dumps({
-            "task": "fair_response",
-            "original_message": selected_message["text"],
-            "instruction": (
-                "As Krsna, please provide a fair and balanced reply to this message. "
-                "The previous reply was not satisfactory to the user. "
-                "Create a thoughtful response in exactly 180 characters that is politically balanced "
-                "and respectful. Return as JSON with key 'formatted_message'."
-            )
-        })
-        
-        fair_response = krsna.generate_reply(messages=[{"role": "user", "content": fair_prompt}])
-        if isinstance(fair_response, str):
-            fair_content = fair_response
-        elif isinstance(fair_response, dict):
-            fair_content = fair_response.get("content", "")
+        if prefetched_fair:
+            fair_response = prefetched_fair.result()
         else:
-            fair_content = getattr(fair_response, "content", "")
-        fair_content = extract_json_content(fair_content)
-        
-        try:
-            fair_json = json.loads(fair_content)
-            fair_reply = fair_json.get("formatted_message", "")
-            if not fair_reply:
-                # Try other common field names
-                for field in ["response", "reply", "message", "text", "content"]:
-                    if field in fair_json and isinstance(fair_json[field], str):
-                        fair_reply = fair_json[field]
-                        break
-        except:
-            fair_reply = fair_content if len(fair_content) < 180 else fair_content[:177] + "..."
+            fair_response = cached_generate_reply(krsna, fair_request, use_cache=False)
+        fair_reply = ReplyResult.from_text(get_reply_content(fair_response)).text
         
         # Show the fair reply and get approval again
         fair_reply = trim_text(fair_reply, 180)
@@ -375,6 +569,8 @@ def process_reply_workflow(agents):
         else:
             custom_reply = sanjay.get_human_input("Please provide your own reply text: ").strip()
             edited_reply = trim_text(custom_reply, 180)
+    elif prefetched_fair:
+        prefetched_fair.discard()
     
     # Final confirmation to post
     post_confirmation = sanjay.get_human_input(f"Ready to post this reply? (yes/no): ").strip().lower()
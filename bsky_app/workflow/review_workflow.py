@@ -0,0 +1,135 @@
+# filepath: atproto_app/workflow/review_workflow.py
+from config import get_setting
+from utils.helpers import trim_text
+from utils.validator import get_reply_validator
+from utils.store import get_post_store
+from utils.posting_worker import get_posting_worker
+
+def show_review_plan():
+    """Display the plan for reviewing queued replies"""
+    print("\nPlan for Reviewing Queued Replies:")
+    print("Steps:")
+    print("  1. Sanjay lists the reply drafts waiting for approval (and replies that failed to post).")
+    print("  2. You approve, reject or edit many of them at once, e.g. 'a 1,3-5', 'r 2', 'a all' or 'e 4'.")
+    print("  3. Approved replies are posted in the background while you keep reviewing.")
+    print("Agents Involved:")
+    print("  - Sanjay (User Interaction)")
+    print("  - Bheeman (Poster, as the background posting worker)\n")
+
+def parse_selection(selection, count):
+    """
+    Parse item numbers such as '1,3-5' or 'all' into a sorted list of numbers in 1..count.
+
+    Raises ValueError for anything else, including numbers out of range.
+    """
+    selection = selection.strip().lower()
+    if selection == "all":
+        return list(range(1, count + 1))
+    numbers = set()
+    for part in selection.replace(" ", ",").split(","):
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        first, last = int(first), int(last or first)
+        if not 1 <= first <= last <= count:
+            raise ValueError(f"'{part}' is not within 1-{count}")
+        numbers.update(range(first, last + 1))
+    if not numbers:
+        raise ValueError("no item numbers given")
+    return sorted(numbers)
+
+def _show_page(entries, offset, total):
+    """Print one page of queue entries, numbered from 1."""
+    print(f"\nQueued replies {offset + 1}-{offset + len(entries)} of {total}:")
+    for number, entry in enumerate(entries, 1):
+        author = entry.get("display_name") or entry.get("handle") or "Unknown"
+        labels = " | ".join(label for label in (entry.get("category"), entry.get("leaning"),
+                                                 entry.get("verdict")) if label)
+        print(f"{number}. [{labels}] {author}: {trim_text(entry.get('text') or '(post not stored)', 140)}")
+        if entry["reply"]:
+            print(f"   -> \"{entry['reply']}\"")
+        if entry["status"] == "failed":
+            print(f"   (failed: {entry.get('error') or 'unknown error'})")
+
+def _edit_entry(sanjay, entry):
+    """Ask for a new reply text; returns it, or None if the edit is abandoned."""
+    new_text = sanjay.get_human_input("New reply text (empty keeps the draft): ").strip()
+    reply_text = trim_text(new_text or entry["reply"] or "", 180)
+    if not reply_text:
+        print("No reply text to approve.")
+        return None
+    local_check = get_reply_validator().validate(reply_text)
+    if local_check.verdict == "fail":
+        print(f"❌ Local validation rejected the reply: {'; '.join(local_check.problems)}")
+        if sanjay.get_human_input("Approve it anyway? (yes/no): ").strip().lower() != "yes":
+            return None
+    return reply_text
+
+def review_reply_queue(agents):
+    """Review queued reply drafts in pages and approve, reject or edit them in bulk."""
+    sanjay = agents["sanjay"]
+    store = get_post_store()
+    worker = get_posting_worker()
+    worker.start()
+    decided = {"approved": 0, "rejected": 0}
+    page_size = get_setting("REVIEW_PAGE_SIZE")
+    offset = 0
+
+    while True:
+        total = sum(count for status, count in store.reply_queue_counts().items()
+                    if status in ("pending", "failed"))
+        if offset >= total:
+            offset = 0
+        entries = store.queued_replies(statuses=("pending", "failed"), limit=page_size, offset=offset)
+        if not entries:
+            print("No reply drafts are waiting for review.")
+            break
+        _show_page(entries, offset, total)
+
+        command = sanjay.get_human_input(
+            "Approve 'a 1,3-5', reject 'r 2', 'a all' / 'r all', edit 'e 4', next page 'n', done 'q': "
+        ).strip().lower()
+        action, _, selection = command.partition(" ")
+        if action in ("", "q", "quit", "done"):
+            break
+        if action == "n":
+            offset += page_size
+            continue
+        if action not in ("a", "r", "e"):
+            print("Unknown command.")
+            continue
+        try:
+            numbers = parse_selection(selection, len(entries))
+        except ValueError as e:
+            print(f"Invalid selection: {e}")
+            continue
+
+        if action == "e":
+            if len(numbers) != 1:
+                print("Edit one reply at a time.")
+                continue
+            entry = entries[numbers[0] - 1]
+            reply_text = _edit_entry(sanjay, entry)
+            if reply_text:
+                store.set_reply_status(entry["id"], "approved", reply=reply_text)
+                decided["approved"] += 1
+                worker.wake()
+            continue
+
+        for number in numbers:
+            entry = entries[number - 1]
+            if action == "r":
+                store.set_reply_status(entry["id"], "rejected")
+                decided["rejected"] += 1
+            elif entry["reply"]:
+                store.set_reply_status(entry["id"], "approved")
+                decided["approved"] += 1
+            else:
+                print(f"Reply {number} has no draft; edit it to approve it.")
+        if action == "a":
+            # Post the approvals now rather than at the worker's next check
+            worker.wake()
+
+    counts = store.reply_queue_counts()
+    print(f"Approved {decided['approved']}, rejected {decided['rejected']} this review. "
+          f"Queue: {', '.join(f'{status} {count}' for status, count in sorted(counts.items())) or 'empty'}.")
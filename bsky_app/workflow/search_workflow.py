@@ -1,7 +1,13 @@
 # filepath: atproto_app/workflow/search_workflow.py
 import json
+from utils.llm_cache import cached_generate_reply
+from utils.categorizer import get_categorizer
 from utils.helpers import extract_json_content, trim_text
-from utils.bluesky import like_bluesky_wrapper, reply_to_bluesky_wrapper, bluesky_login
+from utils.bluesky import like_bluesky_wrapper, reply_to_bluesky_wrapper, get_bluesky_client, post_to_message
+from utils.handles import get_handle_resolver
+from utils.fanout import fetch_author_feeds, advance_author_cursors
+from utils.search import search_bluesky_posts
+from utils.index import search_local_posts
 import os
 
 def show_search_plan():
@@ -9,6 +15,7 @@ def show_search_plan():
     print("\nPlan for Subject Search:")
     print("Steps:")
     print("  1. You provide a subject keyword")
+    print("     (or several usernames / a file of usernames to watch; their new posts are fetched concurrently)")
     print("  2. Nakulan searches the latest 20 messages for that subject")
     print("  3. Sanjay displays the matching messages")
     print("  4. You select a message to reply to")
@@ -28,60 +35,51 @@ def search_subject_flow(agents):
     """
     This flow allows searching for messages from a specific user on Bluesky,
     analyzing them, and responding using the collaborative agent workflow.
+    Entering several usernames separated by commas, or the path of a file with
+    one username per line, watches all of them at once (see search_users_flow).
     
     Args:
         agents (dict): Dictionary of initialized agents
     """
-    # Extract agents
     sanjay = agents["sanjay"]
-    krsna = agents["krsna"]
-    arjunan = agents["arjunan"]
-    yudhistran = agents["yudhistran"]
-    nakulan = agents["nakulan"]
     
     # Step 1: Sanjay collects the username to search for
-    username = sanjay.get_human_input("Enter the username to search (without '@'): ").strip()
+    username = sanjay.get_human_input(
+        "Enter the username to search (without '@'), several separated by commas, or a file of usernames: "
+    ).strip()
     if not username:
         print("No username entered. Aborting search.")
         return
+    if os.path.isfile(username):
+        with open(username, "r", encoding="utf-8") as f:
+            lines = [line.strip() for line in f]
+        handles = [line for line in lines if line and not line.startswith("#")]
+        search_users_flow(agents, handles)
+        return
+    if "," in username:
+        search_users_flow(agents, username.split(","))
+        return
 
     # Step 2: Search for the user and fetch messages
-    client = bluesky_login()
+    client = get_bluesky_client()
     
     print(f"Searching for user '{username}'...")
     
     # Search for the user
     try:
-        # Search for user
-        search_results = client.app.bsky.actor.search_actors({"term": username})
-        
-        # Find the exact match for the username or similar results
-        user_did = None
-        for result in search_results.actors:
-            if username.lower() in result.handle.lower():  # Perform a partial match
-                user_did = result.did  # Return the user's decentralized identifier (DID)
-                print(f"Found user: {result.display_name} (@{result.handle})")
-                break
-                
-        if not user_did:
+        # Find the first account whose handle partially matches (cached across runs)
+        actor = get_handle_resolver().find(username)
+        if not actor:
             print(f"User '{username}' not found.")
             return
+        user_did = actor["did"]  # The user's decentralized identifier (DID)
+        print(f"Found user: {actor['display_name']} (@{actor['handle']})")
             
         # Retrieve latest 20 messages from the user
         print(f"Fetching latest messages from @{username}...")
         try:
             feed = client.app.bsky.feed.get_author_feed({"actor": user_did, "limit": 20})
-            messages = []
-            
-            for idx, feed_view in enumerate(feed.feed, start=1):
-                post = feed_view.post
-                messages.append({
-                    "number": idx,
-                    "did": post.uri,
-                    "author": post.author.display_name or post.author.handle,
-                    "text": post.record.text,
-                    "timestamp": post.indexed_at
-                })
+            messages = [post_to_message(feed_view.post, idx) for idx, feed_view in enumerate(feed.feed, start=1)]
                 
             if not messages:
                 print(f"No messages found from @{username}.")
@@ -95,9 +93,100 @@ def search_subject_flow(agents):
         print(f"Error during user search: {e}")
         return
 
-    # Step 3: Ask Krsna to analyze these messages for intent and tone
-    print("Analyzing messages...")
-    analyze_prompt = json.dumps({
+    analyze_and_respond(agents, messages, f"Latest messages from @{username}")
+
+def search_posts_flow(agents):
+    """
+    Search all of Bluesky for posts about a subject (server-side searchPosts),
+    then analyze them and respond using the collaborative agent workflow.
+    
+    Args:
+        agents (dict): Dictionary of initialized agents
+    """
+    sanjay = agents["sanjay"]
+    
+    subject = sanjay.get_human_input("Enter the subject to search for: ").strip()
+    if not subject:
+        print("No subject entered. Aborting search.")
+        return
+    source = sanjay.get_human_input("Search 'bluesky' or your 'local' stored history? (default bluesky): ").strip().lower()
+    if source == "local":
+        result = search_local_posts(subject, limit=20)
+        if result["status"] != "success":
+            print("Error searching stored posts:", result["message"])
+            return
+        if not result["posts"]:
+            print(f"No stored messages found about '{subject}'.")
+            return
+        analyze_and_respond(agents, result["posts"], f"Stored messages about '{subject}'")
+        return
+    lang = sanjay.get_human_input("Language code to filter by (e.g. 'en', blank for any): ").strip().lower() or None
+    hours_input = sanjay.get_human_input("Only posts from the last N hours (blank for any time): ").strip()
+    try:
+        hours = float(hours_input) if hours_input else None
+    except ValueError:
+        print("Invalid number of hours; searching without a time window.")
+        hours = None
+    
+    print(f"Searching Bluesky for '{subject}'...")
+    result = search_bluesky_posts(subject, lang=lang, hours=hours, max_posts=20)
+    if result["status"] != "success":
+        print("Error searching posts:", result["message"])
+        return
+    messages = result["posts"]
+    if not messages:
+        print(f"No messages found about '{subject}'.")
+        return
+    
+    analyze_and_respond(agents, messages, f"Latest messages about '{subject}'")
+
+def search_users_flow(agents, handles, max_workers=8, display_limit=20):
+    """
+    Fetch new posts from many accounts concurrently and respond to one of them.
+
+    Each account's newest seen post is remembered in the local store, so a
+    repeat run only fetches and analyzes what was published since. The new
+    posts are shown `display_limit` at a time; an account's cursor only moves
+    once all of its new posts have been shown, so posts on pages the user
+    stops before are fetched again next run.
+    
+    Args:
+        agents (dict): Dictionary of initialized agents
+        handles (list): Usernames to watch
+        max_workers (int): Number of concurrent author-feed fetches
+        display_limit (int): Number of merged posts to analyze and display per page
+    """
+    sanjay = agents["sanjay"]
+    handles = [h.strip().lstrip("@") for h in handles if h.strip()]
+    print(f"Fetching new messages from {len(handles)} accounts...")
+    result = fetch_author_feeds(handles, max_workers=max_workers, advance=False)
+    if result["not_found"]:
+        print(f"Users not found: {', '.join(result['not_found'])}")
+    for handle, error in result["errors"].items():
+        print(f"Error fetching @{handle}: {error}")
+    messages = result["posts"]
+    if not messages:
+        print("No new messages from these accounts.")
+        return
+    print(f"{len(messages)} new messages across {len(handles)} accounts.")
+
+    shown = []
+    for start in range(0, len(messages), display_limit):
+        page = messages[start:start + display_limit]
+        shown.extend(msg["did"] for msg in page)
+        analyze_and_respond(agents, page, f"New messages from the watched accounts "
+                                          f"({start + 1}-{start + len(page)} of {len(messages)})")
+        remaining = len(messages) - start - len(page)
+        if remaining and sanjay.get_human_input(
+                f"Show the next {min(display_limit, remaining)} of {remaining} remaining messages? (yes/no): "
+        ).strip().lower() != "yes":
+            print(f"{remaining} messages not shown; they will be fetched again next time.")
+            break
+    advance_author_cursors(result["pending"], shown)
+
+def _build_analyze_prompt(messages):
+    """Build Krsna's analysis prompt for a chunk of messages."""
+    return json.dumps({
         "task": "analyze_messages",
         "messages": messages,
         "instruction": (
@@ -108,38 +197,36 @@ def search_subject_flow(agents):
             "For each message, provide 'message_id', 'subject', 'style', and 'category'."
         )
     })
+
+def analyze_and_respond(agents, messages, heading):
+    """
+    Analyze fetched messages with Krsna, let the user pick one, and like
+    and/or reply to it using the collaborative agent workflow.
     
-    krsna_analysis = krsna.generate_reply(messages=[{"role": "user", "content": analyze_prompt}])
-    if isinstance(krsna_analysis, str):
-        analysis_content = krsna_analysis
-    elif isinstance(krsna_analysis, dict):
-        analysis_content = krsna_analysis.get("content", "")
-    else:
-        analysis_content = getattr(krsna_analysis, "content", "")
-    analysis_content = extract_json_content(analysis_content)
-    
-    # Parse the analysis
-    try:
-        analysis_results = json.loads(analysis_content)
-        if isinstance(analysis_results, list):
-            analyzed_messages = analysis_results
-        else:
-            # Try to extract a list from the JSON
-            for key in analysis_results:
-                if isinstance(analysis_results[key], list):
-                    analyzed_messages = analysis_results[key]
-                    break
-            else:
-                print("Analysis format unexpected. Using default analysis.")
-                analyzed_messages = []
-    except:
-        print("Analysis parsing failed. Using default analysis.")
-        analyzed_messages = []
+    Args:
+        agents (dict): Dictionary of initialized agents
+        messages (list): Message dicts to analyze and display
+        heading (str): Title printed above the message list
+    """
+    # Extract agents
+    sanjay = agents["sanjay"]
+    krsna = agents["krsna"]
+    arjunan = agents["arjunan"]
+    yudhistran = agents["yudhistran"]
+
+    # Step 3: Ask Krsna to analyze these messages for intent and tone
+    print("Analyzing messages...")
+    # Messages go to Krsna in token-bounded chunks, sent concurrently;
+    # a chunk whose reply cannot be parsed is retried on its own
+    categorizer = get_categorizer("search_analyze", krsna, _build_analyze_prompt, id_field="message_id")
+    analyzed_by_number = categorizer.categorize(messages)
+    if len(analyzed_by_number) < len(messages):
+        print(f"No analysis returned for {len(messages) - len(analyzed_by_number)} messages; using default analysis.")
     
     # Merge analysis with messages
     for msg in messages:
         msg_number = msg.get("number")
-        analysis = next((a for a in analyzed_messages if a.get("message_id") == msg_number), None)
+        analysis = analyzed_by_number.get(msg_number)
         if analysis:
             msg["subject"] = analysis.get("subject", "Unknown")
             msg["style"] = analysis.get("style", "Unknown")
@@ -152,7 +239,7 @@ def search_subject_flow(agents):
             msg["analysis"] = "Not analyzed"
 
     # Step 4: Sanjay displays the numbered list of messages with analysis
-    print(f"\nLatest messages from @{username}:")
+    print(f"\n{heading}:")
     for msg in messages:
         number = msg.get("number", "?")
         text = msg.get("text", "(No text)")[:80]  # Trim for display
@@ -209,7 +296,7 @@ def search_subject_flow(agents):
             )
         })
         
-        categorization = krsna.generate_reply(messages=[{"role": "user", "content": categorize_prompt}])
+        categorization = cached_generate_reply(krsna, [{"role": "user", "content": categorize_prompt}])
         cat_content = getattr(categorization, "content", categorization) if not isinstance(categorization, str) else categorization
         cat_content = extract_json_content(cat_content)
         
@@ -251,7 +338,7 @@ def search_subject_flow(agents):
             reply_agent = arjunan
         
         # Generate the reply
-        agent_response = reply_agent.generate_reply(messages=[{"role": "user", "content": agent_prompt}])
+        agent_response = cached_generate_reply(reply_agent, [{"role": "user", "content": agent_prompt}])
         reply_content = getattr(agent_response, "content", agent_response) if not isinstance(agent_response, str) else agent_response
         reply_content = extract_json_content(reply_content)
         
@@ -278,7 +365,7 @@ def search_subject_flow(agents):
             )
         })
         
-        krsna_validation = krsna.generate_reply(messages=[{"role": "user", "content": validate_prompt}])
+        krsna_validation = cached_generate_reply(krsna, [{"role": "user", "content": validate_prompt}])
         validation_content = getattr(krsna_validation, "content", krsna_validation) if not isinstance(krsna_validation, str) else krsna_validation
         validation_content = extract_json_content(validation_content)
         
@@ -322,7 +409,7 @@ def search_subject_flow(agents):
                 )
             })
             
-            alt_response = krsna.generate_reply(messages=[{"role": "user", "content": alt_prompt}])
+            alt_response = cached_generate_reply(krsna, [{"role": "user", "content": alt_prompt}], use_cache=False)
             alt_content = getattr(alt_response, "content", alt_response) if not isinstance(alt_response, str) else alt_response
             alt_content = extract_json_content(alt_content)
             